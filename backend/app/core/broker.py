@@ -0,0 +1,160 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, cast
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+Callback = Callable[[dict], None]
+
+
+class MemoryBroker:
+    """Pub/sub внутри одного процесса: сообщение сразу уходит подписчикам."""
+
+    def __init__(self):
+        self._subscribers: Dict[str, List[Callback]] = defaultdict(list)
+
+    def subscribe(self, topic: str, callback: Callback):
+        self._subscribers[topic].append(callback)
+
+    def publish(self, topic: str, message: dict):
+        self._dispatch(topic, message)
+
+    def _dispatch(self, topic: str, message: dict):
+        for callback in list(self._subscribers.get(topic, ())):
+            try:
+                callback(message)
+            except Exception as e:
+                logger.error(f"Ошибка подписчика на '{topic}': {e}")
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+
+class SQLiteBroker(MemoryBroker):
+    """Локальная замена внешнего брокера для нескольких процессов на одной машине.
+
+    Публикация добавляет строку в общий SQLite-файл, а фоновый поток каждого
+    процесса забирает новые строки и раздает их своим подписчикам.
+    """
+
+    def __init__(self, path: Path, poll_interval: float = 0.25, retention: float = 60.0):
+        super().__init__()
+        self.path = Path(path)
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self._local = threading.local()
+        self._stop = threading.Event()
+        self._thread = None
+        self._last_id = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS messages (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    topic TEXT NOT NULL,
+                    body TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            """)
+            self._local.conn = conn
+        return conn
+
+    def publish(self, topic: str, message: dict):
+        self._connect().execute(
+            "INSERT INTO messages (topic, body, created_at) VALUES (?, ?, ?)",
+            (topic, json.dumps(message, default=str), time.time()),
+        )
+
+    def start(self):
+        if self._thread:
+            return
+        self._last_id = self._connect().execute("SELECT COALESCE(MAX(id), 0) FROM messages").fetchone()[0]
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._poll, name="broker-poller", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(5)
+            self._thread = None
+
+    def _poll(self):
+        last_trim = time.time()
+        while not self._stop.wait(self.poll_interval):
+            try:
+                conn = self._connect()
+                rows = conn.execute(
+                    "SELECT id, topic, body FROM messages WHERE id > ? ORDER BY id",
+                    (self._last_id,),
+                ).fetchall()
+                for message_id, topic, body in rows:
+                    self._last_id = message_id
+                    if topic in self._subscribers:
+                        self._dispatch(topic, json.loads(body))
+                if time.time() - last_trim > self.retention:
+                    conn.execute("DELETE FROM messages WHERE created_at < ?", (time.time() - self.retention,))
+                    last_trim = time.time()
+            except Exception as e:
+                logger.error(f"Ошибка чтения брокера сообщений: {e}")
+
+
+def create_broker():
+    if settings.BROKER_BACKEND == "sqlite":
+        return SQLiteBroker(settings.BROKER_PATH, settings.BROKER_POLL_INTERVAL)
+    return MemoryBroker()
+
+
+_broker: Optional[MemoryBroker] = None
+_broker_lock = threading.Lock()
+_pending: List[Tuple[str, Callback]] = []
+
+
+def get_broker() -> MemoryBroker:
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                created = create_broker()
+                for topic, callback in _pending:
+                    created.subscribe(topic, callback)
+                _pending.clear()
+                _broker = created
+    return _broker
+
+
+class _LazyBroker:
+    """Брокер по BROKER_BACKEND создается при первой публикации или запуске.
+
+    Подписки, сделанные при импорте модулей, копятся до этого момента, так
+    что импорт не читает настройки.
+    """
+
+    def subscribe(self, topic: str, callback: Callback):
+        with _broker_lock:
+            if _broker is None:
+                _pending.append((topic, callback))
+                return
+        _broker.subscribe(topic, callback)
+
+    def __getattr__(self, name):
+        return getattr(get_broker(), name)
+
+
+broker = cast(MemoryBroker, _LazyBroker())
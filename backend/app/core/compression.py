@@ -0,0 +1,259 @@
+import hashlib
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class _GzipStream:
+    def __init__(self, level: int):
+        self._obj = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data) + self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._obj.flush(zlib.Z_FINISH)
+
+
+class _BrotliStream:
+    def __init__(self, level: int):
+        self._obj = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.process(data) + self._obj.flush()
+
+    def finish(self) -> bytes:
+        return self._obj.finish()
+
+
+class _ZstdStream:
+    def __init__(self, level: int):
+        self._obj = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data) + self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._obj.flush()
+
+
+def available_encodings() -> List[str]:
+    encodings = []
+    if brotli is not None:
+        encodings.append("br")
+    if zstandard is not None:
+        encodings.append("zstd")
+    encodings.append("gzip")
+    return encodings
+
+
+def compress(encoding: str, data: bytes, level: int) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=level)
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=level).compress(data)
+    stream = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return stream.compress(data) + stream.flush()
+
+
+def stream_compressor(encoding: str, level: int):
+    if encoding == "br":
+        return _BrotliStream(level)
+    if encoding == "zstd":
+        return _ZstdStream(level)
+    return _GzipStream(level)
+
+
+class VariantCache:
+    """LRU-кэш сжатых вариантов ответов, ограниченный суммарным размером.
+
+    Ключ строится по хэшу несжатого тела, поэтому повторяющийся горячий
+    ответ сжимается один раз, а при изменении данных новый вариант просто
+    вытесняет старый.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._data: "OrderedDict[Tuple[str, int, bytes], bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key) -> Optional[bytes]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value: bytes):
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            self._data[key] = value
+            self._size += len(value)
+            while self._size > self.max_bytes:
+                _, evicted = self._data.popitem(last=False)
+                self._size -= len(evicted)
+
+
+def negotiate(accept_encoding: str, supported: Iterable[str]) -> Optional[str]:
+    accepted: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+    for encoding in supported:
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+class CompressionMiddleware:
+    """Сжатие ответов gzip, а также brotli и zstd, если установлены их библиотеки.
+
+    Сжимаются только типы из allowlist и тела не меньше minimum_size.
+    Ответ с известной длиной до buffer_limit собирается целиком, и его
+    сжатый вариант сохраняется в кэше, если он включен. Остальные ответы
+    сжимаются потоком по частям.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        content_types: Iterable[str] = ("application/json",),
+        levels: Optional[Dict[str, int]] = None,
+        encodings: Optional[Iterable[str]] = None,
+        cache_bytes: int = 0,
+        buffer_limit: int = 1024 * 1024,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.buffer_limit = buffer_limit
+        self.content_types = set(content_types)
+        self.levels = {"gzip": 6, "br": 4, "zstd": 3, **(levels or {})}
+        supported = available_encodings()
+        self.encodings = [e for e in (encodings or supported) if e in supported]
+        self.cache = VariantCache(cache_bytes) if cache_bytes else None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""), self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.level = middleware.levels[encoding]
+        self._send = send
+        self._start: Optional[Message] = None
+        self._stream = None
+        self._passthrough = False
+        self._buffer: List[bytes] = []
+        self._buffered = 0
+        self._buffer_all = False
+
+    def _compressible(self, headers: Headers) -> bool:
+        if "content-encoding" in headers:
+            return False
+        if "no-transform" in headers.get("cache-control", ""):
+            return False
+        content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        return content_type in self.middleware.content_types
+
+    async def send(self, message: Message):
+        if message["type"] == "http.response.start":
+            self._start = message
+            headers = Headers(raw=message["headers"])
+            self._passthrough = not self._compressible(headers)
+            if self._passthrough:
+                await self._send(message)
+                return
+            length = headers.get("content-length")
+            self._buffer_all = length is not None and int(length) <= self.middleware.buffer_limit
+            return
+
+        if message["type"] != "http.response.body" or self._passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self._stream is None:
+            self._buffer.append(body)
+            self._buffered += len(body)
+            if not more_body:
+                await self._send_complete(b"".join(self._buffer))
+                return
+            if self._buffer_all or self._buffered < self.middleware.minimum_size:
+                return
+            body = b"".join(self._buffer)
+            self._buffer = []
+            self._stream = stream_compressor(self.encoding, self.level)
+            headers = MutableHeaders(raw=self._start["headers"])
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            del headers["Content-Length"]
+            await self._send(self._start)
+
+        chunk = self._stream.compress(body) if body else b""
+        if not more_body:
+            chunk += self._stream.finish()
+        if chunk or not more_body:
+            await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+    async def _send_complete(self, body: bytes):
+        headers = MutableHeaders(raw=self._start["headers"])
+        if len(body) < self.middleware.minimum_size:
+            await self._send(self._start)
+            await self._send({"type": "http.response.body", "body": body})
+            return
+
+        cache = self.middleware.cache
+        key = None
+        compressed = None
+        if cache is not None:
+            key = (self.encoding, self.level, hashlib.blake2b(body, digest_size=16).digest())
+            compressed = cache.get(key)
+        if compressed is None:
+            compressed = compress(self.encoding, body, self.level)
+            if cache is not None:
+                cache.set(key, compressed)
+
+        headers["Content-Encoding"] = self.encoding
+        headers["Content-Length"] = str(len(compressed))
+        headers.add_vary_header("Accept-Encoding")
+        await self._send(self._start)
+        await self._send({"type": "http.response.body", "body": compressed})
@@ -1,22 +1,204 @@
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
 import os
+import threading
 from pathlib import Path
+from typing import Optional, cast
 
 class Settings(BaseSettings):
-    DB_HOST: str
-    DB_PORT: int
-    DB_USER: str
-    DB_PASSWORD: str
-    DB_NAME: str
+    # Полный URL SQLAlchemy важнее DB_*: например, sqlite:///./campusjobs.db
+    # для локального запуска или mysql+mysqldb://... для C-драйвера mysqlclient
+    DATABASE_URL: Optional[str] = None
+    # Драйвер MySQL для URL из DB_*: mysqlconnector, mysqldb (mysqlclient) или pymysql
+    DB_DRIVER: str = "mysqlconnector"
+    # Обязательны, если не задан DATABASE_URL
+    DB_HOST: Optional[str] = None
+    DB_PORT: Optional[int] = None
+    DB_USER: Optional[str] = None
+    DB_PASSWORD: Optional[str] = None
+    DB_NAME: Optional[str] = None
+    DB_ECHO: bool = True
+    DB_REPLICA_URLS: list = []
+    DB_REPLICA_MAX_LAG: float = 5.0
+    DB_REPLICA_CHECK_INTERVAL: float = 5.0
+    DB_STICKY_SECONDS: float = 5.0
+    # Общий для рабочих процессов файл с отметками о недавних записях
+    DB_STICKY_PATH: Path = Path(__file__).parent.parent.parent / "data" / "sticky.sqlite3"
     SECRET_KEY: str = "your-secret-key-change-in-production-min-32-chars-long"
     
     UPLOAD_DIR: Path = Path(__file__).parent.parent.parent / "uploads" / "resumes"
     MAX_FILE_SIZE: int = 5 * 1024 * 1024
     ALLOWED_EXTENSIONS: list = [".pdf", ".doc", ".docx"]
 
+    TASK_QUEUE_PATH: Path = Path(__file__).parent.parent.parent / "data" / "tasks.sqlite3"
+    TASK_WORKERS: int = 2
+    TASK_MAX_ATTEMPTS: int = 5
+    TASK_RETRY_BASE_DELAY: float = 2.0
+    TASK_RETRY_MAX_DELAY: float = 600.0
+    TASK_POLL_INTERVAL: float = 1.0
+
+    BROKER_BACKEND: str = "memory"
+    BROKER_PATH: Path = Path(__file__).parent.parent.parent / "data" / "broker.sqlite3"
+    BROKER_POLL_INTERVAL: float = 0.25
+    EVENTS_HEARTBEAT_INTERVAL: float = 15.0
+    EVENTS_MAX_CONNECTIONS: int = 1000
+    EVENTS_QUEUE_SIZE: int = 100
+
+    JOB_SWEEP_INTERVAL: float = 300.0
+    JOB_SWEEP_BATCH_SIZE: int = 500
+
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_CONTENT_TYPES: list = [
+        "application/json", "application/x-ndjson", "text/csv", "text/plain", "text/html",
+    ]
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_LEVEL: int = 4
+    COMPRESSION_ZSTD_LEVEL: int = 3
+    COMPRESSION_CACHE_BYTES: int = 32 * 1024 * 1024
+
+    WEB_HOST: str = "127.0.0.1"
+    WEB_PORT: int = 8000
+    WEB_WORKERS: int = 0
+    WEB_PRELOAD: bool = True
+    WEB_BACKLOG: int = 2048
+    WEB_GRACEFUL_TIMEOUT: float = 30.0
+    THREADPOOL_SIZE: int = 40
+
+    CONCURRENCY_LIMIT_ENABLED: bool = True
+    CONCURRENCY_AUTH_LIMIT: int = 4
+    CONCURRENCY_AUTH_QUEUE: int = 32
+    CONCURRENCY_UPLOADS_LIMIT: int = 6
+    CONCURRENCY_UPLOADS_QUEUE: int = 12
+    CONCURRENCY_READS_LIMIT: int = 20
+    CONCURRENCY_READS_QUEUE: int = 200
+    CONCURRENCY_WRITES_LIMIT: int = 10
+    CONCURRENCY_WRITES_QUEUE: int = 100
+    CONCURRENCY_MAX_WAIT: float = 2.0
+    CONCURRENCY_RETRY_AFTER: float = 2.0
+
+    HEALTH_DB_CHECK_INTERVAL: float = 2.0
+    HEALTH_DB_TIMEOUT: float = 0.5
+
+    EXPORT_CHUNK_SIZE: int = 1000
+
+    JOB_IMPORT_MAX_BYTES: int = 10 * 1024 * 1024
+    JOB_IMPORT_SYNC_ROWS: int = 500
+    JOB_IMPORT_BATCH_SIZE: int = 500
+
+    PURGE_CHUNK_SIZE: int = 500
+    PURGE_PAUSE: float = 0.2
+    ORPHAN_SWEEP_INTERVAL: float = 3600.0
+    ORPHAN_GRACE_PERIOD: float = 86400.0
+
+    CHANGE_LOG_BATCH_SIZE: int = 500
+    CHANGE_FEED_PAGE_SIZE: int = 500
+    CHANGE_FEED_MAX_PAGE_SIZE: int = 5000
+    CHANGE_FEED_SETTLE_SECONDS: float = 5.0
+    CHANGE_LOG_RETENTION: float = 7 * 86400.0
+    CHANGE_LOG_COMPACT_INTERVAL: float = 3600.0
+
+    FAVORITES_PAGE_SIZE: int = 20
+    FAVORITES_MAX_PAGE_SIZE: int = 100
+    # Как и ENTITY_CACHE_ENABLED, отключается serve.py при BROKER_BACKEND=memory
+    # и нескольких рабочих процессах
+    FAVORITES_CACHE_ENABLED: bool = True
+    FAVORITES_CACHE_SIZE: int = 10000
+    FAVORITES_CACHE_TTL: float = 300.0
+    FAVORITES_CACHE_MAX_SET: int = 1000
+
+    # Сбросы кэша расходятся через брокер; с BROKER_BACKEND=memory и
+    # несколькими рабочими процессами serve.py отключает кэш сам
+    ENTITY_CACHE_ENABLED: bool = True
+    ENTITY_CACHE_SIZE: int = 10000
+    ENTITY_CACHE_TTL: float = 60.0
+    # Сколько последних открытых вакансий загружать в кэш при старте процесса
+    ENTITY_CACHE_WARM_JOBS: int = 1000
+
+    INTERVIEW_DEFAULT_DURATION: int = 30
+    INTERVIEW_MAX_DURATION: int = 240
+    INTERVIEW_AUTO_SCHEDULE_MAX: int = 500
+
+    ATTACHMENT_DIR: Path = Path(__file__).parent.parent.parent / "uploads" / "attachments"
+    ATTACHMENT_MAX_SIZE: int = 2 * 1024 * 1024 * 1024
+    ATTACHMENT_CHUNK_MAX: int = 16 * 1024 * 1024
+    ATTACHMENT_WRITE_BUFFER: int = 1024 * 1024
+    ATTACHMENT_UPLOAD_TTL: float = 86400.0
+    ATTACHMENT_SWEEP_INTERVAL: float = 3600.0
+    ATTACHMENT_ALLOWED_EXTENSIONS: list = [
+        ".pdf", ".doc", ".docx", ".ppt", ".pptx", ".xls", ".xlsx", ".zip", ".png", ".jpg", ".jpeg",
+    ]
+
+    RESUME_EXTRACT_PROCESSES: int = 2
+    RESUME_EXTRACT_BATCH_SIZE: int = 100
+    RESUME_EXTRACT_INTERVAL: float = 300.0
+    RESUME_EXTRACT_DELAY: float = 30.0
+    RESUME_EXTRACT_TIMEOUT: float = 30.0
+    # Предел на разбор одного файла целиком; больше RESUME_EXTRACT_TIMEOUT,
+    # чтобы antiword и catdoc успевали завершиться по своему таймауту
+    RESUME_FILE_TIMEOUT: float = 60.0
+    RESUME_MAX_XML_BYTES: int = 20 * 1024 * 1024
+    RESUME_TEXT_MAX_CHARS: int = 200_000
+    RESUME_MAX_PAGES: int = 50
+    RESUME_INDEX_MAX_TERMS: int = 500
+
+    RANKING_BM25_K1: float = 1.2
+    RANKING_BM25_B: float = 0.75
+    RANKING_MAX_QUERY_TERMS: int = 100
+    RANKING_CACHE_SIZE: int = 50000
+    RANKING_CACHE_TTL: float = 3600.0
+    RANKING_LOAD_BATCH_SIZE: int = 200
+
+    TRACING_ENABLED: bool = False
+    TRACING_SAMPLE_RATE: float = 0.01
+    TRACING_RESPONSE_HEADER: str = "X-Trace-Id"
+    # jsonl, memory или "модуль:имя" своего экспортера
+    TRACING_EXPORTER: str = "jsonl"
+    TRACING_PATH: Path = Path(__file__).parent.parent.parent / "data" / "traces.jsonl"
+    TRACING_BUFFER_SIZE: int = 1000
+    TRACING_SQL_MAX_LENGTH: int = 1000
+
     class Config:
         env_file = ".env"
 
-settings = Settings()
+    @model_validator(mode="after")
+    def check_database(self):
+        # Без настроек приложение не должно молча подключаться к localhost как root
+        if not self.DATABASE_URL:
+            missing = [
+                name for name in ("DB_HOST", "DB_PORT", "DB_USER", "DB_PASSWORD", "DB_NAME")
+                if getattr(self, name) is None
+            ]
+            if missing:
+                raise ValueError(f"Не заданы {', '.join(missing)}: укажите их или DATABASE_URL")
+        return self
+
+_settings: Optional[Settings] = None
+_settings_lock = threading.Lock()
+
+
+def get_settings() -> Settings:
+    global _settings
+    if _settings is None:
+        with _settings_lock:
+            if _settings is None:
+                _settings = Settings()
+    return _settings
+
+
+class _LazySettings:
+    """Читает окружение и .env при первом обращении к настройке, а не при импорте.
+
+    Модули app.core, app.services и app.routers читают настройки только при
+    использовании: при старте приложения (lifespan), запросе или задаче.
+    Исключение — app.main: middleware собираются по настройкам при импорте,
+    потому что после запуска приложения добавить их уже нельзя.
+    """
+
+    def __getattr__(self, name):
+        return getattr(get_settings(), name)
+
+    def __setattr__(self, name, value):
+        setattr(get_settings(), name, value)
+
 
-settings.UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+settings = cast(Settings, _LazySettings())
@@ -5,31 +5,47 @@ import logging
 import sys
 from pathlib import Path
 
+from app import repositories
 from app.database import SessionLocal
 from app.models.user import User
+from app.core import tracing
 from app.core.security import decode_access_token
 
 logger = logging.getLogger(__name__)
 
 DEBUG_LOG_PATH = Path(__file__).parent.parent / "debug.log"
 
-try:
-    with open(DEBUG_LOG_PATH, "a", encoding="utf-8") as f:
-        f.write("МОДУЛЬ dependencies.py ЗАГРУЖЕН\n")
-        f.flush()
-except:
-    pass
-print("МОДУЛЬ dependencies.py ЗАГРУЖЕН", flush=True)
 
+def _sticky_key(request: Request) -> Optional[str]:
+    token = getattr(request.state, "token", None)
+    if token:
+        return token
+    return request.client.host if request.client else None
 
-def get_db():
+
+@tracing.traced(kind="dependency")
+def get_db(request: Request):
+    db = SessionLocal()
+    db.info["sticky_key"] = _sticky_key(request)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@tracing.traced(kind="dependency")
+def get_read_db(request: Request):
+    """Сессия для обработчиков, которые только читают: запросы идут в реплику."""
     db = SessionLocal()
+    db.info["read_only"] = True
+    db.info["sticky_key"] = _sticky_key(request)
     try:
         yield db
     finally:
         db.close()
 
 
+@tracing.traced(kind="dependency")
 def get_current_user(
     request: Request,
     db: Session = Depends(get_db)
@@ -49,7 +65,7 @@ def get_current_user(
     log_msg = f"\n{'='*60}\nФУНКЦИЯ get_current_user ВЫЗВАНА\n   Метод: {request.method}\n   Путь: {request.url.path}\n   Токен из request.state: {token[:30] if token else 'НЕТ'}...\n{'='*60}\n"
     try:
         import os
-        with open(DEBUG_LOG_PATH, "a", encoding="utf-8") as f:
+        with tracing.span("debug.log write", "file"), open(DEBUG_LOG_PATH, "a", encoding="utf-8") as f:
             f.write(log_msg)
             f.flush()
             os.fsync(f.fileno())
@@ -104,7 +120,7 @@ def get_current_user(
     print(f"Поиск пользователя с ID: {user_id}", flush=True)
     logger.info(f"Поиск пользователя с ID: {user_id}")
     sys.stdout.flush()
-    user = db.query(User).filter(User.id == user_id).first()
+    user = repositories.user_by_id(db, user_id)
     if user is None:
         print(f"ОШИБКА: Пользователь с ID {user_id} не найден в БД", flush=True)
         logger.error(f"Пользователь с ID {user_id} не найден в базе данных")
@@ -118,6 +134,7 @@ def get_current_user(
     return user
 
 
+@tracing.traced(kind="dependency")
 def get_current_student(
     current_user: User = Depends(get_current_user)
 ) -> User:
@@ -133,6 +150,7 @@ def get_current_student(
     return current_user
 
 
+@tracing.traced(kind="dependency")
 def get_current_employer(
     current_user: User = Depends(get_current_user)
 ) -> User:
@@ -148,6 +166,7 @@ def get_current_employer(
     return current_user
 
 
+@tracing.traced(kind="dependency")
 def get_current_admin(
     current_user: User = Depends(get_current_user)
 ) -> User:
@@ -0,0 +1,85 @@
+import asyncio
+import logging
+import threading
+from collections import defaultdict
+from typing import Dict, Optional, Set
+
+from app.core.broker import broker
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+USER_EVENTS_TOPIC = "user-events"
+
+
+class TooManyConnections(Exception):
+    pass
+
+
+class EventHub:
+    """Каналы событий по пользователям для открытых SSE-подключений процесса."""
+
+    def __init__(self, max_connections: Optional[int] = None, queue_size: Optional[int] = None):
+        self.max_connections = max_connections
+        self.queue_size = queue_size
+        self._channels: Dict[int, Set[asyncio.Queue]] = defaultdict(set)
+        self._connections = 0
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def connections(self) -> int:
+        return self._connections
+
+    def start(self, loop: asyncio.AbstractEventLoop):
+        # Не заданные явно ограничения берутся из настроек при запуске приложения
+        if self.max_connections is None:
+            self.max_connections = settings.EVENTS_MAX_CONNECTIONS
+        if self.queue_size is None:
+            self.queue_size = settings.EVENTS_QUEUE_SIZE
+        if self._loop is None:
+            broker.subscribe(USER_EVENTS_TOPIC, self.dispatch)
+        self._loop = loop
+
+    def connect(self, user_id: int) -> asyncio.Queue:
+        with self._lock:
+            if self._connections >= self.max_connections:
+                raise TooManyConnections()
+            queue = asyncio.Queue(maxsize=self.queue_size)
+            self._channels[user_id].add(queue)
+            self._connections += 1
+        return queue
+
+    def disconnect(self, user_id: int, queue: asyncio.Queue):
+        with self._lock:
+            channel = self._channels.get(user_id)
+            if channel and queue in channel:
+                channel.discard(queue)
+                self._connections -= 1
+                if not channel:
+                    del self._channels[user_id]
+
+    def dispatch(self, message: dict):
+        if self._loop is None:
+            return
+        with self._lock:
+            queues = list(self._channels.get(message["user_id"], ()))
+        for queue in queues:
+            self._loop.call_soon_threadsafe(self._put, queue, message["event"])
+
+    @staticmethod
+    def _put(queue: asyncio.Queue, event: dict):
+        # Медленный клиент теряет самые старые события, а не блокирует остальных
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(event)
+
+
+hub = EventHub()
+
+
+def publish(user_id: int, event: dict):
+    try:
+        broker.publish(USER_EVENTS_TOPIC, {"user_id": user_id, "event": event})
+    except Exception as e:
+        logger.error(f"Не удалось опубликовать событие {event.get('type')}: {e}")
@@ -0,0 +1,126 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from sqlalchemy import text
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app import database
+from app.core import lifecycle, limiter
+from app.core.config import settings
+from app.core.serialization import dumps
+
+STARTED = time.monotonic()
+
+
+def pool_status() -> dict:
+    """Занятость пула соединений основной БД без обращения к самой БД."""
+    engine = database.get_engine()
+    pool = engine.pool
+    size = pool.size() if hasattr(pool, "size") else None
+    checked_out = pool.checkedout() if hasattr(pool, "checkedout") else None
+    status = {"size": size, "checked_out": checked_out}
+    max_overflow = getattr(pool, "_max_overflow", None)
+    if size is not None and checked_out is not None:
+        capacity = size + max(max_overflow or 0, 0)
+        status["max_overflow"] = max_overflow
+        status["saturation"] = round(checked_out / capacity, 3) if capacity else None
+    return status
+
+
+def writable_dirs() -> dict:
+    return {
+        name: os.access(path, os.W_OK)
+        for name, path in (("uploads", settings.UPLOAD_DIR), ("attachments", settings.ATTACHMENT_DIR))
+    }
+
+
+class DatabaseCheck:
+    """Результат SELECT 1, кэшируемый на HEALTH_DB_CHECK_INTERVAL.
+
+    Проверка идет в отдельном потоке, а не в общем пуле: при перегрузке
+    пула /readyz все равно ответит. Если БД не отвечает за
+    HEALTH_DB_TIMEOUT, кэшируется ошибка, а зависший запрос дорабатывает
+    в фоне и не запускается повторно.
+    """
+
+    def __init__(self, interval: float, timeout: float):
+        self.interval = interval
+        self.timeout = timeout
+        self.result = {"ok": False, "error": "не проверялась"}
+        self.checked_at: Optional[float] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="readyz")
+        self._pending = None
+
+    def _ping(self) -> dict:
+        started = time.perf_counter()
+        with database.get_engine().connect() as conn:
+            conn.execute(text("SELECT 1"))
+        return {"ok": True, "latency_ms": round((time.perf_counter() - started) * 1000, 2)}
+
+    async def get(self) -> dict:
+        now = time.monotonic()
+        if self.checked_at is not None and now - self.checked_at < self.interval:
+            return self.result
+        if self._pending is None or self._pending.done():
+            self._pending = asyncio.wrap_future(self._executor.submit(self._ping))
+        try:
+            self.result = await asyncio.wait_for(asyncio.shield(self._pending), self.timeout)
+        except asyncio.TimeoutError:
+            self.result = {"ok": False, "error": f"нет ответа за {self.timeout} с"}
+        except Exception as e:
+            self.result = {"ok": False, "error": f"{type(e).__name__}: {e}"[:300]}
+        self.checked_at = time.monotonic()
+        return self.result
+
+
+class HealthCheckMiddleware:
+    """Отвечает на /healthz и /readyz до остальных middleware.
+
+    Пробы оркестратора не проходят через журнал запросов, CORS, сжатие и
+    авторизацию. /healthz — только сам процесс; /readyz — готовность
+    принимать трафик: БД, каталоги загрузок и остановка процесса.
+    """
+
+    def __init__(self, app: ASGIApp, db_check_interval: float, db_timeout: float):
+        self.app = app
+        self.db_check = DatabaseCheck(db_check_interval, db_timeout)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "http" and scope["path"] == "/healthz":
+            await self._respond(send, 200, {"status": "ok", "uptime": round(time.monotonic() - STARTED, 1)})
+        elif scope["type"] == "http" and scope["path"] == "/readyz":
+            await self._ready(send)
+        else:
+            await self.app(scope, receive, send)
+
+    async def _ready(self, send: Send):
+        if lifecycle.draining.is_set():
+            await self._respond(send, 503, {"status": "draining"})
+            return
+        db = await self.db_check.get()
+        dirs = writable_dirs()
+        ready = db["ok"] and all(dirs.values())
+        await self._respond(send, 200 if ready else 503, {
+            "status": "ready" if ready else "not_ready",
+            "database": db,
+            "pool": pool_status(),
+            "writable": dirs,
+            "concurrency": limiter.stats(),
+        })
+
+    @staticmethod
+    async def _respond(send: Send, status_code: int, content: dict):
+        body = dumps(content)
+        await send({
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"cache-control", b"no-store"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,61 @@
+import logging
+import threading
+import time
+from typing import Callable, List
+
+import anyio.to_thread
+
+from app import database
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_warmups: List[Callable[[], None]] = []
+
+draining = threading.Event()
+
+
+def warmup(func: Callable[[], None]):
+    """Регистрирует прогрев, который выполняется в каждом рабочем процессе до приема запросов."""
+    _warmups.append(func)
+    return func
+
+
+def after_fork():
+    """Вызывается в дочернем процессе сразу после fork.
+
+    Соединения пула, открытые мастером при предзагрузке, остаются у
+    мастера: дочерний процесс забывает их, не закрывая чужие сокеты.
+    """
+    for engine in database.created_engines():
+        engine.dispose(close=False)
+
+
+def configure_threadpool(size: int):
+    anyio.to_thread.current_default_thread_limiter().total_tokens = size
+
+
+def run_warmups():
+    for func in _warmups:
+        started = time.perf_counter()
+        try:
+            func()
+        except Exception as e:
+            logger.warning(f"Прогрев {func.__name__} не выполнен: {e}")
+            continue
+        logger.info(f"Прогрев {func.__name__}: {(time.perf_counter() - started) * 1000:.0f} мс")
+
+
+@warmup
+def warm_connection_pool():
+    """Открывает постоянные соединения пула заранее, а не на первых запросах."""
+    engine = database.get_engine()
+    size = getattr(engine.pool, "size", None)
+    count = min(size(), settings.THREADPOOL_SIZE) if size else 1
+    connections = []
+    try:
+        for _ in range(count):
+            connections.append(engine.connect())
+    finally:
+        for conn in connections:
+            conn.close()
@@ -0,0 +1,183 @@
+import asyncio
+import logging
+import math
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Optional
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+_middleware: Optional["ConcurrencyLimitMiddleware"] = None
+
+# Проверки живости не ограничиваются: балансировщик должен получать ответ и под нагрузкой
+EXEMPT_PATHS = frozenset({"/healthz", "/readyz"})
+# Долгие потоки событий держали бы разрешение часами
+EXEMPT_PREFIXES = ("/events/",)
+
+AUTH_PATHS = frozenset({"/auth/login", "/auth/register"})
+TRANSFER_PATHS = frozenset({"/applications/upload-resume", "/jobs/bulk"})
+TRANSFER_PREFIXES = ("/attachments/uploads", "/exports/")
+
+
+def route_class(method: str, path: str) -> Optional[str]:
+    """Класс маршрута для лимита параллельности; None — без ограничения.
+
+    auth — проверка пароля bcrypt, uploads — передача файлов (резюме,
+    вложения, импорт и выгрузки), остальное делится на чтение и запись.
+    """
+    if path in EXEMPT_PATHS or path.startswith(EXEMPT_PREFIXES):
+        return None
+    if path in AUTH_PATHS:
+        return "auth"
+    if path in TRANSFER_PATHS or path.startswith(TRANSFER_PREFIXES):
+        return "uploads"
+    if method in ("GET", "HEAD", "OPTIONS"):
+        return "reads"
+    return "writes"
+
+
+@dataclass
+class Budget:
+    limit: int
+    queue_size: int
+
+
+class ClassLimiter:
+    """Не больше limit запросов одновременно и не больше queue_size ждущих.
+
+    Ждущий дольше max_wait получает отказ. Создается в цикле событий
+    рабочего процесса, поэтому обходится без блокировок.
+    """
+
+    def __init__(self, name: str, budget: Budget, max_wait: float):
+        self.name = name
+        self.limit = budget.limit
+        self.queue_size = budget.queue_size
+        self.max_wait = max_wait
+        self.active = 0
+        self.waiting = 0
+        self.shed = 0
+        self._semaphore = asyncio.Semaphore(budget.limit)
+
+    async def acquire(self) -> bool:
+        if not self._semaphore.locked() and not self.waiting:
+            await self._semaphore.acquire()
+            self.active += 1
+            return True
+        if self.waiting >= self.queue_size:
+            self.shed += 1
+            return False
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.max_wait)
+        except asyncio.TimeoutError:
+            self.shed += 1
+            return False
+        finally:
+            self.waiting -= 1
+        self.active += 1
+        return True
+
+    def release(self):
+        self.active -= 1
+        self._semaphore.release()
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "active": self.active,
+            "waiting": self.waiting,
+            "queue_size": self.queue_size,
+            "shed": self.shed,
+        }
+
+
+class ConcurrencyLimitMiddleware:
+    """Ограничивает параллельность по классам маршрутов и сбрасывает лишнее.
+
+    Синхронные обработчики выполняются в пуле потоков; без лимита запросы
+    сверх пула молча ждут в его очереди, пока клиент не отвалится по
+    таймауту. Здесь очередь ограничена, а при переполнении или долгом
+    ожидании сразу отдается 503 с Retry-After.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        budgets: Dict[str, Budget],
+        max_wait: float,
+        retry_after: float,
+        classify: Callable[[str, str], Optional[str]] = route_class,
+    ):
+        self.app = app
+        self.budgets = budgets
+        self.max_wait = max_wait
+        self.retry_after = retry_after
+        self.classify = classify
+        self.limiters: Dict[str, ClassLimiter] = {}
+        self._loop = None
+        global _middleware
+        _middleware = self
+
+    def _limiter(self, name: str) -> Optional[ClassLimiter]:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Семафоры привязаны к циклу событий; новый цикл — новые лимиты
+            self.limiters = {}
+            self._loop = loop
+        limiter = self.limiters.get(name)
+        if limiter is None and name in self.budgets:
+            limiter = self.limiters[name] = ClassLimiter(name, self.budgets[name], self.max_wait)
+        return limiter
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        name = self.classify(scope["method"], scope["path"])
+        limiter = self._limiter(name) if name else None
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        if not await limiter.acquire():
+            logger.warning(
+                f"Запрос {scope['method']} {scope['path']} сброшен: класс {name} перегружен "
+                f"(ожидание {(time.perf_counter() - started) * 1000:.0f} мс)"
+            )
+            response = JSONResponse(
+                status_code=503,
+                content={
+                    "error": "Сервер перегружен",
+                    "detail": f"Превышен лимит одновременных запросов класса {name}",
+                    "help": "Повторите запрос через несколько секунд",
+                },
+                headers={"Retry-After": str(max(1, math.ceil(self.retry_after)))},
+            )
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
+
+    def stats(self) -> Dict[str, dict]:
+        return {name: limiter.stats() for name, limiter in self.limiters.items()}
+
+
+def stats() -> Dict[str, dict]:
+    """Загрузка классов маршрутов в этом процессе; пусто, если лимит выключен."""
+    return _middleware.stats() if _middleware is not None else {}
+
+
+def check_threadpool(budgets: Iterable[Budget], threadpool_size: int):
+    total = sum(budget.limit for budget in budgets)
+    if total > threadpool_size:
+        logger.warning(
+            f"Сумма лимитов параллельности ({total}) больше пула потоков ({threadpool_size}): "
+            f"часть запросов будет ждать в очереди пула без ограничения времени"
+        )
@@ -2,6 +2,7 @@ from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from app.core import tracing
 from app.core.config import settings
 import logging
 
@@ -9,11 +10,11 @@ logger = logging.getLogger(__name__)
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
-SECRET_KEY = getattr(settings, 'SECRET_KEY', 'your-secret-key-change-in-production-min-32-chars')
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30 * 24 * 60
 
 
+@tracing.traced()
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     password_bytes = plain_password.encode('utf-8')
     if len(password_bytes) > 72:
@@ -21,6 +22,7 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+@tracing.traced()
 def get_password_hash(password: str) -> str:
     if not password:
         raise ValueError("Пароль не может быть пустым")
@@ -31,6 +33,7 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+@tracing.traced()
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -38,23 +41,24 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     else:
         expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
-    logger.info(f"Создание токена с SECRET_KEY: {SECRET_KEY[:20]}...")
+    logger.info(f"Создание токена с SECRET_KEY: {settings.SECRET_KEY[:20]}...")
     logger.info(f"   Данные для токена: {to_encode}")
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
     logger.info(f"Токен создан: {encoded_jwt[:30]}...")
     return encoded_jwt
 
 
+@tracing.traced()
 def decode_access_token(token: str) -> Optional[dict]:
     try:
         print(f"Декодирование токена...")
-        print(f"   SECRET_KEY: {SECRET_KEY[:30]}...")
+        print(f"   SECRET_KEY: {settings.SECRET_KEY[:30]}...")
         print(f"   Алгоритм: {ALGORITHM}")
         print(f"   Длина токена: {len(token)}")
-        logger.info(f"Попытка декодирования токена с SECRET_KEY: {SECRET_KEY[:20]}...")
+        logger.info(f"Попытка декодирования токена с SECRET_KEY: {settings.SECRET_KEY[:20]}...")
         logger.info(f"   Алгоритм: {ALGORITHM}")
         logger.info(f"   Длина токена: {len(token)}")
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
         print(f"Токен декодирован успешно: {payload}")
         logger.info(f"Токен успешно декодирован: {payload}")
         return payload
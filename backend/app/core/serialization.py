@@ -0,0 +1,98 @@
+import json
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Type
+
+from fastapi import HTTPException, status
+from fastapi.responses import Response
+from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(value: Any):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Тип {type(value).__name__} не сериализуется в JSON")
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+class FastJSONResponse(Response):
+    """JSON-ответ без валидации через response_model, кодируется orjson при наличии."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def schema_fields(schema: Type[BaseModel]) -> List[str]:
+    return list(schema.model_fields)
+
+
+def parse_fields(
+    fields: Optional[str],
+    schema: Type[BaseModel],
+    presets: Optional[Dict[str, List[str]]] = None,
+) -> Optional[List[str]]:
+    """Разбирает параметр ?fields= в список колонок из белого списка схемы.
+
+    Принимает имя набора из presets или поля через запятую; id возвращается всегда.
+    """
+    if not fields:
+        return None
+    if presets and fields in presets:
+        return presets[fields]
+    allowed = schema_fields(schema)
+    requested = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    unknown = [name for name in requested if name not in allowed]
+    if unknown or not requested:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "error": "Некорректный список полей",
+                "detail": f"Неизвестные поля: {', '.join(unknown)}" if unknown else "Список полей пуст",
+                "help": f"Доступные поля: {', '.join(allowed)}"
+                        + (f"; наборы: {', '.join(presets)}" if presets else ""),
+            },
+        )
+    if "id" in allowed and "id" not in requested:
+        requested.insert(0, "id")
+    return requested
+
+
+def select_columns(model, fields: Iterable[str]):
+    return select(*(getattr(model, name) for name in fields))
+
+
+def fetch_rows(db: Session, stmt) -> List[dict]:
+    """Выполняет select по колонкам и возвращает строки как словари.
+
+    Колонки не превращаются в ORM-объекты и не попадают в identity map.
+    """
+    result = db.execute(stmt)
+    keys = list(result.keys())
+    return [dict(zip(keys, row)) for row in result]
+
+
+def fast_list(
+    db: Session,
+    model,
+    schema: Type[BaseModel],
+    *where,
+    fields: Optional[List[str]] = None,
+    order_by: Optional[Any] = None,
+) -> FastJSONResponse:
+    stmt = select_columns(model, fields or schema_fields(schema)).where(*where)
+    if order_by is not None:
+        stmt = stmt.order_by(order_by)
+    return FastJSONResponse(fetch_rows(db, stmt))
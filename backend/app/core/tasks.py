@@ -0,0 +1,352 @@
+import json
+import logging
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_handlers: Dict[str, Callable[[dict], Any]] = {}
+
+
+def task(name: str):
+    """Регистрирует обработчик фоновой задачи под именем name."""
+    def decorator(func: Callable[[dict], Any]):
+        _handlers[name] = func
+        return func
+    return decorator
+
+
+class TaskQueue:
+    """Очередь задач в локальном SQLite-файле.
+
+    Задача с уже существующим ключом повторно не ставится, поэтому ключ
+    делает постановку идемпотентной. Захват задачи выполняется в
+    BEGIN IMMEDIATE, так что несколько процессов могут разбирать одну очередь.
+    Не заданные параметры берутся из настроек TASK_* при первом обращении
+    к файлу очереди.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        max_attempts: Optional[int] = None,
+        base_delay: Optional[float] = None,
+        max_delay: Optional[float] = None,
+        lease: float = 300.0,
+    ):
+        self.path = Path(path) if path is not None else None
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.lease = lease
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+
+    def _apply_settings(self):
+        if self.path is None:
+            self.path = Path(settings.TASK_QUEUE_PATH)
+        if self.max_attempts is None:
+            self.max_attempts = settings.TASK_MAX_ATTEMPTS
+        if self.base_delay is None:
+            self.base_delay = settings.TASK_RETRY_BASE_DELAY
+        if self.max_delay is None:
+            self.max_delay = settings.TASK_RETRY_MAX_DELAY
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self._apply_settings()
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        if not self._schema_ready:
+            with self._schema_lock:
+                if not self._schema_ready:
+                    self._create_schema(conn)
+                    self._schema_ready = True
+        return conn
+
+    @staticmethod
+    def _create_schema(conn: sqlite3.Connection):
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                key TEXT NOT NULL UNIQUE,
+                name TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                max_attempts INTEGER NOT NULL,
+                run_at REAL NOT NULL,
+                locked_until REAL,
+                last_error TEXT,
+                result TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_tasks_status_run_at ON tasks(status, run_at);
+        """)
+
+    def enqueue(
+        self,
+        name: str,
+        payload: Optional[dict] = None,
+        key: Optional[str] = None,
+        delay: float = 0,
+        max_attempts: Optional[int] = None,
+    ) -> str:
+        key = key or f"{name}:{uuid.uuid4()}"
+        now = time.time()
+        self._connect().execute(
+            """
+            INSERT OR IGNORE INTO tasks
+                (key, name, payload, max_attempts, run_at, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                key,
+                name,
+                json.dumps(payload or {}, default=str),
+                max_attempts or self.max_attempts,
+                now + delay,
+                now,
+                now,
+            ),
+        )
+        return key
+
+    def claim(self) -> Optional[sqlite3.Row]:
+        conn = self._connect()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                """
+                SELECT * FROM tasks
+                WHERE (status = 'pending' AND run_at <= ?)
+                   OR (status = 'running' AND locked_until < ?)
+                ORDER BY run_at
+                LIMIT 1
+                """,
+                (now, now),
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    """
+                    UPDATE tasks
+                    SET status = 'running', attempts = attempts + 1,
+                        locked_until = ?, updated_at = ?
+                    WHERE id = ?
+                    """,
+                    (now + self.lease, now, row["id"]),
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return row
+
+    def complete(self, task_id: int, result: Any = None):
+        self._connect().execute(
+            """
+            UPDATE tasks
+            SET status = 'done', result = COALESCE(?, result),
+                locked_until = NULL, updated_at = ?
+            WHERE id = ?
+            """,
+            (None if result is None else json.dumps(result, default=str), time.time(), task_id),
+        )
+
+    def fail(self, task_id: int, attempts: int, max_attempts: int, error: str):
+        conn = self._connect()
+        now = time.time()
+        if attempts >= max_attempts:
+            status, run_at = "failed", now
+        else:
+            backoff = min(self.max_delay, self.base_delay * 2 ** (attempts - 1))
+            status, run_at = "pending", now + backoff * (0.5 + random.random() / 2)
+        conn.execute(
+            """
+            UPDATE tasks
+            SET status = ?, run_at = ?, locked_until = NULL,
+                last_error = ?, updated_at = ?
+            WHERE id = ?
+            """,
+            (status, run_at, error[:4000], now, task_id),
+        )
+        return status
+
+    def set_result(self, key: str, result: Any):
+        self._connect().execute(
+            "UPDATE tasks SET result = ?, updated_at = ? WHERE key = ?",
+            (json.dumps(result, default=str), time.time(), key),
+        )
+
+    def get(self, key: str) -> Optional[dict]:
+        row = self._connect().execute("SELECT * FROM tasks WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        data = dict(row)
+        data["payload"] = json.loads(data["payload"])
+        data["result"] = json.loads(data["result"]) if data["result"] else None
+        return data
+
+    def purge_finished(self, older_than: float) -> int:
+        cursor = self._connect().execute(
+            "DELETE FROM tasks WHERE status IN ('done', 'failed') AND updated_at < ?",
+            (time.time() - older_than,),
+        )
+        return cursor.rowcount
+
+
+class WorkerPool:
+    """Пул потоков, разбирающих TaskQueue.
+
+    Не заданные workers и poll_interval берутся из настроек TASK_* в start().
+    """
+
+    def __init__(
+        self,
+        queue: TaskQueue,
+        workers: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        retention: float = 86400,
+    ):
+        self.queue = queue
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self._threads = []
+        self._stop = threading.Event()
+        self._wake = threading.Condition()
+        self._periodic = []
+
+    def every(self, interval: Union[float, Callable[[], float]], name: str, payload: Optional[dict] = None):
+        """Ставит задачу name раз в interval секунд.
+
+        Ключ строится от номера интервала, поэтому при нескольких процессах
+        за один интервал задача выполнится один раз. interval может быть
+        функцией: тогда он читается в start(), а не при регистрации.
+        """
+        self._periodic.append((interval, name, payload or {}))
+
+    def start(self):
+        if self._threads:
+            return
+        if self.workers is None:
+            self.workers = settings.TASK_WORKERS
+        if self.poll_interval is None:
+            self.poll_interval = settings.TASK_POLL_INTERVAL
+        self._periodic = [
+            (interval() if callable(interval) else interval, name, payload)
+            for interval, name, payload in self._periodic
+        ]
+        self._stop.clear()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"task-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        scheduler = threading.Thread(target=self._schedule, name="task-scheduler", daemon=True)
+        scheduler.start()
+        self._threads.append(scheduler)
+        logger.info(f"Запущено обработчиков фоновых задач: {self.workers}")
+
+    def stop(self, timeout: float = 10.0):
+        self._stop.set()
+        self.notify()
+        deadline = time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+        self._threads = []
+
+    def notify(self):
+        with self._wake:
+            self._wake.notify_all()
+
+    def _schedule(self):
+        last_purge = 0.0
+        while not self._stop.is_set():
+            now = time.time()
+            for interval, name, payload in self._periodic:
+                try:
+                    self.queue.enqueue(name, payload, key=f"{name}:{int(now // interval)}")
+                except Exception as e:
+                    logger.error(f"Не удалось запланировать задачу {name}: {e}")
+            if now - last_purge > 3600:
+                try:
+                    self.queue.purge_finished(self.retention)
+                except Exception as e:
+                    logger.error(f"Не удалось очистить завершенные задачи: {e}")
+                last_purge = now
+            self.notify()
+            self._stop.wait(min([interval for interval, _, _ in self._periodic] + [60.0]))
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                row = self.queue.claim()
+            except Exception as e:
+                logger.error(f"Ошибка чтения очереди задач: {e}")
+                row = None
+            if row is None:
+                with self._wake:
+                    self._wake.wait(self.poll_interval)
+                continue
+            self._execute(row)
+
+    def _execute(self, row: sqlite3.Row):
+        handler = _handlers.get(row["name"])
+        attempts = row["attempts"] + 1
+        if handler is None:
+            self.queue.fail(row["id"], attempts, attempts, f"Неизвестная задача: {row['name']}")
+            logger.error(f"Неизвестная задача {row['name']} (ключ {row['key']})")
+            return
+        _current.key = row["key"]
+        try:
+            result = handler(json.loads(row["payload"]))
+        except Exception as e:
+            status = self.queue.fail(row["id"], attempts, row["max_attempts"], f"{type(e).__name__}: {e}")
+            logger.warning(
+                f"Задача {row['name']} (ключ {row['key']}) завершилась ошибкой "
+                f"на попытке {attempts}/{row['max_attempts']}: {e}; статус: {status}"
+            )
+        else:
+            self.queue.complete(row["id"], result)
+        finally:
+            _current.key = None
+
+
+_current = threading.local()
+
+queue = TaskQueue()
+pool = WorkerPool(queue)
+
+
+def enqueue(name: str, payload: Optional[dict] = None, key: Optional[str] = None, delay: float = 0) -> Optional[str]:
+    """Ставит задачу в очередь и будит обработчики.
+
+    Ошибка постановки не должна ломать уже выполненный запрос, поэтому она
+    только логируется.
+    """
+    try:
+        key = queue.enqueue(name, payload, key=key, delay=delay)
+    except Exception as e:
+        logger.error(f"Не удалось поставить задачу {name} в очередь: {e}")
+        return None
+    pool.notify()
+    return key
+
+
+def current_task_key() -> Optional[str]:
+    return getattr(_current, "key", None)
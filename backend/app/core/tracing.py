@@ -0,0 +1,402 @@
+"""Трассировка запросов: из чего сложилось время ответа.
+
+Каждый запрос, попавший в выборку, становится трассой из вложенных
+спанов: middleware, зависимости FastAPI, тело обработчика, SQL-запросы и
+работа с файлами. Решение о выборке принимается один раз в начале
+запроса (TRACING_SAMPLE_RATE) или берется из входящего заголовка
+traceparent; id трассы возвращается клиенту в TRACING_RESPONSE_HEADER.
+Готовая трасса уходит в экспортер: JSONL-файл, кольцевой буфер в памяти
+или свой класс "модуль:имя".
+
+При TRACING_ENABLED=false ничего не подключается и трасс не бывает. Вне
+трассы span() и обертка traced стоят одного чтения ContextVar.
+"""
+import asyncio
+import functools
+import importlib
+import inspect
+import json
+import logging
+import random
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.middleware import Middleware
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_current: ContextVar[Optional["Span"]] = ContextVar("tracing_span", default=None)
+
+
+def _new_id(bits: int) -> str:
+    return f"{random.getrandbits(bits):0{bits // 4}x}"
+
+
+class Trace:
+    __slots__ = ("trace_id", "spans")
+
+    def __init__(self, trace_id: str):
+        self.trace_id = trace_id
+        self.spans: List["Span"] = []
+
+    def as_dict(self) -> dict:
+        return {"trace_id": self.trace_id, "spans": [span.as_dict() for span in self.spans]}
+
+
+class Span:
+    """Отрезок работы внутри трассы.
+
+    Как контекстный менеджер становится текущим, и спаны, открытые внутри,
+    записываются его детьми. start()/end() — для листьев, которые
+    открываются и закрываются в разных обработчиках (SQL).
+    """
+
+    __slots__ = ("trace", "name", "kind", "span_id", "parent_id", "attributes", "started_at", "_started", "duration", "error", "_token")
+
+    def __init__(self, trace: Trace, name: str, kind: str, parent_id: Optional[str], attributes: dict):
+        self.trace = trace
+        self.name = name
+        self.kind = kind
+        self.span_id = _new_id(64)
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.duration = None
+        self.error = None
+
+    def set(self, key: str, value):
+        self.attributes[key] = value
+
+    def start(self) -> "Span":
+        self.started_at = time.time()
+        self._started = time.perf_counter()
+        return self
+
+    def end(self, error: Optional[BaseException] = None):
+        self.duration = time.perf_counter() - self._started
+        if error is not None:
+            self.error = f"{type(error).__name__}: {error}"[:300]
+        self.trace.spans.append(self)
+
+    def __enter__(self) -> "Span":
+        self.start()
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _current.reset(self._token)
+        self.end(exc)
+        return False
+
+    def as_dict(self) -> dict:
+        data = {
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start": round(self.started_at, 6),
+            "duration_ms": round(self.duration * 1000, 3),
+            "attributes": self.attributes,
+        }
+        if self.error:
+            data["error"] = self.error
+        return data
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def set(self, key: str, value):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+def current() -> Optional[Span]:
+    return _current.get()
+
+
+def span(name: str, kind: str = "internal", **attributes):
+    """Спан-потомок текущего; вне трассы — общий пустой контекстный менеджер."""
+    parent = _current.get()
+    if parent is None:
+        return _NOOP
+    return Span(parent.trace, name, kind, parent.span_id, attributes)
+
+
+def traced(name: Optional[str] = None, kind: str = "internal"):
+    """Декоратор: вызов функции — спан. Понимает обычные функции, корутины
+    и генераторы (зависимости с yield): у генератора отдельными спанами
+    идут код до yield и код после него.
+
+    Вне трассы (в том числе при выключенной трассировке) функция
+    вызывается напрямую, а настройки при декорировании не читаются.
+    Сигнатура сохраняется через __wrapped__, так что FastAPI видит
+    параметры исходной функции.
+    """
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__name__
+
+        if inspect.isgeneratorfunction(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if _current.get() is None:
+                    yield from func(*args, **kwargs)
+                    return
+                gen = func(*args, **kwargs)
+                with span(span_name, kind):
+                    value = next(gen)
+                try:
+                    yield value
+                except BaseException as e:
+                    with span(f"{span_name} exit", kind):
+                        try:
+                            gen.throw(e)
+                        except StopIteration:
+                            return
+                    raise
+                else:
+                    with span(f"{span_name} exit", kind):
+                        next(gen, None)
+        elif asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                if _current.get() is None:
+                    return await func(*args, **kwargs)
+                with span(span_name, kind):
+                    return await func(*args, **kwargs)
+        else:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if _current.get() is None:
+                    return func(*args, **kwargs)
+                with span(span_name, kind):
+                    return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class JsonlExporter:
+    """Одна строка JSON на трассу; файл открыт все время работы процесса."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file = None
+        self._lock = threading.Lock()
+
+    def export(self, trace: Trace):
+        line = json.dumps(trace.as_dict(), ensure_ascii=False, default=str) + "\n"
+        with self._lock:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(line)
+            self._file.flush()
+
+
+class MemoryExporter:
+    """Последние size трасс в памяти: для отладки и замеров."""
+
+    def __init__(self, size: int):
+        self._traces = deque(maxlen=size)
+
+    def export(self, trace: Trace):
+        self._traces.append(trace.as_dict())
+
+    def traces(self) -> List[dict]:
+        return list(self._traces)
+
+    def clear(self):
+        self._traces.clear()
+
+
+def build_exporter(name: str):
+    """jsonl, memory или "модуль:имя" — класс или фабрика без аргументов
+    с методом export(trace)."""
+    if name == "jsonl":
+        return JsonlExporter(settings.TRACING_PATH)
+    if name == "memory":
+        return MemoryExporter(settings.TRACING_BUFFER_SIZE)
+    module_name, sep, attr = name.partition(":")
+    if not sep:
+        raise ValueError(f"Неизвестный экспортер трасс {name!r}: ожидается jsonl, memory или модуль:имя")
+    return getattr(importlib.import_module(module_name), attr)()
+
+
+_exporter = None
+_exporter_lock = threading.Lock()
+
+
+def exporter():
+    global _exporter
+    if _exporter is None:
+        with _exporter_lock:
+            if _exporter is None:
+                _exporter = build_exporter(settings.TRACING_EXPORTER)
+    return _exporter
+
+
+def set_exporter(value):
+    global _exporter
+    _exporter = value
+
+
+def _parse_traceparent(value: bytes):
+    # W3C: 00-<trace id, 32 hex>-<span id, 16 hex>-<флаги>
+    parts = value.decode("latin-1").strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16 or len(parts[3]) != 2:
+        return None
+    try:
+        sampled = bool(int(parts[3], 16) & 1)
+        int(parts[1], 16)
+        int(parts[2], 16)
+    except ValueError:
+        return None
+    return parts[1], parts[2], sampled
+
+
+class TracingMiddleware:
+    """Открывает корневой спан запроса и отдает трассу экспортеру.
+
+    Входящий traceparent задает id трассы, родителя и решение о выборке;
+    без него решает TRACING_SAMPLE_RATE. id трассы возвращается в
+    заголовке ответа и для запросов вне выборки: по нему можно найти
+    запрос в журналах вызывающей стороны.
+    """
+
+    def __init__(self, app: ASGIApp, sample_rate: float, response_header: str):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.response_header = response_header.lower().encode("latin-1")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        incoming = None
+        for key, value in scope["headers"]:
+            if key == b"traceparent":
+                incoming = _parse_traceparent(value)
+                break
+        if incoming is not None:
+            trace_id, parent_id, sampled = incoming
+        else:
+            trace_id, parent_id = _new_id(128), None
+            sampled = random.random() < self.sample_rate
+
+        header = (self.response_header, trace_id.encode("latin-1"))
+        root = None
+
+        async def send_with_trace_id(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", []), header]}
+                if root is not None:
+                    root.set("http.status_code", message["status"])
+            await send(message)
+
+        if not sampled:
+            await self.app(scope, receive, send_with_trace_id)
+            return
+
+        trace = Trace(trace_id)
+        root = Span(trace, f"{scope['method']} {scope['path']}", "server", parent_id, {
+            "http.method": scope["method"],
+            "http.path": scope["path"],
+        })
+        try:
+            with root:
+                await self.app(scope, receive, send_with_trace_id)
+        finally:
+            try:
+                exporter().export(trace)
+            except Exception as e:
+                logger.error(f"Не удалось выгрузить трассу {trace_id}: {e}")
+
+
+class MiddlewareSpan:
+    """Обертка над middleware из app.user_middleware: спан на его вызов."""
+
+    def __init__(self, app: ASGIApp, middleware: Middleware, name: str):
+        cls, args, kwargs = middleware
+        self.app = cls(app, *args, **kwargs)
+        self.name = name
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or _current.get() is None:
+            await self.app(scope, receive, send)
+            return
+        with span(self.name, "middleware"):
+            await self.app(scope, receive, send)
+
+
+def instrument_middleware(app):
+    """Оборачивает уже добавленные middleware; вызывать до первого запроса."""
+    wrapped = []
+    for middleware in app.user_middleware:
+        dispatch = middleware.kwargs.get("dispatch")
+        name = dispatch.__name__ if dispatch is not None else middleware.cls.__name__
+        wrapped.append(Middleware(MiddlewareSpan, middleware=middleware, name=name))
+    app.user_middleware[:] = wrapped
+
+
+def instrument_routes(app):
+    """Спан на тело каждого обработчика, без разбора параметров и сериализации.
+
+    Подменяется dependant.call маршрута. Обработчик остается корутиной или
+    обычной функцией, как был: FastAPI выбирает способ вызова по нему.
+    """
+    for route in app.routes:
+        if not isinstance(route, APIRoute):
+            continue
+        methods = ",".join(sorted(route.methods))
+        route.dependant.call = traced(f"{methods} {route.path_format}", "handler")(route.dependant.call)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    parent = _current.get()
+    if parent is None or context is None:
+        return
+    context._tracing_span = Span(parent.trace, "sql", "sql", parent.span_id, {
+        "db.system": conn.dialect.name,
+        "db.statement": statement[:settings.TRACING_SQL_MAX_LENGTH],
+    }).start()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    span = getattr(context, "_tracing_span", None)
+    if span is not None:
+        context._tracing_span = None
+        span.set("db.rowcount", cursor.rowcount)
+        span.end()
+
+
+def _handle_error(exception_context):
+    span = getattr(exception_context.execution_context, "_tracing_span", None)
+    if span is not None:
+        exception_context.execution_context._tracing_span = None
+        span.end(exception_context.original_exception)
+
+
+def instrument_sql():
+    """Спан на каждый SQL-запрос всех движков, в том числе реплик."""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "handle_error", _handle_error)
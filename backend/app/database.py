@@ -1,12 +1,320 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+import hashlib
+import itertools
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from sqlalchemy import TIMESTAMP, Column, create_engine, event, text
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.orm import Session, sessionmaker, declarative_base, with_loader_criteria
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.sql.lambdas import StatementLambdaElement
 from app.core.config import settings
 
-DATABASE_URL = (
-    f"mysql+mysqlconnector://{settings.DB_USER}:{settings.DB_PASSWORD}"
-    f"@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}"
-)
+logger = logging.getLogger(__name__)
 
-engine = create_engine(DATABASE_URL, echo=True)
-SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
 Base = declarative_base()
+
+
+class SoftDeleteMixin:
+    """Строка с deleted_at считается удаленной и не видна ORM-запросам.
+
+    Физически ее и зависимые строки удаляет фоновая очистка
+    (app.services.purge). Увидеть такие строки можно с
+    execution_options(include_deleted=True).
+    """
+
+    deleted_at = Column(TIMESTAMP, nullable=True)
+
+
+MYSQL_DRIVERS = ("mysqlconnector", "mysqldb", "pymysql")
+
+
+def database_url(with_database: bool = True) -> URL:
+    """URL основной БД: DATABASE_URL, а без него MySQL из DB_* с драйвером DB_DRIVER.
+
+    with_database=False дает URL сервера без базы, чтобы ее создать.
+    """
+    if settings.DATABASE_URL:
+        url = make_url(settings.DATABASE_URL)
+        return url if with_database or url.get_backend_name() == "sqlite" else url.set(database=None)
+    if settings.DB_DRIVER not in MYSQL_DRIVERS:
+        raise ValueError(f"DB_DRIVER должен быть одним из: {', '.join(MYSQL_DRIVERS)}")
+    return URL.create(
+        f"mysql+{settings.DB_DRIVER}",
+        username=settings.DB_USER,
+        password=settings.DB_PASSWORD,
+        host=settings.DB_HOST,
+        port=settings.DB_PORT,
+        database=settings.DB_NAME if with_database else None,
+        # mysqlclient по умолчанию берет latin1/utf8 из конфигурации клиента
+        query={"charset": "utf8mb4"} if settings.DB_DRIVER != "mysqlconnector" else {},
+    )
+
+
+def engine_options(url: URL) -> dict:
+    """Параметры create_engine, зависящие от СУБД."""
+    if url.get_backend_name() != "sqlite":
+        return {}
+    options = {"connect_args": {"check_same_thread": False}}
+    if url.database in (None, "", ":memory:"):
+        # Каждое соединение с :memory: — своя пустая база; нужно одно на всех
+        options["poolclass"] = StaticPool
+    return options
+
+
+def build_engine(url=None, **kwargs) -> Engine:
+    url = make_url(url) if url is not None else database_url()
+    return create_engine(url, **{**engine_options(url), **kwargs})
+
+
+class Replica:
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.healthy = True
+        self.lag = 0.0
+        self.checked_at = 0.0
+
+    @property
+    def name(self) -> str:
+        return self.engine.url.host or str(self.engine.url.database)
+
+
+class ReplicaSet:
+    """Реплики для чтения с учетом их доступности и отставания.
+
+    Состояние обновляет фоновый поток раз в check_interval секунд, а ошибка
+    соединения с репликой сразу выводит ее из ротации до следующей проверки.
+    """
+
+    def __init__(self, urls: List[str], max_lag: float, check_interval: float):
+        self.replicas = [Replica(build_engine(url, pool_pre_ping=True)) for url in urls]
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._cycle = itertools.cycle(self.replicas) if self.replicas else None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        for replica in self.replicas:
+            event.listen(replica.engine, "handle_error", self._on_error(replica))
+
+    def _on_error(self, replica: Replica):
+        def handle_error(context):
+            if context.is_disconnect or context.connection is None:
+                replica.healthy = False
+                logger.warning(f"Реплика {replica.name} недоступна, чтение переключено на основную БД")
+        return handle_error
+
+    def pick(self) -> Optional[Engine]:
+        if self._cycle is None:
+            return None
+        with self._lock:
+            for _ in range(len(self.replicas)):
+                replica = next(self._cycle)
+                if replica.healthy and replica.lag <= self.max_lag:
+                    return replica.engine
+        return None
+
+    def check(self):
+        for replica in self.replicas:
+            try:
+                with replica.engine.connect() as conn:
+                    conn.execute(text("SELECT 1"))
+                    replica.lag = self._lag(conn)
+                replica.healthy = True
+            except Exception as e:
+                if replica.healthy:
+                    logger.warning(f"Реплика {replica.name} не прошла проверку: {e}")
+                replica.healthy = False
+            replica.checked_at = time.time()
+
+    @staticmethod
+    def _lag(conn) -> float:
+        if conn.dialect.name != "mysql":
+            return 0.0
+        try:
+            row = conn.execute(text("SHOW REPLICA STATUS")).mappings().first()
+        except Exception:
+            return 0.0
+        if row is None:
+            return 0.0
+        lag = row.get("Seconds_Behind_Source")
+        return float("inf") if lag is None else float(lag)
+
+    def start(self):
+        if not self.replicas or self._thread:
+            return
+        self.check()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._monitor, name="replica-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(5)
+            self._thread = None
+
+    def _monitor(self):
+        while not self._stop.wait(self.check_interval):
+            self.check()
+
+
+class StickyWrites:
+    """Помнит, кто недавно писал, чтобы его чтения шли в основную БД.
+
+    Отметки лежат в SQLite-файле, общем для рабочих процессов serve.py:
+    следующий запрос того же клиента обычно попадает в другой процесс.
+    Ключ хранится в виде хэша, потому что это токен доступа. Если файл
+    недоступен, чтение идет в основную БД.
+    """
+
+    def __init__(self, path: Path, window: float):
+        self.path = Path(path)
+        self.window = window
+        self._local = threading.local()
+        self._purged_at = 0.0
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS sticky (key TEXT PRIMARY KEY, until REAL NOT NULL)")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _hash(key: str) -> str:
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def mark(self, key: str):
+        now = time.time()
+        try:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO sticky (key, until) VALUES (?, ?)", (self._hash(key), now + self.window)
+            )
+            if now - self._purged_at > 60:
+                self._purged_at = now
+                conn.execute("DELETE FROM sticky WHERE until < ?", (now,))
+        except (sqlite3.Error, OSError) as e:
+            logger.error(f"Не удалось отметить запись для read-your-writes: {e}")
+
+    def is_sticky(self, key: Optional[str]) -> bool:
+        if not key:
+            return False
+        try:
+            row = self._connect().execute("SELECT until FROM sticky WHERE key = ?", (self._hash(key),)).fetchone()
+        except (sqlite3.Error, OSError) as e:
+            logger.error(f"Не удалось проверить недавние записи: {e}")
+            return True
+        return row is not None and row[0] > time.time()
+
+
+_factories = {
+    "engine": lambda: build_engine(echo=settings.DB_ECHO),
+    "replicas": lambda: ReplicaSet(
+        settings.DB_REPLICA_URLS, settings.DB_REPLICA_MAX_LAG, settings.DB_REPLICA_CHECK_INTERVAL
+    ),
+    "sticky_writes": lambda: StickyWrites(settings.DB_STICKY_PATH, settings.DB_STICKY_SECONDS),
+}
+_init_lock = threading.Lock()
+
+
+def _lazy(name: str):
+    value = globals().get(name)
+    if value is None:
+        with _init_lock:
+            value = globals().get(name)
+            if value is None:
+                value = globals()[name] = _factories[name]()
+    return value
+
+
+def __getattr__(name: str):
+    """engine, replicas и sticky_writes создаются при первом обращении.
+
+    Импорт модуля не загружает драйвер БД и не читает настройки; присвоенное
+    снаружи значение (например, engine в скриптах) используется как есть.
+    """
+    if name in _factories:
+        return _lazy(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def get_engine() -> Engine:
+    return _lazy("engine")
+
+
+def created_engines() -> List[Engine]:
+    """Уже созданные движки: основной и реплики, без создания новых."""
+    engines = []
+    if globals().get("engine") is not None:
+        engines.append(globals()["engine"])
+    if globals().get("replicas") is not None:
+        engines.extend(replica.engine for replica in globals()["replicas"].replicas)
+    return engines
+
+
+class RoutingSession(Session):
+    """Сессия, которая отправляет чтение в реплику, а запись в основную БД.
+
+    В реплику уходят только сессии с info["read_only"], и только если их
+    владелец (info["sticky_key"]) не писал в последние DB_STICKY_SECONDS.
+    Отметка проверяется один раз на сессию и только при наличии реплик.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self.info.get("read_only") and not self._flushing:
+            replicas = _lazy("replicas")
+            if replicas.replicas:
+                sticky = self.info.get("sticky")
+                if sticky is None:
+                    sticky = self.info["sticky"] = _lazy("sticky_writes").is_sticky(self.info.get("sticky_key"))
+                if not sticky:
+                    replica = replicas.pick()
+                    if replica is not None:
+                        return replica
+        return _lazy("engine")
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _track_orm_writes(orm_execute_state):
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _hide_soft_deleted(orm_execute_state):
+    if (
+        orm_execute_state.is_select
+        and not orm_execute_state.is_column_load
+        and not orm_execute_state.is_relationship_load
+        and not orm_execute_state.execution_options.get("include_deleted", False)
+        # lambda_stmt (app.repositories) сам содержит условие deleted_at IS NULL
+        and not isinstance(orm_execute_state.statement, StatementLambdaElement)
+    ):
+        orm_execute_state.statement = orm_execute_state.statement.options(
+            with_loader_criteria(SoftDeleteMixin, lambda cls: cls.deleted_at.is_(None), include_aliases=True)
+        )
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _track_flush_writes(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _mark_sticky(session):
+    # Без реплик все чтения и так идут в основную БД
+    if session.info.pop("wrote", False) and session.info.get("sticky_key") and _lazy("replicas").replicas:
+        _lazy("sticky_writes").mark(session.info["sticky_key"])
+
+
+SessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False)
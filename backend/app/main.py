@@ -3,11 +3,22 @@ from fastapi.responses import JSONResponse, FileResponse
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from app.routers import jobs
-from app.database import Base, engine
+from app import database
 import app.models
-from app.routers import jobs, applications, employers, departments, auth, reviews, employer_reviews
+from app.routers import jobs, applications, employers, departments, auth, reviews, employer_reviews, events, exports, changes, favorites, interviews, attachments
 from app.core.config import settings
+from app.core import tasks, lifecycle, tracing
+from app.core.broker import broker
+from app.core.events import hub
+from app.core.compression import CompressionMiddleware
+from app.core.limiter import Budget, ConcurrencyLimitMiddleware, check_threadpool
+from app.core.health import HealthCheckMiddleware
+import app.services.notifications
+import app.services.job_sweeper
+import app.services.purge
+import app.services.changes
+from contextlib import asynccontextmanager
+import asyncio
 import logging
 import os
 
@@ -16,13 +27,30 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 
-Base.metadata.create_all(bind=engine)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    settings.UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+    settings.ATTACHMENT_DIR.mkdir(parents=True, exist_ok=True)
+    lifecycle.configure_threadpool(settings.THREADPOOL_SIZE)
+    lifecycle.run_warmups()
+    database.replicas.start()
+    tasks.pool.start()
+    hub.start(asyncio.get_running_loop())
+    broker.start()
+    yield
+    lifecycle.draining.set()
+    broker.stop()
+    tasks.pool.stop()
+    database.replicas.stop()
+
 
 app = FastAPI(
     title="Campus Jobs API",
     version="1.0.0",
     description="API для поиска временной работы и стажировок в кампусе",
-    redirect_slashes=False
+    redirect_slashes=False,
+    lifespan=lifespan
 )
 
 @app.middleware("http")
@@ -47,7 +75,7 @@ async def log_requests(request: Request, call_next):
     log_message += f"{'='*60}\n\n"
     
     try:
-        with open(debug_log_path, "a", encoding="utf-8") as f:
+        with tracing.span("debug.log write", "file"), open(debug_log_path, "a", encoding="utf-8") as f:
             f.write(log_message)
             f.flush()
             os.fsync(f.fileno())
@@ -64,7 +92,7 @@ async def log_requests(request: Request, call_next):
         
         response_msg = f"ОТВЕТ: {response.status_code}\n"
         try:
-            with open(debug_log_path, "a", encoding="utf-8") as f:
+            with tracing.span("debug.log write", "file"), open(debug_log_path, "a", encoding="utf-8") as f:
                 f.write(response_msg)
                 f.flush()
                 os.fsync(f.fileno())
@@ -87,6 +115,22 @@ async def log_requests(request: Request, call_next):
         sys.stderr.flush()
         raise
 
+if settings.CONCURRENCY_LIMIT_ENABLED:
+    budgets = {
+        "auth": Budget(settings.CONCURRENCY_AUTH_LIMIT, settings.CONCURRENCY_AUTH_QUEUE),
+        "uploads": Budget(settings.CONCURRENCY_UPLOADS_LIMIT, settings.CONCURRENCY_UPLOADS_QUEUE),
+        "reads": Budget(settings.CONCURRENCY_READS_LIMIT, settings.CONCURRENCY_READS_QUEUE),
+        "writes": Budget(settings.CONCURRENCY_WRITES_LIMIT, settings.CONCURRENCY_WRITES_QUEUE),
+    }
+    check_threadpool(budgets.values(), settings.THREADPOOL_SIZE)
+    # Добавлен раньше CORS, чтобы ответ 503 тоже получил CORS-заголовки
+    app.add_middleware(
+        ConcurrencyLimitMiddleware,
+        budgets=budgets,
+        max_wait=settings.CONCURRENCY_MAX_WAIT,
+        retry_after=settings.CONCURRENCY_RETRY_AFTER,
+    )
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000", "http://localhost:5173"],
@@ -95,6 +139,35 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    content_types=settings.COMPRESSION_CONTENT_TYPES,
+    levels={
+        "gzip": settings.COMPRESSION_GZIP_LEVEL,
+        "br": settings.COMPRESSION_BROTLI_LEVEL,
+        "zstd": settings.COMPRESSION_ZSTD_LEVEL,
+    },
+    cache_bytes=settings.COMPRESSION_CACHE_BYTES,
+)
+
+if settings.TRACING_ENABLED:
+    tracing.instrument_sql()
+    # Спаны на каждый middleware выше; сам корневой спан снаружи их всех
+    tracing.instrument_middleware(app)
+    app.add_middleware(
+        tracing.TracingMiddleware,
+        sample_rate=settings.TRACING_SAMPLE_RATE,
+        response_header=settings.TRACING_RESPONSE_HEADER,
+    )
+
+# Последним, то есть снаружи всех: пробам не нужны журнал, CORS, сжатие и трассы
+app.add_middleware(
+    HealthCheckMiddleware,
+    db_check_interval=settings.HEALTH_DB_CHECK_INTERVAL,
+    db_timeout=settings.HEALTH_DB_TIMEOUT,
+)
+
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     errors = []
@@ -135,9 +208,18 @@ app.include_router(jobs.router)
 app.include_router(applications.router)
 app.include_router(reviews.router)
 app.include_router(employer_reviews.router)
+app.include_router(events.router)
+app.include_router(exports.router)
+app.include_router(changes.router)
+app.include_router(favorites.router)
+app.include_router(interviews.router)
+app.include_router(attachments.router)
 
-if settings.UPLOAD_DIR.exists():
-    app.mount("/applications/resume", StaticFiles(directory=str(settings.UPLOAD_DIR)), name="resumes")
+app.mount(
+    "/applications/resume",
+    StaticFiles(directory=str(settings.UPLOAD_DIR), check_dir=False),
+    name="resumes",
+)
 
 @app.get("/")
 def root():
@@ -166,3 +248,6 @@ def test_auth(request: Request):
         "method": request.method,
         "authorization": auth_header
     }
+
+if settings.TRACING_ENABLED:
+    tracing.instrument_routes(app)
@@ -5,3 +5,8 @@ from .job import Job
 from .application import Application
 from .review import Review
 from .employer_review import EmployerReview
+from .change import Change
+from .favorite import Favorite
+from .interview import Interview
+from .attachment import Attachment, AttachmentUpload
+from .resume import ResumeText, ResumeTerm
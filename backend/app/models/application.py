@@ -1,8 +1,8 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, TIMESTAMP
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, TIMESTAMP, Index, UniqueConstraint
 from sqlalchemy.sql import func
-from app.database import Base
+from app.database import Base, SoftDeleteMixin
 
-class Application(Base):
+class Application(SoftDeleteMixin, Base):
     __tablename__ = "applications"
 
     id = Column(Integer, primary_key=True, index=True)
@@ -11,9 +11,17 @@ class Application(Base):
     status = Column(String(30), default="submitted")
     cover_letter = Column(Text)
     resume_url = Column(Text)
+    # sha256 файла резюме после индексации; пустая строка — файла нет
+    resume_hash = Column(String(64), nullable=True)
     submitted_at = Column(TIMESTAMP, server_default=func.current_timestamp())
     updated_at = Column(
         TIMESTAMP,
         server_default=func.current_timestamp(),
         onupdate=func.current_timestamp()
     )
+
+    __table_args__ = (
+        Index("idx_applications_job_status", "job_id", "status"),
+        Index("idx_applications_resume_hash", "resume_hash"),
+        UniqueConstraint("job_id", "user_id", name="uq_applications_job_user"),
+    )
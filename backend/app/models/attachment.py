@@ -0,0 +1,42 @@
+from sqlalchemy import BigInteger, Column, Integer, String, Text, ForeignKey, TIMESTAMP, DateTime, Index
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class Attachment(Base):
+    __tablename__ = "attachments"
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"))
+    file_url = Column(Text, nullable=False)
+    description = Column(Text)
+    file_name = Column(String(255))
+    size = Column(BigInteger)
+    content_type = Column(String(100))
+    created_at = Column(TIMESTAMP, server_default=func.current_timestamp())
+
+
+class AttachmentUpload(Base):
+    """Незавершенная загрузка вложения: состояние живет в БД, данные — в файле.
+
+    received — сколько байт от начала файла уже записано; любой процесс
+    может продолжить загрузку с этого места.
+    """
+
+    __tablename__ = "attachment_uploads"
+
+    id = Column(String(36), primary_key=True)
+    job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), nullable=False)
+    employer_id = Column(Integer, ForeignKey("employers.id", ondelete="CASCADE"), nullable=False)
+    file_name = Column(String(255), nullable=False)
+    content_type = Column(String(100))
+    description = Column(Text)
+    size = Column(BigInteger, nullable=False)
+    received = Column(BigInteger, nullable=False, default=0, server_default="0")
+    created_at = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("idx_attachment_uploads_updated", "updated_at"),
+    )
@@ -0,0 +1,18 @@
+from sqlalchemy import BigInteger, Column, Integer, String, TIMESTAMP, Index
+from app.database import Base
+
+
+class Change(Base):
+    """Запись журнала изменений; id служит курсором ленты /changes."""
+
+    __tablename__ = "changes"
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    entity = Column(String(30), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    op = Column(String(10), nullable=False)
+    changed_at = Column(TIMESTAMP, nullable=False)
+
+    __table_args__ = (
+        Index("idx_changes_entity", "entity", "entity_id", "id"),
+    )
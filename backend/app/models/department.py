@@ -1,8 +1,8 @@
 from sqlalchemy import Column, Integer, String
 from sqlalchemy.orm import relationship
-from app.database import Base
+from app.database import Base, SoftDeleteMixin
 
-class Department(Base):
+class Department(SoftDeleteMixin, Base):
     __tablename__ = "departments"
 
     id = Column(Integer, primary_key=True, index=True)
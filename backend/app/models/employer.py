@@ -1,8 +1,8 @@
 from sqlalchemy import Column, Integer, String, Text, ForeignKey
 from sqlalchemy.orm import relationship
-from app.database import Base
+from app.database import Base, SoftDeleteMixin
 
-class Employer(Base):
+class Employer(SoftDeleteMixin, Base):
     __tablename__ = "employers"
 
     id = Column(Integer, primary_key=True, index=True)
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, ForeignKey, TIMESTAMP, UniqueConstraint
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class Favorite(Base):
+    __tablename__ = "favorites"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), nullable=False)
+    created_at = Column(TIMESTAMP, server_default=func.current_timestamp())
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "job_id", name="uq_favorites_user_job"),
+    )
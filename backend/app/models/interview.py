@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Index
+
+from app.database import Base
+
+
+class Interview(Base):
+    __tablename__ = "interviews"
+
+    id = Column(Integer, primary_key=True, index=True)
+    application_id = Column(Integer, ForeignKey("applications.id", ondelete="CASCADE"), nullable=False)
+    # employer_id и user_id повторяют данные заявки, чтобы проверка
+    # пересечений шла по индексу без JOIN
+    employer_id = Column(Integer, ForeignKey("employers.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    scheduled_at = Column(DateTime, nullable=False)
+    duration_minutes = Column(Integer, nullable=False, default=30, server_default="30")
+    location = Column(Text)
+    mode = Column(String(30))
+    notes = Column(Text)
+
+    __table_args__ = (
+        Index("idx_interviews_employer_time", "employer_id", "scheduled_at"),
+        Index("idx_interviews_user_time", "user_id", "scheduled_at"),
+    )
@@ -1,7 +1,7 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, Date, Boolean
-from app.database import Base
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Date, Boolean, Index
+from app.database import Base, SoftDeleteMixin
 
-class Job(Base):
+class Job(SoftDeleteMixin, Base):
     __tablename__ = "jobs"
 
     id = Column(Integer, primary_key=True, index=True)
@@ -15,3 +15,10 @@ class Job(Base):
     end_date = Column(Date)
     spots = Column(Integer)
     status = Column(String(30), default="open")
+    accepted_count = Column(Integer, nullable=False, default=0, server_default="0")
+    version = Column(Integer, nullable=False, default=0, server_default="0")
+
+    __table_args__ = (
+        Index("idx_jobs_status_end_date", "status", "end_date"),
+    )
+    __mapper_args__ = {"version_id_col": version}
@@ -0,0 +1,34 @@
+from sqlalchemy import BigInteger, Column, Integer, String, Text, DateTime, Index
+from sqlalchemy.dialects.mysql import MEDIUMTEXT
+
+from app.database import Base
+
+
+class ResumeText(Base):
+    """Текст, извлеченный из файла резюме; один на содержимое файла (sha256)."""
+
+    __tablename__ = "resume_texts"
+
+    file_hash = Column(String(64), primary_key=True)
+    status = Column(String(20), nullable=False)
+    text = Column(Text().with_variant(MEDIUMTEXT(), "mysql"))
+    error = Column(Text)
+    size = Column(BigInteger)
+    extracted_at = Column(DateTime, nullable=False)
+
+
+class ResumeTerm(Base):
+    """Инвертированный индекс резюме по работодателям: термин -> заявка."""
+
+    __tablename__ = "resume_terms"
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    employer_id = Column(Integer, nullable=False)
+    application_id = Column(Integer, nullable=False)
+    term = Column(String(64), nullable=False)
+    tf = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        Index("idx_resume_terms_employer_term", "employer_id", "term", "application_id"),
+        Index("idx_resume_terms_application", "application_id"),
+    )
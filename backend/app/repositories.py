@@ -0,0 +1,47 @@
+"""Самые частые выборки по ключу в виде закэшированных lambda-выражений.
+
+Пользователь по id, работодатель по user_id, вакансия и заявка по id
+выполняются почти в каждом запросе. Обычный db.query(...).filter(...)
+каждый раз заново строит выражение и считает его ключ для кэша
+компиляции; lambda_stmt делает это один раз на место вызова, а при
+следующих вызовах только подставляет параметр.
+
+Условие мягкого удаления записано в выражении явно: _hide_soft_deleted
+lambda-выражения не трогает (его .options() превратил бы выражение в
+обычный select с параметрами первого вызова).
+"""
+from typing import Optional
+
+from sqlalchemy import lambda_stmt, select
+from sqlalchemy.orm import Session
+
+from app.models.application import Application as ApplicationModel
+from app.models.employer import Employer as EmployerModel
+from app.models.job import Job as JobModel
+from app.models.user import User
+
+
+def user_by_id(db: Session, user_id: int) -> Optional[User]:
+    stmt = lambda_stmt(lambda: select(User).where(User.id == user_id).limit(1))
+    return db.execute(stmt).scalars().first()
+
+
+def employer_by_user_id(db: Session, user_id: int) -> Optional[EmployerModel]:
+    stmt = lambda_stmt(lambda: select(EmployerModel).where(
+        EmployerModel.user_id == user_id, EmployerModel.deleted_at.is_(None)
+    ).limit(1))
+    return db.execute(stmt).scalars().first()
+
+
+def job_by_id(db: Session, job_id: int) -> Optional[JobModel]:
+    stmt = lambda_stmt(lambda: select(JobModel).where(
+        JobModel.id == job_id, JobModel.deleted_at.is_(None)
+    ).limit(1))
+    return db.execute(stmt).scalars().first()
+
+
+def application_by_id(db: Session, application_id: int) -> Optional[ApplicationModel]:
+    stmt = lambda_stmt(lambda: select(ApplicationModel).where(
+        ApplicationModel.id == application_id, ApplicationModel.deleted_at.is_(None)
+    ).limit(1))
+    return db.execute(stmt).scalars().first()
@@ -1,34 +1,35 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, status, UploadFile, File, Body
 from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy import update, or_
+from sqlalchemy.exc import IntegrityError
+from typing import List, Optional, Union
 import sys
 import os
 import uuid
 from pathlib import Path
 
-from app.database import SessionLocal
+from app import repositories
 from app.models.application import Application as ApplicationModel
 from app.models.job import Job as JobModel
 from app.models.user import User
-from app.models.employer import Employer as EmployerModel
-from app.schemas.application_schema import Application, ApplicationCreate
-from app.core.dependencies import get_current_user, get_current_student, get_current_employer
+from app.schemas.application_schema import Application, ApplicationCreate, RankedApplication, ScoredApplication, APPLICATION_LISTING_FIELDS
+from app.core.dependencies import get_db, get_read_db, get_current_user, get_current_student, get_current_employer
 from app.core.config import settings
+from app.core.tasks import enqueue
+from app.core import events, tracing
+from app.core.serialization import FastJSONResponse, fast_list, fetch_rows, parse_fields, schema_fields, select_columns
+from app.services import changes, entity_cache, purge, ranking, resume_index
 
 router = APIRouter(prefix="/applications", tags=["Applications"])
 
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+STATUS_UPDATE_RETRIES = 3
 
 
 @router.get("/", response_model=List[Application])
 def read_applications(
+    fast: bool = Query(False, description="Быстрая сериализация больших списков без загрузки ORM-объектов"),
+    fields: Optional[str] = Query(None, description='Поля через запятую или набор "listing" для компактного списка'),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -38,17 +39,21 @@ def read_applications(
     print(f"{'='*60}\n", flush=True)
     sys.stdout.flush()
     
-    query = db.query(ApplicationModel)
+    projection = parse_fields(fields, Application, {"listing": APPLICATION_LISTING_FIELDS})
+    filters = []
     
     if current_user.role == "student":
-        query = query.filter(ApplicationModel.user_id == current_user.id)
+        filters.append(ApplicationModel.user_id == current_user.id)
     
-    return query.all()
+    if fast or projection:
+        return fast_list(db, ApplicationModel, Application, *filters, fields=projection)
+    
+    return db.query(ApplicationModel).filter(*filters).all()
 
 
 @router.get("/{app_id}", response_model=Application)
-def read_application(app_id: int, db: Session = Depends(get_db)):
-    app = db.query(ApplicationModel).filter(ApplicationModel.id == app_id).first()
+def read_application(app_id: int, db: Session = Depends(get_read_db)):
+    app = repositories.application_by_id(db, app_id)
     if not app:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -61,13 +66,17 @@ def read_application(app_id: int, db: Session = Depends(get_db)):
     return app
 
 
-@router.get("/by-job/{job_id}", response_model=List[Application])
+@router.get("/by-job/{job_id}", response_model=List[Union[ScoredApplication, Application]])
 def read_applications_by_job(
     job_id: int,
+    fast: bool = Query(False, description="Быстрая сериализация больших списков без загрузки ORM-объектов"),
+    fields: Optional[str] = Query(None, description='Поля через запятую или набор "listing" для компактного списка'),
+    rank: bool = Query(False, description="Отсортировать по соответствию заявки тексту вакансии (BM25), с полем score"),
     current_user: User = Depends(get_current_employer),
     db: Session = Depends(get_db),
 ):
-    job = db.query(JobModel).filter(JobModel.id == job_id).first()
+    projection = parse_fields(fields, Application, {"listing": APPLICATION_LISTING_FIELDS})
+    job = entity_cache.get_job(db, job_id)
     if not job:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -78,23 +87,80 @@ def read_applications_by_job(
             },
         )
 
-    employer = db.query(EmployerModel).filter(EmployerModel.user_id == current_user.id).first()
+    employer = entity_cache.employer_for_user(db, current_user.id)
     if not employer or job.employer_id != employer.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Доступ к заявкам по этой вакансии запрещен",
         )
 
+    if rank:
+        scores = ranking.rank_applications(db, job)
+        rows = fetch_rows(db, select_columns(ApplicationModel, projection or schema_fields(Application)).where(
+            ApplicationModel.job_id == job_id
+        ))
+        for row in rows:
+            row["score"] = scores.get(row["id"], 0.0)
+        rows.sort(key=lambda row: (-row["score"], row["id"]))
+        if projection:
+            return FastJSONResponse(rows)
+        return rows
+
+    if fast or projection:
+        return fast_list(db, ApplicationModel, Application, ApplicationModel.job_id == job_id, fields=projection)
+
     return db.query(ApplicationModel).filter(ApplicationModel.job_id == job_id).all()
 
 
+@router.get("/by-job/{job_id}/search", response_model=List[RankedApplication])
+def search_applications_by_job(
+    job_id: int,
+    q: str = Query(..., min_length=2, description="Навыки и ключевые слова для поиска по резюме"),
+    limit: int = Query(20, ge=1, le=200),
+    current_user: User = Depends(get_current_employer),
+    db: Session = Depends(get_read_db),
+):
+    """Заявки вакансии по убыванию совпадения резюме с запросом.
+
+    Ищутся только уже проиндексированные резюме; индексация идет в фоне.
+    """
+    job = entity_cache.get_job(db, job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "error": "Вакансия не найдена",
+                "detail": f"Вакансия с ID {job_id} не существует",
+                "help": "Проверьте правильность указанного ID вакансии",
+            },
+        )
+
+    employer = entity_cache.employer_for_user(db, current_user.id)
+    if not employer or job.employer_id != employer.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Доступ к заявкам по этой вакансии запрещен",
+        )
+
+    ranked = resume_index.search_applicants(db, employer.id, job_id, q, limit)
+    applications = {
+        app.id: app for app in db.query(ApplicationModel).filter(
+            ApplicationModel.id.in_([item["application_id"] for item in ranked])
+        )
+    }
+    return [
+        {**Application.model_validate(applications[item["application_id"]]).model_dump(), **item}
+        for item in ranked if item["application_id"] in applications
+    ]
+
+
 @router.post("/", response_model=Application, status_code=status.HTTP_201_CREATED)
 def create_application(
     application: ApplicationCreate,
     current_user: User = Depends(get_current_student),
     db: Session = Depends(get_db)
 ):
-    job = db.query(JobModel).filter(JobModel.id == application.job_id).first()
+    job = entity_cache.get_job(db, application.job_id)
     if not job:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -131,13 +197,23 @@ def create_application(
         )
     
     try:
+        purge.release_deleted_application(db, application.job_id, current_user.id)
         app_data = application.dict()
         app_data["user_id"] = current_user.id
         db_app = ApplicationModel(**app_data)
         db.add(db_app)
         db.commit()
         db.refresh(db_app)
-        return db_app
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "error": "Заявка уже подана",
+                "detail": "Вы уже подали заявку на эту вакансию",
+                "help": "Проверьте свои заявки в личном кабинете"
+            }
+        )
     except Exception as e:
         db.rollback()
         raise HTTPException(
@@ -149,6 +225,19 @@ def create_application(
             }
         )
 
+    employer = entity_cache.get_employer(db, job.employer_id)
+    if employer:
+        events.publish(employer.user_id, {
+            "type": "application.created",
+            "application_id": db_app.id,
+            "job_id": db_app.job_id,
+            "user_id": db_app.user_id,
+            "status": db_app.status,
+        })
+    if db_app.resume_url:
+        resume_index.schedule_index()
+    return db_app
+
 
 @router.post("/upload-resume", status_code=status.HTTP_201_CREATED)
 async def upload_resume(
@@ -184,7 +273,7 @@ async def upload_resume(
     file_path = settings.UPLOAD_DIR / file_name
     
     try:
-        with open(file_path, "wb") as f:
+        with tracing.span("resume write", "file", size=file_size), open(file_path, "wb") as f:
             f.write(content)
         
         file_url = f"/applications/resume/{file_name}"
@@ -238,12 +327,12 @@ async def get_resume(file_name: str, current_user: User = Depends(get_current_us
 @router.patch("/{app_id}/status", response_model=Application)
 def update_application_status(
     app_id: int,
-    status: str = Body(embed=True),
+    new_status: str = Body(embed=True, alias="status"),
     current_user: User = Depends(get_current_employer),
     db: Session = Depends(get_db),
 ):
     allowed_statuses = {"submitted", "reviewed", "accepted", "rejected"}
-    if status not in allowed_statuses:
+    if new_status not in allowed_statuses:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail={
@@ -252,42 +341,113 @@ def update_application_status(
             },
         )
 
-    app = db.query(ApplicationModel).filter(ApplicationModel.id == app_id).first()
-    if not app:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail={
-                "error": "Заявка не найдена",
-                "detail": f"Заявка с ID {app_id} не существует",
-            },
+    employer = entity_cache.employer_for_user(db, current_user.id)
+
+    # Статус меняется условным UPDATE по старому значению, а места считаются
+    # атомарным счетчиком в jobs, поэтому принятых заявок не станет больше spots
+    # даже при одновременных запросах. При гонке попытка повторяется.
+    for _ in range(STATUS_UPDATE_RETRIES):
+        app = repositories.application_by_id(db, app_id)
+        if not app:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail={
+                    "error": "Заявка не найдена",
+                    "detail": f"Заявка с ID {app_id} не существует",
+                },
+            )
+
+        job = entity_cache.get_job(db, app.job_id)
+        if not job:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail={
+                    "error": "Вакансия не найдена",
+                    "detail": f"Вакансия с ID {app.job_id} не существует",
+                },
+            )
+
+        if not employer or job.employer_id != employer.id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Доступ к этой заявке запрещен",
+            )
+
+        old_status = app.status
+        if old_status == new_status:
+            return app
+
+        result = db.execute(
+            update(ApplicationModel)
+            .where(ApplicationModel.id == app_id, ApplicationModel.status == old_status)
+            .values(status=new_status)
         )
+        if result.rowcount == 0:
+            db.rollback()
+            continue
 
-    job = db.query(JobModel).filter(JobModel.id == app.job_id).first()
-    if not job:
+        delta = (new_status == "accepted") - (old_status == "accepted")
+        if delta > 0:
+            result = db.execute(
+                update(JobModel)
+                .where(
+                    JobModel.id == job.id,
+                    or_(JobModel.spots.is_(None), JobModel.accepted_count < JobModel.spots),
+                )
+                .values(accepted_count=JobModel.accepted_count + 1, version=JobModel.version + 1)
+            )
+            if result.rowcount == 0:
+                db.rollback()
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail={
+                        "error": "Нет свободных мест",
+                        "detail": f"На вакансию уже принято {job.spots} кандидатов",
+                        "help": "Отклоните одну из принятых заявок или увеличьте число мест",
+                    },
+                )
+        elif delta < 0:
+            db.execute(
+                update(JobModel)
+                .where(JobModel.id == job.id, JobModel.accepted_count > 0)
+                .values(accepted_count=JobModel.accepted_count - 1, version=JobModel.version + 1)
+            )
+
+        changes.record(db, "applications", [app_id])
+        if delta:
+            changes.record(db, "jobs", [job.id])
+        db.commit()
+        break
+    else:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
+            status_code=status.HTTP_409_CONFLICT,
             detail={
-                "error": "Вакансия не найдена",
-                "detail": f"Вакансия с ID {app.job_id} не существует",
+                "error": "Конфликт обновления",
+                "detail": "Статус заявки одновременно изменяется другим запросом",
+                "help": "Обновите страницу и повторите действие",
             },
         )
 
-    employer = db.query(EmployerModel).filter(EmployerModel.user_id == current_user.id).first()
-    if not employer or job.employer_id != employer.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Доступ к этой заявке запрещен",
-        )
-
-    app.status = status
-    db.commit()
     db.refresh(app)
+    enqueue(
+        "notifications.application_status_changed",
+        {"application_id": app.id, "user_id": app.user_id, "job_id": app.job_id, "status": app.status},
+        # Свой ключ на каждый переход: updated_at хранится с точностью до
+        # секунды, и смена A→B→A за секунду склеила бы два уведомления
+        key=f"application-status:{app.id}:{uuid.uuid4().hex}",
+    )
+    events.publish(app.user_id, {
+        "type": "application.status_changed",
+        "application_id": app.id,
+        "job_id": app.job_id,
+        "status": app.status,
+    })
     return app
 
 
 @router.delete("/{app_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_application(app_id: int, db: Session = Depends(get_db)):
-    app = db.query(ApplicationModel).filter(ApplicationModel.id == app_id).first()
+    app = repositories.application_by_id(db, app_id)
     if not app:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -297,6 +457,7 @@ def delete_application(app_id: int, db: Session = Depends(get_db)):
             },
         )
 
-    db.delete(app)
+    purge.soft_delete(db, app)
     db.commit()
+    purge.schedule_purge("applications", app_id)
     return
@@ -0,0 +1,298 @@
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import FileResponse, JSONResponse
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import ClientDisconnect
+
+from app.models.attachment import Attachment as AttachmentModel, AttachmentUpload
+from app.models.user import User
+from app.schemas.attachment_schema import Attachment, UploadCreate, UploadStatus
+from app.core.config import settings
+from app.core.dependencies import get_db, get_read_db, get_current_user, get_current_employer
+from app.services import attachments, entity_cache
+
+router = APIRouter(prefix="/attachments", tags=["Attachments"])
+
+
+def get_employer_profile(db: Session, current_user: User) -> entity_cache.Snapshot:
+    employer = entity_cache.employer_for_user(db, current_user.id)
+    if not employer:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "error": "Профиль работодателя не найден",
+                "detail": "Не удалось найти профиль работодателя для текущего пользователя",
+                "help": "Обратитесь к администратору для создания профиля работодателя",
+            },
+        )
+    return employer
+
+
+def get_own_upload(db: Session, upload_id: str, current_user: User) -> AttachmentUpload:
+    employer = get_employer_profile(db, current_user)
+    upload = db.query(AttachmentUpload).filter(AttachmentUpload.id == upload_id).first()
+    if not upload or upload.employer_id != employer.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "error": "Загрузка не найдена",
+                "detail": f"Загрузка {upload_id} не существует, завершена или устарела",
+                "help": "Начните загрузку заново",
+            },
+        )
+    return upload
+
+
+def upload_status(upload: AttachmentUpload) -> dict:
+    return {
+        "upload_id": upload.id,
+        "job_id": upload.job_id,
+        "file_name": upload.file_name,
+        "size": upload.size,
+        "offset": upload.received,
+        "upload_url": f"/attachments/uploads/{upload.id}",
+        "chunk_max": settings.ATTACHMENT_CHUNK_MAX,
+    }
+
+
+def offset_response(upload: AttachmentUpload, status_code: int = status.HTTP_200_OK, **extra) -> JSONResponse:
+    return JSONResponse(
+        status_code=status_code,
+        content={**upload_status(upload), **extra},
+        headers={"Upload-Offset": str(upload.received)},
+    )
+
+
+@router.get("/", response_model=List[Attachment])
+def read_job_attachments(job_id: int = Query(...), db: Session = Depends(get_read_db)):
+    return db.query(AttachmentModel).filter(AttachmentModel.job_id == job_id).order_by(AttachmentModel.id).all()
+
+
+@router.post("/uploads", response_model=UploadStatus, status_code=status.HTTP_201_CREATED)
+def create_upload(
+    data: UploadCreate,
+    current_user: User = Depends(get_current_employer),
+    db: Session = Depends(get_db),
+):
+    """Начинает загрузку вложения: место под файл выделяется сразу целиком."""
+    employer = get_employer_profile(db, current_user)
+    job = entity_cache.get_job(db, data.job_id)
+    if not job or job.employer_id != employer.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "error": "Вакансия не найдена",
+                "detail": f"Вакансия с ID {data.job_id} не существует или принадлежит другому работодателю",
+                "help": "Проверьте правильность указанного ID вакансии",
+            },
+        )
+    file_ext = Path(data.file_name).suffix.lower()
+    if file_ext not in settings.ATTACHMENT_ALLOWED_EXTENSIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "error": "Неподдерживаемый формат файла",
+                "detail": f"Разрешенные форматы: {', '.join(settings.ATTACHMENT_ALLOWED_EXTENSIONS)}",
+                "help": "Загрузите документ, презентацию, таблицу, архив или изображение",
+            },
+        )
+    if data.size > settings.ATTACHMENT_MAX_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail={
+                "error": "Файл слишком большой",
+                "detail": f"Максимальный размер вложения: {settings.ATTACHMENT_MAX_SIZE / 1024 / 1024:.0f} MB",
+                "help": "Разбейте материалы на несколько вложений",
+            },
+        )
+
+    upload_id = str(uuid.uuid4())
+    try:
+        attachments.preallocate(attachments.partial_path(upload_id), data.size)
+    except OSError as e:
+        attachments.remove_files([attachments.partial_path(upload_id)])
+        raise HTTPException(
+            status_code=status.HTTP_507_INSUFFICIENT_STORAGE,
+            detail={
+                "error": "Недостаточно места для файла",
+                "detail": str(e),
+                "help": "Попробуйте повторить загрузку позже",
+            },
+        )
+    now = datetime.now()
+    upload = AttachmentUpload(
+        id=upload_id,
+        job_id=job.id,
+        employer_id=employer.id,
+        file_name=Path(data.file_name).name,
+        content_type=data.content_type,
+        description=data.description,
+        size=data.size,
+        received=0,
+        created_at=now,
+        updated_at=now,
+    )
+    db.add(upload)
+    db.commit()
+    return offset_response(upload, status.HTTP_201_CREATED)
+
+
+@router.get("/uploads/{upload_id}", response_model=UploadStatus)
+def read_upload(
+    upload_id: str,
+    current_user: User = Depends(get_current_employer),
+    db: Session = Depends(get_db),
+):
+    """Сколько байт уже принято: с этого смещения продолжается загрузка."""
+    return offset_response(get_own_upload(db, upload_id, current_user))
+
+
+@router.put("/uploads/{upload_id}", response_model=UploadStatus)
+async def upload_chunk(
+    upload_id: str,
+    request: Request,
+    offset: int = Query(..., ge=0, description="Смещение куска от начала файла"),
+    current_user: User = Depends(get_current_employer),
+    db: Session = Depends(get_db),
+):
+    """Принимает кусок тела запроса и пишет его в файл с позиции offset.
+
+    Кусок можно прислать повторно; смещение больше принятого отклоняется с
+    409 и текущим смещением в Upload-Offset.
+    """
+    upload = await run_in_threadpool(get_own_upload, db, upload_id, current_user)
+    if offset > upload.received:
+        return offset_response(
+            upload,
+            status.HTTP_409_CONFLICT,
+            error="Неверное смещение",
+            detail=f"Принято {upload.received} байт, кусок со смещения {offset} оставил бы пропуск",
+            help="Продолжите загрузку со смещения offset",
+        )
+    path = attachments.partial_path(upload.id)
+    if not path.exists():
+        await run_in_threadpool(lambda: (db.delete(upload), db.commit()))
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail={
+                "error": "Файл загрузки потерян",
+                "detail": f"Данные загрузки {upload_id} не найдены на диске",
+                "help": "Начните загрузку заново",
+            },
+        )
+
+    writer = attachments.ChunkWriter(
+        path,
+        offset,
+        min(settings.ATTACHMENT_CHUNK_MAX, upload.size - offset),
+        settings.ATTACHMENT_WRITE_BUFFER,
+    )
+    try:
+        await writer.write(request.stream())
+    except attachments.ChunkTooLarge:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail={
+                "error": "Слишком большой кусок",
+                "detail": f"Кусок не может быть больше {settings.ATTACHMENT_CHUNK_MAX} байт "
+                          f"и выходить за размер файла {upload.size} байт",
+                "help": "Запросите текущее смещение и отправьте кусок меньшего размера",
+            },
+        )
+    except ClientDisconnect:
+        pass
+    finally:
+        # Даже при обрыве уже записанное засчитывается, чтобы клиент продолжил с него
+        if writer.written:
+            await run_in_threadpool(attachments.advance, db, upload.id, offset + writer.written)
+    await run_in_threadpool(db.refresh, upload)
+    return offset_response(upload)
+
+
+@router.post("/uploads/{upload_id}/complete", response_model=Attachment, status_code=status.HTTP_201_CREATED)
+def complete_upload(
+    upload_id: str,
+    current_user: User = Depends(get_current_employer),
+    db: Session = Depends(get_db),
+):
+    upload = get_own_upload(db, upload_id, current_user)
+    # Блокировка не дает двум запросам завершить одну загрузку дважды
+    db.refresh(upload, with_for_update=True)
+    if upload.received < upload.size:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={
+                "error": "Загрузка не завершена",
+                "detail": f"Принято {upload.received} из {upload.size} байт",
+                "help": "Дозагрузите файл с текущего смещения",
+            },
+        )
+    return attachments.finalize(db, upload)
+
+
+@router.delete("/uploads/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
+def cancel_upload(
+    upload_id: str,
+    current_user: User = Depends(get_current_employer),
+    db: Session = Depends(get_db),
+):
+    upload = get_own_upload(db, upload_id, current_user)
+    db.delete(upload)
+    db.commit()
+    attachments.remove_files([attachments.partial_path(upload_id)])
+    return
+
+
+@router.get("/file/{file_name}")
+def download_attachment(
+    file_name: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+):
+    file_url = f"{attachments.ATTACHMENT_URL_PREFIX}{file_name}"
+    attachment = db.query(AttachmentModel).filter(AttachmentModel.file_url == file_url).first()
+    path = attachments.stored_path(file_url)
+    if not attachment or not path.exists():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "error": "Файл не найден",
+                "detail": f"Файл {file_name} не существует",
+                "help": "Проверьте правильность URL файла",
+            },
+        )
+    return FileResponse(
+        path=path,
+        filename=attachment.file_name or file_name,
+        media_type=attachment.content_type or "application/octet-stream",
+    )
+
+
+@router.delete("/{attachment_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_attachment(
+    attachment_id: int,
+    current_user: User = Depends(get_current_employer),
+    db: Session = Depends(get_db),
+):
+    employer = get_employer_profile(db, current_user)
+    attachment = db.query(AttachmentModel).filter(AttachmentModel.id == attachment_id).first()
+    job = attachment and entity_cache.get_job(db, attachment.job_id)
+    if not attachment or not job or job.employer_id != employer.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "error": "Вложение не найдено",
+                "detail": f"Вложение с ID {attachment_id} не существует",
+                "help": "Проверьте правильность указанного ID вложения",
+            },
+        )
+    path = attachments.stored_path(attachment.file_url)
+    db.delete(attachment)
+    db.commit()
+    attachments.remove_files([path])
+    return
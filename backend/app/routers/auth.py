@@ -1,23 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from app.database import SessionLocal
 from app.models.user import User
 from app.models.employer import Employer
 from app.schemas.user_schema import UserCreate, UserLogin, User as UserSchema, Token
 from app.core.security import verify_password, get_password_hash, create_access_token
-from app.core.dependencies import get_current_user
+from app.core.dependencies import get_db, get_current_user
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 @router.post("/register", response_model=UserSchema, status_code=status.HTTP_201_CREATED)
 def register(user_data: UserCreate, db: Session = Depends(get_db)):
     existing_user = db.query(User).filter(User.email == user_data.email).first()
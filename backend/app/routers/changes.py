@@ -0,0 +1,58 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from app.models.user import User
+from app.schemas.change_schema import ChangeFeed
+from app.core.config import settings
+from app.core.dependencies import get_db, get_current_user
+from app.services.changes import ENTITIES, read_changes
+
+router = APIRouter(prefix="/changes", tags=["Changes"])
+
+
+# redirect_slashes выключен: без второй регистрации GET /changes?since=... отдавал бы 404
+@router.get("", response_model=ChangeFeed, include_in_schema=False)
+@router.get("/", response_model=ChangeFeed)
+def read_change_feed(
+    since: int = Query(0, ge=0, description="Курсор из next_cursor прошлого ответа, 0 — с начала журнала"),
+    limit: Optional[int] = Query(None, ge=1, description="Сколько записей журнала просмотреть за запрос"),
+    entity: Optional[str] = Query(None, description="Сущности через запятую: " + ", ".join(ENTITIES)),
+    current_user: User = Depends(get_current_user),
+    # Курсор не должен обгонять основную БД, поэтому журнал читается из нее, а не из реплики
+    db: Session = Depends(get_db),
+):
+    """Изменения вакансий, заявок, отзывов и отделов после курсора since.
+
+    Лента содержит только ссылки на строки и вид изменения; сами данные
+    клиент запрашивает обычными эндпоинтами с их проверкой доступа.
+    """
+    entities = None
+    if entity:
+        entities = [name.strip() for name in entity.split(",") if name.strip()]
+        unknown = [name for name in entities if name not in ENTITIES]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={
+                    "error": "Неизвестная сущность",
+                    "detail": f"Нет в журнале: {', '.join(unknown)}",
+                    "help": f"Допустимые значения: {', '.join(ENTITIES)}",
+                },
+            )
+    limit = min(limit or settings.CHANGE_FEED_PAGE_SIZE, settings.CHANGE_FEED_MAX_PAGE_SIZE)
+    rows, next_cursor, has_more = read_changes(db, since, limit, entities, settings.CHANGE_FEED_SETTLE_SECONDS)
+    return {
+        "changes": [
+            {
+                "cursor": row.id,
+                "entity": row.entity,
+                "entity_id": row.entity_id,
+                "op": row.op,
+                "changed_at": row.changed_at,
+            }
+            for row in rows
+        ],
+        "next_cursor": next_cursor,
+        "has_more": has_more,
+    }
@@ -2,26 +2,18 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional
 
-from app.database import SessionLocal
 from app.models.department import Department as DepartmentModel
 from app.models.employer import Employer
 from app.models.user import User
 from app.schemas.department_schema import Department, DepartmentCreate, DepartmentUpdate
-from app.core.dependencies import get_current_user
+from app.core.dependencies import get_db, get_read_db, get_current_user
+from app.services import entity_cache, purge
 
 router = APIRouter(prefix="/departments", tags=["Departments"])
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 @router.get("/", response_model=List[Department])
-def get_departments(db: Session = Depends(get_db)):
+def get_departments(db: Session = Depends(get_read_db)):
     return db.query(DepartmentModel).all()
 
 
@@ -40,9 +32,7 @@ def get_my_department(
             }
         )
     
-    employer = db.query(Employer).filter(
-        Employer.user_id == current_user.id
-    ).options(joinedload(Employer.department)).first()
+    employer = entity_cache.employer_for_user(db, current_user.id)
     
     if not employer:
         raise HTTPException(
@@ -54,7 +44,8 @@ def get_my_department(
             }
         )
     
-    if not employer.department:
+    department = entity_cache.get_department(db, employer.department_id)
+    if not department:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail={
@@ -64,7 +55,7 @@ def get_my_department(
             }
         )
     
-    return employer.department
+    return department
 
 
 @router.put("/my-department", response_model=Department)
@@ -113,7 +104,7 @@ def update_my_department(
 
 
 @router.get("/{department_id}", response_model=Department)
-def get_department(department_id: int, db: Session = Depends(get_db)):
+def get_department(department_id: int, db: Session = Depends(get_read_db)):
     department = db.query(DepartmentModel).filter(
         DepartmentModel.id == department_id
     ).first()
@@ -208,8 +199,9 @@ def delete_department(department_id: int, db: Session = Depends(get_db)):
             }
         )
 
-    db.delete(department)
+    purge.soft_delete(db, department)
     db.commit()
+    purge.schedule_purge("departments", department_id)
     return
 
 
@@ -2,29 +2,19 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
 
-from app.database import SessionLocal
 from app.models.employer_review import EmployerReview as EmployerReviewModel
 from app.models.application import Application as ApplicationModel
-from app.models.job import Job as JobModel
-from app.models.employer import Employer as EmployerModel
 from app.models.user import User
 from app.schemas.employer_review_schema import EmployerReview, EmployerReviewCreate
-from app.core.dependencies import get_current_employer
+from app.core.dependencies import get_db, get_read_db, get_current_employer
+from app.services import entity_cache
 
 
 router = APIRouter(prefix="/employer-reviews", tags=["EmployerReviews"])
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 @router.get("/application/{application_id}", response_model=EmployerReview | None)
-def read_employer_review_for_application(application_id: int, db: Session = Depends(get_db)):
+def read_employer_review_for_application(application_id: int, db: Session = Depends(get_read_db)):
     return (
         db.query(EmployerReviewModel)
         .filter(EmployerReviewModel.application_id == application_id)
@@ -63,7 +53,7 @@ def create_employer_review(
             },
         )
 
-    job = db.query(JobModel).filter(JobModel.id == application.job_id).first()
+    job = entity_cache.get_job(db, application.job_id)
     if not job:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -74,7 +64,7 @@ def create_employer_review(
             },
         )
 
-    employer = db.query(EmployerModel).filter(EmployerModel.user_id == current_user.id).first()
+    employer = entity_cache.employer_for_user(db, current_user.id)
     if not employer or job.employer_id != employer.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -1,29 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
-from app.database import SessionLocal
 from app.models.employer import Employer as EmployerModel
-from app.schemas.employer_schema import Employer, EmployerCreate
+from app.schemas.employer_schema import Employer, EmployerCreate, EMPLOYER_LISTING_FIELDS
+from app.core.serialization import fast_list, parse_fields
+from app.core.dependencies import get_db, get_read_db
+from app.services import purge
 
 router = APIRouter(prefix="/employers", tags=["Employers"])
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 @router.get("/", response_model=List[Employer])
-def get_employers(db: Session = Depends(get_db)):
+def get_employers(
+    db: Session = Depends(get_read_db),
+    fields: Optional[str] = Query(None, description='Поля через запятую или набор "listing" для компактного списка'),
+):
+    projection = parse_fields(fields, Employer, {"listing": EMPLOYER_LISTING_FIELDS})
+    if projection:
+        return fast_list(db, EmployerModel, Employer, fields=projection)
     return db.query(EmployerModel).all()
 
 
 @router.get("/{employer_id}", response_model=Employer)
-def get_employer(employer_id: int, db: Session = Depends(get_db)):
+def get_employer(employer_id: int, db: Session = Depends(get_read_db)):
     employer = db.query(EmployerModel).filter(EmployerModel.id == employer_id).first()
     if not employer:
         raise HTTPException(
@@ -80,6 +80,7 @@ def delete_employer(employer_id: int, db: Session = Depends(get_db)):
             }
         )
 
-    db.delete(employer)
+    purge.soft_delete(db, employer)
     db.commit()
+    purge.schedule_purge("employers", employer_id)
     return
@@ -0,0 +1,64 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from typing import Optional
+import asyncio
+import json
+
+from app.models.user import User
+from app.core import tracing
+from app.core.config import settings
+from app.core.dependencies import get_db, get_current_user
+from app.core.events import hub, TooManyConnections
+
+router = APIRouter(prefix="/events", tags=["Events"])
+
+
+@tracing.traced(kind="dependency")
+def get_stream_user(
+    request: Request,
+    token: Optional[str] = Query(None, description="Токен для EventSource, который не умеет передавать заголовки"),
+    db: Session = Depends(get_db),
+) -> User:
+    if token and not getattr(request.state, "token", None):
+        request.state.token = token
+    return get_current_user(request, db)
+
+
+@router.get("/stream")
+async def stream_events(request: Request, current_user: User = Depends(get_stream_user)):
+    try:
+        queue = hub.connect(current_user.id)
+    except TooManyConnections:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={
+                "error": "Слишком много подключений",
+                "detail": "Сервер достиг лимита подключений к потоку событий",
+                "help": "Повторите подключение позже"
+            },
+            headers={"Retry-After": "5"},
+        )
+    user_id = current_user.id
+
+    async def event_stream():
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=settings.EVENTS_HEARTBEAT_INTERVAL)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": ping\n\n"
+                    continue
+                data = json.dumps(event, ensure_ascii=False, default=str)
+                yield f"event: {event['type']}\ndata: {data}\n\n"
+        finally:
+            hub.disconnect(user_id, queue)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
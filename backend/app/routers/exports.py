@@ -0,0 +1,95 @@
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app import repositories
+from app.models.user import User
+from app.core.config import settings
+from app.core.dependencies import get_read_db, get_current_user
+from app.services.export import (
+    EXPORT_MEDIA_TYPES,
+    applications_export_query,
+    jobs_export_query,
+    stream_export,
+)
+
+router = APIRouter(prefix="/exports", tags=["Exports"])
+
+FORMAT_PATTERN = "^(csv|jsonl)$"
+
+
+def export_employer_scope(current_user: User, db: Session, employer_id: Optional[int]) -> Optional[int]:
+    """Администратор выгружает любые данные, работодатель — только свои."""
+    if current_user.role == "admin":
+        return employer_id
+    if current_user.role != "employer":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail={
+                "error": "Доступ запрещен",
+                "detail": "Выгрузка доступна администраторам и работодателям",
+                "help": "Войдите как работодатель или администратор",
+            },
+        )
+    employer = repositories.employer_by_user_id(db, current_user.id)
+    if not employer or (employer_id is not None and employer_id != employer.id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail={
+                "error": "Доступ запрещен",
+                "detail": "Работодатель может выгружать только свои данные",
+                "help": "Не указывайте employer_id или укажите ID своей компании",
+            },
+        )
+    return employer.id
+
+
+def export_response(stmt, name: str, fmt: str, gzip: bool) -> StreamingResponse:
+    filename = f"{name}-{date.today():%Y%m%d}.{fmt}" + (".gz" if gzip else "")
+    return StreamingResponse(
+        stream_export(
+            stmt,
+            fmt,
+            settings.EXPORT_CHUNK_SIZE,
+            settings.COMPRESSION_GZIP_LEVEL if gzip else None,
+        ),
+        media_type="application/gzip" if gzip else EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/applications")
+def export_applications(
+    fmt: str = Query("csv", alias="format", pattern=FORMAT_PATTERN, description="csv или jsonl"),
+    employer_id: Optional[int] = Query(None),
+    job_id: Optional[int] = Query(None),
+    status: Optional[str] = Query(None, description="Статус заявки"),
+    date_from: Optional[date] = Query(None, alias="from", description="Поданы не раньше этой даты"),
+    date_to: Optional[date] = Query(None, alias="to", description="Поданы не позже этой даты"),
+    gzip: bool = Query(False, description="Отдать файл .gz, сжатый на лету"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+):
+    employer_id = export_employer_scope(current_user, db, employer_id)
+    stmt = applications_export_query(employer_id, job_id, status, date_from, date_to)
+    return export_response(stmt, "applications", fmt, gzip)
+
+
+@router.get("/jobs")
+def export_jobs(
+    fmt: str = Query("csv", alias="format", pattern=FORMAT_PATTERN, description="csv или jsonl"),
+    employer_id: Optional[int] = Query(None),
+    job_id: Optional[int] = Query(None),
+    status: Optional[str] = Query(None, description="Статус вакансии"),
+    date_from: Optional[date] = Query(None, alias="from", description="Начинаются не раньше этой даты"),
+    date_to: Optional[date] = Query(None, alias="to", description="Начинаются не позже этой даты"),
+    gzip: bool = Query(False, description="Отдать файл .gz, сжатый на лету"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+):
+    employer_id = export_employer_scope(current_user, db, employer_id)
+    stmt = jobs_export_query(employer_id, job_id, status, date_from, date_to)
+    return export_response(stmt, "jobs", fmt, gzip)
@@ -0,0 +1,104 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import JSONResponse
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from app import repositories
+from app.models.favorite import Favorite as FavoriteModel
+from app.models.job import Job as JobModel
+from app.models.user import User
+from app.schemas.favorite_schema import Favorite, FavoriteCreate, FavoritePage
+from app.core.config import settings
+from app.core.dependencies import get_db, get_read_db, get_current_student
+from app.services import favorites
+
+router = APIRouter(prefix="/favorites", tags=["Favorites"])
+
+
+@router.get("/", response_model=FavoritePage)
+def read_favorites(
+    limit: Optional[int] = Query(None, ge=1, description="Размер страницы"),
+    cursor: Optional[int] = Query(None, description="next_cursor из прошлого ответа"),
+    current_user: User = Depends(get_current_student),
+    db: Session = Depends(get_read_db),
+):
+    """Избранные вакансии студента, сначала недавно добавленные."""
+    limit = min(limit or settings.FAVORITES_PAGE_SIZE, settings.FAVORITES_MAX_PAGE_SIZE)
+    stmt = (
+        select(FavoriteModel, JobModel)
+        .join(JobModel, JobModel.id == FavoriteModel.job_id)
+        .where(FavoriteModel.user_id == current_user.id)
+        .order_by(FavoriteModel.id.desc())
+        .limit(limit + 1)
+    )
+    if cursor is not None:
+        stmt = stmt.where(FavoriteModel.id < cursor)
+    rows = db.execute(stmt).all()
+    items = [
+        {"id": favorite.id, "job_id": favorite.job_id, "created_at": favorite.created_at, "job": job}
+        for favorite, job in rows[:limit]
+    ]
+    return {"items": items, "next_cursor": items[-1]["id"] if len(rows) > limit else None}
+
+
+@router.post("/", response_model=Favorite, status_code=status.HTTP_201_CREATED)
+def add_favorite(
+    favorite: FavoriteCreate,
+    current_user: User = Depends(get_current_student),
+    db: Session = Depends(get_db),
+):
+    job = repositories.job_by_id(db, favorite.job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "error": "Вакансия не найдена",
+                "detail": f"Вакансия с ID {favorite.job_id} не существует",
+                "help": "Проверьте правильность указанного ID вакансии",
+            },
+        )
+
+    db_favorite = FavoriteModel(user_id=current_user.id, job_id=favorite.job_id)
+    try:
+        db.add(db_favorite)
+        db.commit()
+    except IntegrityError:
+        # Повторное добавление не ошибка: вакансия уже в избранном
+        db.rollback()
+        existing = db.query(FavoriteModel).filter(
+            FavoriteModel.user_id == current_user.id,
+            FavoriteModel.job_id == favorite.job_id,
+        ).first()
+        return JSONResponse(
+            status_code=status.HTTP_200_OK,
+            content=Favorite.model_validate(existing).model_dump(mode="json"),
+        )
+    db.refresh(db_favorite)
+    favorites.invalidate(current_user.id)
+    return db_favorite
+
+
+@router.delete("/{job_id}", status_code=status.HTTP_204_NO_CONTENT)
+def remove_favorite(
+    job_id: int,
+    current_user: User = Depends(get_current_student),
+    db: Session = Depends(get_db),
+):
+    deleted = db.query(FavoriteModel).filter(
+        FavoriteModel.user_id == current_user.id,
+        FavoriteModel.job_id == job_id,
+    ).delete(synchronize_session=False)
+    db.commit()
+    if not deleted:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "error": "Вакансия не в избранном",
+                "detail": f"Вакансии с ID {job_id} нет в вашем избранном",
+                "help": "Проверьте список избранного",
+            },
+        )
+    favorites.invalidate(current_user.id)
+    return
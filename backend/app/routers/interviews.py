@@ -0,0 +1,297 @@
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app import repositories
+from app.models.application import Application as ApplicationModel
+from app.models.employer import Employer as EmployerModel
+from app.models.interview import Interview as InterviewModel
+from app.models.user import User
+from app.schemas.interview_schema import (
+    AutoScheduleRequest,
+    AutoScheduleResult,
+    Interview,
+    InterviewCreate,
+    InterviewUpdate,
+)
+from app.core.config import settings
+from app.core.dependencies import get_db, get_read_db, get_current_user, get_current_employer
+from app.core.tasks import enqueue
+from app.services import entity_cache, interviews
+
+router = APIRouter(prefix="/interviews", tags=["Interviews"])
+
+
+def get_employer_profile(db: Session, current_user: User) -> entity_cache.Snapshot:
+    employer = entity_cache.employer_for_user(db, current_user.id)
+    if not employer:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "error": "Профиль работодателя не найден",
+                "detail": "Не удалось найти профиль работодателя для текущего пользователя",
+                "help": "Обратитесь к администратору для создания профиля работодателя",
+            },
+        )
+    return employer
+
+
+def lock_employer_calendar(db: Session, employer_id: int):
+    """Начинает транзакцию записи в календарь работодателя с его блокировки.
+
+    Все записи в календарь работодателя идут друг за другом, поэтому все,
+    что проверяется перед вставкой (заявки без собеседований, пересечения),
+    нужно читать после этой блокировки. Транзакция с чтениями зависимостей
+    завершается: в REPEATABLE READ (MySQL по умолчанию) ее снимок взят еще
+    до блокировки и не увидел бы собеседований, закоммиченных, пока мы
+    ждали. Новая транзакция в MySQL идет в READ COMMITTED, чтобы каждое
+    чтение после блокировки видело свежие коммиты.
+    """
+    db.commit()
+    if db.get_bind().dialect.name in ("mysql", "mariadb"):
+        db.connection(execution_options={"isolation_level": "READ COMMITTED"})
+    db.execute(select(EmployerModel.id).where(EmployerModel.id == employer_id).with_for_update())
+
+
+def lock_student_calendars(db: Session, user_ids):
+    """Блокирует строки студентов по возрастанию id, после работодателя."""
+    db.execute(select(User.id).where(User.id.in_(sorted(set(user_ids)))).order_by(User.id).with_for_update())
+
+
+def conflict_error(conflicts) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail={
+            "error": "Время занято",
+            "detail": "Собеседование пересекается с уже назначенными: "
+                      + ", ".join(
+                          f"#{row.id} {row.scheduled_at:%Y-%m-%d %H:%M}–{interviews.interview_end(row):%H:%M}"
+                          for row in conflicts
+                      ),
+            "help": "Выберите другое время или воспользуйтесь автоматическим подбором слотов",
+        },
+    )
+
+
+def check_duration(duration_minutes: int):
+    if duration_minutes > settings.INTERVIEW_MAX_DURATION:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "error": "Слишком длинное собеседование",
+                "detail": f"Максимальная длительность: {settings.INTERVIEW_MAX_DURATION} минут",
+                "help": "Уменьшите длительность или разбейте собеседование на несколько",
+            },
+        )
+
+
+def get_own_interview(db: Session, interview_id: int, employer: entity_cache.Snapshot) -> InterviewModel:
+    interview = db.query(InterviewModel).filter(InterviewModel.id == interview_id).first()
+    if not interview or interview.employer_id != employer.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "error": "Собеседование не найдено",
+                "detail": f"Собеседование с ID {interview_id} не существует",
+                "help": "Проверьте правильность указанного ID собеседования",
+            },
+        )
+    return interview
+
+
+def notify_scheduled(interview: InterviewModel):
+    enqueue(
+        "notifications.interview_scheduled",
+        {"interview_id": interview.id, "user_id": interview.user_id},
+        key=f"interview-scheduled:{interview.id}:{interview.scheduled_at:%Y%m%d%H%M}",
+    )
+
+
+@router.get("/my", response_model=List[Interview])
+def read_my_interviews(
+    date_from: Optional[datetime] = Query(None, alias="from", description="Не раньше этого момента"),
+    date_to: Optional[datetime] = Query(None, alias="to", description="Раньше этого момента"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+):
+    """Собеседования работодателя или студента по возрастанию времени."""
+    if current_user.role == "employer":
+        owner = InterviewModel.employer_id == get_employer_profile(db, current_user).id
+    else:
+        owner = InterviewModel.user_id == current_user.id
+    query = db.query(InterviewModel).filter(owner)
+    if date_from:
+        query = query.filter(InterviewModel.scheduled_at >= date_from)
+    if date_to:
+        query = query.filter(InterviewModel.scheduled_at < date_to)
+    return query.order_by(InterviewModel.scheduled_at).all()
+
+
+@router.post("/", response_model=Interview, status_code=status.HTTP_201_CREATED)
+def create_interview(
+    data: InterviewCreate,
+    current_user: User = Depends(get_current_employer),
+    db: Session = Depends(get_db),
+):
+    employer = get_employer_profile(db, current_user)
+    duration = data.duration_minutes or settings.INTERVIEW_DEFAULT_DURATION
+    check_duration(duration)
+
+    lock_employer_calendar(db, employer.id)
+    application = repositories.application_by_id(db, data.application_id)
+    job = application and entity_cache.get_job(db, application.job_id)
+    if not application or not job or job.employer_id != employer.id:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "error": "Заявка не найдена",
+                "detail": f"Заявка с ID {data.application_id} не существует или относится к чужой вакансии",
+                "help": "Проверьте правильность указанного ID заявки",
+            },
+        )
+    lock_student_calendars(db, [application.user_id])
+    conflicts = interviews.find_conflicts(db, employer.id, application.user_id, data.scheduled_at, duration)
+    if conflicts:
+        db.rollback()
+        raise conflict_error(conflicts)
+
+    interview = InterviewModel(
+        application_id=application.id,
+        employer_id=employer.id,
+        user_id=application.user_id,
+        scheduled_at=data.scheduled_at,
+        duration_minutes=duration,
+        location=data.location,
+        mode=data.mode,
+        notes=data.notes,
+    )
+    db.add(interview)
+    db.commit()
+    db.refresh(interview)
+    notify_scheduled(interview)
+    return interview
+
+
+@router.post("/auto-schedule", response_model=AutoScheduleResult, status_code=status.HTTP_201_CREATED)
+def auto_schedule_interviews(
+    data: AutoScheduleRequest,
+    current_user: User = Depends(get_current_employer),
+    db: Session = Depends(get_db),
+):
+    """Назначает собеседования заявкам вакансии в свободные слоты окна.
+
+    Слоты идут подряд по duration_minutes в рабочие часы day_start–day_end.
+    Заявки, у которых уже есть собеседование, пропускаются.
+    """
+    employer = get_employer_profile(db, current_user)
+    job = entity_cache.get_job(db, data.job_id)
+    if not job or job.employer_id != employer.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "error": "Вакансия не найдена",
+                "detail": f"Вакансия с ID {data.job_id} не существует или принадлежит другому работодателю",
+                "help": "Проверьте правильность указанного ID вакансии",
+            },
+        )
+    duration = data.duration_minutes or settings.INTERVIEW_DEFAULT_DURATION
+    check_duration(duration)
+
+    # Заявки без собеседований читаются под блокировкой: параллельный
+    # подбор для той же вакансии ждет и уже видит назначенные здесь
+    lock_employer_calendar(db, employer.id)
+    query = db.query(ApplicationModel).filter(
+        ApplicationModel.job_id == job.id,
+        ApplicationModel.status.in_(["submitted", "reviewed"]),
+        ~select(InterviewModel.id).where(InterviewModel.application_id == ApplicationModel.id).exists(),
+    )
+    if data.application_ids is not None:
+        query = query.filter(ApplicationModel.id.in_(data.application_ids))
+    applications = query.order_by(ApplicationModel.id).limit(settings.INTERVIEW_AUTO_SCHEDULE_MAX).all()
+
+    lock_student_calendars(db, [application.user_id for application in applications])
+    placed, unplaced = interviews.auto_schedule(
+        db,
+        employer.id,
+        applications,
+        data.window_start,
+        data.window_end,
+        duration,
+        data.day_start,
+        data.day_end,
+        data.weekdays_only,
+    )
+    if placed:
+        users = {application.id: application.user_id for application in applications}
+        db.execute(insert(InterviewModel).values([
+            {
+                "application_id": application_id,
+                "employer_id": employer.id,
+                "user_id": users[application_id],
+                "scheduled_at": start,
+                "duration_minutes": duration,
+                "location": data.location,
+                "mode": data.mode,
+            }
+            for application_id, start in placed.items()
+        ]))
+    db.commit()
+
+    scheduled = db.query(InterviewModel).filter(
+        InterviewModel.employer_id == employer.id,
+        InterviewModel.application_id.in_(list(placed)),
+    ).order_by(InterviewModel.scheduled_at).all() if placed else []
+    for interview in scheduled:
+        notify_scheduled(interview)
+    return {"scheduled": scheduled, "unscheduled": unplaced}
+
+
+@router.put("/{interview_id}", response_model=Interview)
+def update_interview(
+    interview_id: int,
+    data: InterviewUpdate,
+    current_user: User = Depends(get_current_employer),
+    db: Session = Depends(get_db),
+):
+    employer = get_employer_profile(db, current_user)
+    lock_employer_calendar(db, employer.id)
+    interview = get_own_interview(db, interview_id, employer)
+    duration = data.duration_minutes or interview.duration_minutes
+    check_duration(duration)
+
+    lock_student_calendars(db, [interview.user_id])
+    conflicts = interviews.find_conflicts(
+        db, employer.id, interview.user_id, data.scheduled_at, duration, exclude_id=interview.id
+    )
+    if conflicts:
+        db.rollback()
+        raise conflict_error(conflicts)
+
+    rescheduled = interview.scheduled_at != data.scheduled_at
+    interview.scheduled_at = data.scheduled_at
+    interview.duration_minutes = duration
+    interview.location = data.location
+    interview.mode = data.mode
+    interview.notes = data.notes
+    db.commit()
+    db.refresh(interview)
+    if rescheduled:
+        notify_scheduled(interview)
+    return interview
+
+
+@router.delete("/{interview_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_interview(
+    interview_id: int,
+    current_user: User = Depends(get_current_employer),
+    db: Session = Depends(get_db),
+):
+    employer = get_employer_profile(db, current_user)
+    interview = get_own_interview(db, interview_id, employer)
+    db.delete(interview)
+    db.commit()
+    return
@@ -1,42 +1,46 @@
-﻿from fastapi import APIRouter, Depends, HTTPException, status, Query
+﻿from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import or_, and_
-from typing import List, Optional
+from sqlalchemy.orm.exc import StaleDataError
+from typing import List, Optional, Tuple
+import uuid
 
-from app.database import SessionLocal
+from app import repositories
 from app.models.job import Job as JobModel
-from app.models.employer import Employer as EmployerModel
-from app.schemas.job_schema import Job, JobCreate
-from app.core.dependencies import get_current_employer
+from app.schemas.job_schema import Job, JobCreate, JOB_LISTING_FIELDS
+from app.core.dependencies import get_db, get_read_db, get_current_employer, get_current_user
+from app.core.tasks import enqueue
+from app.core import tracing
+from app.core.config import settings
+from app.core.serialization import FastJSONResponse, fast_list, fetch_rows, parse_fields, schema_fields, select_columns
+from app.services import entity_cache, favorites, job_import, purge
 
 router = APIRouter(prefix="/jobs", tags=["Jobs"])
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 @router.get("/", response_model=List[Job])
 def read_jobs(
-    db: Session = Depends(get_db),
+    request: Request,
+    db: Session = Depends(get_read_db),
     search: Optional[str] = Query(None, description="Поиск по ключевым словам в названии и описании"),
     employment_type: Optional[str] = Query(None, description="Фильтр по типу занятости"),
     location: Optional[str] = Query(None, description="Фильтр по местоположению"),
     remote: Optional[bool] = Query(None, description="Фильтр по удаленной работе"),
-    status: Optional[str] = Query("open", description="Фильтр по статусу вакансии")
+    status: Optional[str] = Query("open", description="Фильтр по статусу вакансии"),
+    fast: bool = Query(False, description="Быстрая сериализация больших списков без загрузки ORM-объектов"),
+    fields: Optional[str] = Query(None, description='Поля через запятую или набор "listing" для компактного списка'),
+    with_favorites: bool = Query(False, description="Отметить is_favorite вакансии из избранного (нужен токен)"),
 ):
-    query = db.query(JobModel)
+    projection = parse_fields(fields, Job, {"listing": JOB_LISTING_FIELDS})
+    filters = []
     
     if status:
-        query = query.filter(JobModel.status == status)
+        filters.append(JobModel.status == status)
     
     if search:
         search_term = f"%{search.lower()}%"
-        query = query.filter(
+        filters.append(
             or_(
                 JobModel.title.ilike(search_term),
                 JobModel.description.ilike(search_term)
@@ -44,23 +48,36 @@ def read_jobs(
         )
     
     if employment_type:
-        query = query.filter(JobModel.employment_type == employment_type)
+        filters.append(JobModel.employment_type == employment_type)
     
     if location:
-        query = query.filter(JobModel.location.ilike(f"%{location}%"))
+        filters.append(JobModel.location.ilike(f"%{location}%"))
     
     if remote is not None:
-        query = query.filter(JobModel.remote == remote)
+        filters.append(JobModel.remote == remote)
+    
+    if with_favorites:
+        current_user = get_current_user(request, db)
+        rows = fetch_rows(db, select_columns(JobModel, projection or schema_fields(Job)).where(*filters))
+        saved = favorites.favorite_job_ids(db, current_user.id, (row["id"] for row in rows))
+        for row in rows:
+            row["is_favorite"] = row["id"] in saved
+        return FastJSONResponse(rows)
+
+    if fast or projection:
+        return fast_list(db, JobModel, Job, *filters, fields=projection)
     
-    return query.all()
+    return db.query(JobModel).filter(*filters).all()
 
 
 @router.get("/my", response_model=List[Job])
 def read_my_jobs(
     db: Session = Depends(get_db),
     current_user = Depends(get_current_employer),
+    fields: Optional[str] = Query(None, description='Поля через запятую или набор "listing" для компактного списка'),
 ):
-    employer = db.query(EmployerModel).filter(EmployerModel.user_id == current_user.id).first()
+    projection = parse_fields(fields, Job, {"listing": JOB_LISTING_FIELDS})
+    employer = entity_cache.employer_for_user(db, current_user.id)
     if not employer:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -71,12 +88,169 @@ def read_my_jobs(
             }
         )
 
+    if projection:
+        return fast_list(db, JobModel, Job, JobModel.employer_id == employer.id, fields=projection)
+
     return db.query(JobModel).filter(JobModel.employer_id == employer.id).all()
 
 
+@tracing.traced(kind="dependency")
+async def read_import_file(request: Request) -> Tuple[bytes, str]:
+    """Тело импорта: JSON-массив, CSV или файл .csv/.json в поле file формы."""
+    too_large = HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail={
+            "error": "Файл слишком большой",
+            "detail": f"Максимальный размер файла импорта: {settings.JOB_IMPORT_MAX_BYTES // 1024 // 1024} МБ",
+            "help": "Разделите файл на несколько частей",
+        },
+    )
+    length = request.headers.get("content-length")
+    if length and length.isdigit() and int(length) > settings.JOB_IMPORT_MAX_BYTES:
+        raise too_large
+
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type == "multipart/form-data":
+        form = await request.form()
+        upload = form.get("file")
+        if upload is None or isinstance(upload, str):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={
+                    "error": "Файл не передан",
+                    "detail": "В форме нет поля file с файлом импорта",
+                    "help": "Передайте файл .csv или .json в поле file",
+                },
+            )
+        data = await upload.read()
+        kind = "csv" if (upload.filename or "").lower().endswith(".csv") else "json"
+    else:
+        data = await request.body()
+        kind = "csv" if content_type in ("text/csv", "application/csv") else "json"
+    if len(data) > settings.JOB_IMPORT_MAX_BYTES:
+        raise too_large
+    return data, kind
+
+
+@router.post("/bulk", status_code=201)
+def bulk_create_jobs(
+    background: bool = Query(False, description="Выполнить импорт фоновой задачей и вернуть ID для отслеживания"),
+    upload: Tuple[bytes, str] = Depends(read_import_file),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_employer),
+):
+    employer = repositories.employer_by_user_id(db, current_user.id)
+    if not employer:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "error": "Профиль работодателя не найден",
+                "detail": "Не удалось найти профиль работодателя для текущего пользователя",
+                "help": "Обратитесь к администратору для создания профиля работодателя"
+            }
+        )
+
+    try:
+        rows = job_import.parse_rows(*upload)
+    except job_import.ImportFormatError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "error": "Некорректный файл импорта",
+                "detail": str(e),
+                "help": "Передайте JSON-массив вакансий или CSV с заголовком из полей вакансии",
+            },
+        )
+    jobs, errors = job_import.validate_rows(rows, employer.id)
+    if not jobs:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail={
+                "error": "Нет корректных строк для импорта",
+                "detail": f"Строк в файле: {len(rows)}, с ошибками: {len(errors)}",
+                "errors": errors,
+                "help": "Исправьте строки с ошибками и повторите импорт",
+            },
+        )
+
+    if background:
+        import_id = uuid.uuid4().hex
+        key = enqueue(
+            "jobs.import",
+            {"employer_id": employer.id, "rows": [job.model_dump(mode="json") for job in jobs]},
+            key=f"jobs-import:{import_id}",
+        )
+        if key is None:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail={
+                    "error": "Очередь задач недоступна",
+                    "detail": "Не удалось поставить импорт в очередь",
+                    "help": "Повторите запрос позже или загрузите файл без background",
+                },
+            )
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content={
+                "import_id": import_id,
+                "status_url": f"/jobs/bulk/{import_id}",
+                "accepted": len(jobs),
+                "errors": errors,
+            },
+        )
+
+    if len(jobs) > settings.JOB_IMPORT_SYNC_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail={
+                "error": "Слишком много строк для синхронного импорта",
+                "detail": f"Строк: {len(jobs)}, без background допускается до {settings.JOB_IMPORT_SYNC_ROWS}",
+                "help": "Повторите запрос с параметром background=true",
+            },
+        )
+
+    try:
+        ids = job_import.insert_jobs(
+            db, [job_import.job_values(job) for job in jobs], settings.JOB_IMPORT_BATCH_SIZE
+        )
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={
+                "error": "Ошибка при импорте вакансий",
+                "detail": str(e),
+                "help": "Ни одна вакансия не добавлена; повторите запрос позже"
+            }
+        )
+    job_import.after_import(ids)
+    return {"created": len(ids), "ids": ids, "errors": errors}
+
+
+@router.get("/bulk/{import_id}")
+def read_bulk_import(
+    import_id: str,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_employer),
+):
+    progress = job_import.import_status(import_id)
+    employer = entity_cache.employer_for_user(db, current_user.id)
+    if progress is None or not employer or progress["employer_id"] != employer.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "error": "Импорт не найден",
+                "detail": f"Импорт {import_id} не существует или запущен другим работодателем",
+                "help": "Используйте import_id из ответа POST /jobs/bulk",
+            },
+        )
+    return progress
+
+
 @router.get("/{job_id}", response_model=Job)
-def read_job(job_id: int, db: Session = Depends(get_db)):
-    job = db.query(JobModel).filter(JobModel.id == job_id).first()
+def read_job(job_id: int, db: Session = Depends(get_read_db)):
+    job = repositories.job_by_id(db, job_id)
     if not job:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -96,7 +270,7 @@ def create_job(
     current_user = Depends(get_current_employer),
 ):
     try:
-        employer = db.query(EmployerModel).filter(EmployerModel.user_id == current_user.id).first()
+        employer = repositories.employer_by_user_id(db, current_user.id)
         if not employer:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -121,6 +295,7 @@ def create_job(
         db.add(db_job)
         db.commit()
         db.refresh(db_job)
+        enqueue("notifications.job_created", {"job_id": db_job.id}, key=f"job-created:{db_job.id}")
         return db_job
     except HTTPException:
         raise
@@ -138,7 +313,7 @@ def create_job(
 
 @router.put("/{job_id}", response_model=Job)
 def update_job(job_id: int, job_update: JobCreate, db: Session = Depends(get_db)):
-    job = db.query(JobModel).filter(JobModel.id == job_id).first()
+    job = repositories.job_by_id(db, job_id)
     if not job:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -152,14 +327,25 @@ def update_job(job_id: int, job_update: JobCreate, db: Session = Depends(get_db)
     for key, value in job_update.dict().items():
         setattr(job, key, value)
 
-    db.commit()
+    try:
+        db.commit()
+    except StaleDataError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={
+                "error": "Конфликт обновления",
+                "detail": f"Вакансия с ID {job_id} была изменена другим запросом",
+                "help": "Обновите страницу и повторите изменение"
+            }
+        )
     db.refresh(job)
     return job
 
 
 @router.delete("/{job_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_job(job_id: int, db: Session = Depends(get_db)):
-    job = db.query(JobModel).filter(JobModel.id == job_id).first()
+    job = repositories.job_by_id(db, job_id)
     if not job:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -170,6 +356,7 @@ def delete_job(job_id: int, db: Session = Depends(get_db)):
             }
         )
 
-    db.delete(job)
+    purge.soft_delete(db, job)
     db.commit()
+    purge.schedule_purge("jobs", job_id)
     return
@@ -1,30 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
-from app.database import SessionLocal
 from app.models.review import Review as ReviewModel
-from app.models.job import Job as JobModel
-from app.models.employer import Employer as EmployerModel
 from app.models.user import User
-from app.schemas.review_schema import Review, ReviewCreate
-from app.core.dependencies import get_current_student, get_current_user
+from app.schemas.review_schema import Review, ReviewCreate, REVIEW_LISTING_FIELDS
+from app.core.dependencies import get_db, get_read_db, get_current_student, get_current_user
+from app.core.tasks import enqueue
+from app.core.serialization import fast_list, parse_fields
+from app.services import entity_cache
 
 
 router = APIRouter(prefix="/reviews", tags=["Reviews"])
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 @router.get("/job/{job_id}", response_model=List[Review])
-def read_reviews_for_job(job_id: int, db: Session = Depends(get_db)):
-    job = db.query(JobModel).filter(JobModel.id == job_id).first()
+def read_reviews_for_job(
+    job_id: int,
+    db: Session = Depends(get_read_db),
+    fields: Optional[str] = Query(None, description='Поля через запятую или набор "listing" для компактного списка'),
+):
+    projection = parse_fields(fields, Review, {"listing": REVIEW_LISTING_FIELDS})
+    job = entity_cache.get_job(db, job_id)
     if not job:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -34,6 +31,8 @@ def read_reviews_for_job(job_id: int, db: Session = Depends(get_db)):
                 "help": "Проверьте правильность указанного ID вакансии",
             },
         )
+    if projection:
+        return fast_list(db, ReviewModel, Review, ReviewModel.job_id == job_id, fields=projection)
     return db.query(ReviewModel).filter(ReviewModel.job_id == job_id).all()
 
 
@@ -43,7 +42,7 @@ def create_review(
     current_user: User = Depends(get_current_student),
     db: Session = Depends(get_db),
 ):
-    job = db.query(JobModel).filter(JobModel.id == review_data.job_id).first()
+    job = entity_cache.get_job(db, review_data.job_id)
     if not job:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -54,7 +53,7 @@ def create_review(
             },
         )
 
-    employer = db.query(EmployerModel).filter(EmployerModel.id == job.employer_id).first()
+    employer = entity_cache.get_employer(db, job.employer_id)
     if not employer:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -85,4 +84,9 @@ def create_review(
     db.add(db_review)
     db.commit()
     db.refresh(db_review)
+    enqueue(
+        "notifications.review_created",
+        {"review_id": db_review.id, "job_id": db_review.job_id, "employer_id": db_review.employer_id, "rating": db_review.rating},
+        key=f"review-created:{db_review.id}",
+    )
     return db_review
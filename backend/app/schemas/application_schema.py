@@ -1,7 +1,10 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
+APPLICATION_LISTING_FIELDS = ["id", "job_id", "user_id", "status", "submitted_at", "updated_at"]
+
+
 class ApplicationCreate(BaseModel):
     job_id: int
     cover_letter: Optional[str] = None
@@ -19,3 +22,11 @@ class Application(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class ScoredApplication(Application):
+    score: float
+
+
+class RankedApplication(ScoredApplication):
+    matched_terms: List[str]
@@ -0,0 +1,35 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import datetime
+
+
+class UploadCreate(BaseModel):
+    job_id: int
+    file_name: str = Field(min_length=1, max_length=255)
+    size: int = Field(ge=1)
+    description: Optional[str] = None
+    content_type: Optional[str] = Field(None, max_length=100)
+
+
+class UploadStatus(BaseModel):
+    upload_id: str
+    job_id: int
+    file_name: str
+    size: int
+    offset: int
+    upload_url: str
+    chunk_max: int
+
+
+class Attachment(BaseModel):
+    id: int
+    job_id: int
+    file_url: str
+    description: Optional[str] = None
+    file_name: Optional[str] = None
+    size: Optional[int] = None
+    content_type: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
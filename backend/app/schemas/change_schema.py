@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from typing import List
+from datetime import datetime
+
+
+class Change(BaseModel):
+    cursor: int
+    entity: str
+    entity_id: int
+    op: str
+    changed_at: datetime
+
+
+class ChangeFeed(BaseModel):
+    changes: List[Change]
+    next_cursor: int
+    has_more: bool
@@ -1,6 +1,9 @@
 ﻿from pydantic import BaseModel
 
 
+EMPLOYER_LISTING_FIELDS = ["id", "name", "department_id"]
+
+
 class EmployerBase(BaseModel):
     name: str
     department_id: int | None = None
@@ -0,0 +1,27 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import datetime
+
+from app.schemas.job_schema import Job
+
+
+class FavoriteCreate(BaseModel):
+    job_id: int
+
+
+class Favorite(BaseModel):
+    id: int
+    job_id: int
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class FavoriteWithJob(Favorite):
+    job: Job
+
+
+class FavoritePage(BaseModel):
+    items: List[FavoriteWithJob]
+    next_cursor: Optional[int] = None
@@ -0,0 +1,69 @@
+from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import List, Optional
+from datetime import datetime, time
+
+
+def to_local_naive(value: datetime) -> datetime:
+    """В БД время хранится без пояса, в локальном времени сервера; время
+    с поясом (например, ...Z) переводится в него, иначе сравнение с
+    записями из БД падает."""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone().replace(tzinfo=None)
+
+
+class InterviewBase(BaseModel):
+    scheduled_at: datetime
+    duration_minutes: Optional[int] = Field(None, ge=5)
+    location: Optional[str] = None
+    mode: Optional[str] = Field(None, max_length=30)
+    notes: Optional[str] = None
+
+    _local_scheduled_at = field_validator("scheduled_at")(to_local_naive)
+
+
+class InterviewCreate(InterviewBase):
+    application_id: int
+
+
+class InterviewUpdate(InterviewBase):
+    pass
+
+
+class Interview(InterviewBase):
+    id: int
+    application_id: int
+    employer_id: int
+    user_id: int
+    duration_minutes: int
+
+    class Config:
+        from_attributes = True
+
+
+class AutoScheduleRequest(BaseModel):
+    job_id: int
+    application_ids: Optional[List[int]] = Field(None, description="По умолчанию все заявки вакансии без собеседования")
+    window_start: datetime
+    window_end: datetime
+    duration_minutes: Optional[int] = Field(None, ge=5)
+    day_start: time = time(9, 0)
+    day_end: time = time(18, 0)
+    weekdays_only: bool = True
+    location: Optional[str] = None
+    mode: Optional[str] = Field(None, max_length=30)
+
+    _local_window = field_validator("window_start", "window_end")(to_local_naive)
+
+    @model_validator(mode="after")
+    def check_window(self):
+        if self.window_end <= self.window_start:
+            raise ValueError("window_end должен быть позже window_start")
+        if self.day_end <= self.day_start:
+            raise ValueError("day_end должен быть позже day_start")
+        return self
+
+
+class AutoScheduleResult(BaseModel):
+    scheduled: List[Interview]
+    unscheduled: List[int]
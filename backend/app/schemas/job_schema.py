@@ -2,6 +2,9 @@ from pydantic import BaseModel
 from typing import Optional
 from datetime import date
 
+JOB_LISTING_FIELDS = ["id", "employer_id", "title", "location", "employment_type", "remote", "status"]
+
+
 class JobBase(BaseModel):
     title: str
     description: str
@@ -3,6 +3,9 @@ from typing import Optional
 from datetime import datetime
 
 
+REVIEW_LISTING_FIELDS = ["id", "job_id", "user_id", "rating", "created_at"]
+
+
 class ReviewBase(BaseModel):
     rating: int = Field(ge=1, le=5)
     comment: Optional[str] = None
@@ -0,0 +1,173 @@
+import logging
+import os
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import AsyncIterator, Iterable
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core import tracing
+from app.core.config import settings
+from app.core.tasks import pool, task
+from app.database import SessionLocal
+from app.models.attachment import Attachment as AttachmentModel, AttachmentUpload
+
+logger = logging.getLogger(__name__)
+
+ATTACHMENT_URL_PREFIX = "/attachments/file/"
+
+
+class ChunkTooLarge(ValueError):
+    pass
+
+
+def partial_path(upload_id: str) -> Path:
+    return settings.ATTACHMENT_DIR / "partial" / upload_id
+
+
+def stored_path(file_url: str) -> Path:
+    return settings.ATTACHMENT_DIR / Path(file_url[len(ATTACHMENT_URL_PREFIX):]).name
+
+
+@tracing.traced(kind="file")
+def preallocate(path: Path, size: int):
+    """Создает файл нужного размера заранее: место занято сразу, и запись
+    кусков по смещениям не растит файл и не фрагментирует его."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT, 0o644)
+    try:
+        if size:
+            try:
+                os.posix_fallocate(fd, 0, size)
+            except (AttributeError, OSError):
+                # Не все ФС и платформы умеют fallocate; разреженный файл тоже подходит
+                os.ftruncate(fd, size)
+    finally:
+        os.close(fd)
+
+
+@tracing.traced("pwrite", kind="file")
+def _pwrite_all(fd: int, data: bytes, offset: int):
+    view = memoryview(data)
+    while view:
+        written = os.pwrite(fd, view, offset)
+        view = view[written:]
+        offset += written
+
+
+class ChunkWriter:
+    """Пишет тело запроса в файл с позиции offset.
+
+    В памяти держится не больше buffer_size байт; written — сколько уже
+    на диске, даже если клиент оборвал запрос посередине.
+    """
+
+    def __init__(self, path: Path, offset: int, max_bytes: int, buffer_size: int):
+        self.path = path
+        self.offset = offset
+        self.max_bytes = max_bytes
+        self.buffer_size = buffer_size
+        self.written = 0
+
+    async def write(self, stream: AsyncIterator[bytes]) -> int:
+        fd = await run_in_threadpool(os.open, self.path, os.O_WRONLY)
+        buffer = bytearray()
+        try:
+            async for piece in stream:
+                if self.written + len(buffer) + len(piece) > self.max_bytes:
+                    raise ChunkTooLarge(f"Кусок больше допустимых {self.max_bytes} байт")
+                buffer += piece
+                if len(buffer) >= self.buffer_size:
+                    await self._flush(fd, buffer)
+            if buffer:
+                await self._flush(fd, buffer)
+        finally:
+            await run_in_threadpool(os.close, fd)
+        return self.written
+
+    async def _flush(self, fd: int, buffer: bytearray):
+        data = bytes(buffer)
+        buffer.clear()
+        await run_in_threadpool(_pwrite_all, fd, data, self.offset + self.written)
+        self.written += len(data)
+
+
+def advance(db: Session, upload_id: str, received: int):
+    """Сдвигает позицию загрузки вперед; повторно присланный кусок ее не уменьшит."""
+    db.execute(
+        update(AttachmentUpload)
+        .where(AttachmentUpload.id == upload_id, AttachmentUpload.received < received)
+        .values(received=received, updated_at=datetime.now())
+    )
+    db.commit()
+
+
+def finalize(db: Session, upload: AttachmentUpload) -> AttachmentModel:
+    """Переносит собранный файл к вложениям и создает запись attachments."""
+    source = partial_path(upload.id)
+    with tracing.span("fsync", "file", path=str(source)), open(source, "rb+") as f:
+        os.fsync(f.fileno())
+    file_name = f"{uuid.uuid4()}{Path(upload.file_name).suffix.lower()}"
+    target = settings.ATTACHMENT_DIR / file_name
+    os.replace(source, target)
+    attachment = AttachmentModel(
+        job_id=upload.job_id,
+        file_url=f"{ATTACHMENT_URL_PREFIX}{file_name}",
+        description=upload.description,
+        file_name=upload.file_name,
+        size=upload.size,
+        content_type=upload.content_type,
+    )
+    try:
+        db.add(attachment)
+        db.delete(upload)
+        db.commit()
+    except Exception:
+        db.rollback()
+        os.replace(target, source)
+        raise
+    db.refresh(attachment)
+    return attachment
+
+
+def remove_files(paths: Iterable[Path]):
+    for path in paths:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Не удалось удалить файл вложения {path}: {e}")
+
+
+def expire_uploads(db: Session, older_than: datetime, chunk_size: int) -> int:
+    removed = 0
+    while True:
+        ids = db.execute(
+            select(AttachmentUpload.id).where(AttachmentUpload.updated_at < older_than).limit(chunk_size)
+        ).scalars().all()
+        if not ids:
+            return removed
+        db.execute(delete(AttachmentUpload).where(AttachmentUpload.id.in_(ids)))
+        db.commit()
+        remove_files(partial_path(upload_id) for upload_id in ids)
+        removed += len(ids)
+
+
+@task("attachments.expire_uploads")
+def run_expire_uploads(payload: dict):
+    ttl = payload.get("ttl", settings.ATTACHMENT_UPLOAD_TTL)
+    db = SessionLocal()
+    try:
+        removed = expire_uploads(db, datetime.now() - timedelta(seconds=ttl), settings.PURGE_CHUNK_SIZE)
+    finally:
+        db.close()
+    if removed:
+        logger.info(f"Удалено брошенных загрузок вложений: {removed}")
+    return {"removed": removed}
+
+
+pool.every(lambda: settings.ATTACHMENT_SWEEP_INTERVAL, "attachments.expire_uploads")
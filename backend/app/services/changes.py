@@ -0,0 +1,154 @@
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import delete, event, insert, select
+from sqlalchemy.orm import Session, aliased
+
+from app.core.config import settings
+from app.core.tasks import pool, task
+from app.database import RoutingSession, SessionLocal
+from app.models.application import Application as ApplicationModel
+from app.models.change import Change
+from app.models.department import Department as DepartmentModel
+from app.models.job import Job as JobModel
+from app.models.review import Review as ReviewModel
+
+logger = logging.getLogger(__name__)
+
+TRACKED = {
+    JobModel: "jobs",
+    ApplicationModel: "applications",
+    ReviewModel: "reviews",
+    DepartmentModel: "departments",
+}
+ENTITIES = sorted(TRACKED.values())
+
+
+def record(session: Session, entity: str, ids: Iterable[int], op: str = "update"):
+    """Запоминает изменение, сделанное в обход ORM (UPDATE/INSERT через execute).
+
+    Изменения объектов ORM собираются сами при flush. Записи попадают в
+    журнал при коммите той же транзакции и пропадают при откате.
+    """
+    pending = session.info.setdefault("changes", {})
+    for entity_id in ids:
+        key = (entity, entity_id)
+        # create + update остается create, после delete обновления не важны
+        if op == "update" and key in pending:
+            continue
+        pending[key] = op
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _collect_orm_changes(session, flush_context):
+    for obj in session.new:
+        entity = TRACKED.get(type(obj))
+        if entity:
+            record(session, entity, [obj.id], "create")
+    for obj in session.dirty:
+        entity = TRACKED.get(type(obj))
+        if entity and session.is_modified(obj, include_collections=False):
+            op = "delete" if getattr(obj, "deleted_at", None) is not None else "update"
+            record(session, entity, [obj.id], op)
+    for obj in session.deleted:
+        entity = TRACKED.get(type(obj))
+        if entity:
+            record(session, entity, [obj.id], "delete")
+
+
+@event.listens_for(RoutingSession, "before_commit")
+def _write_changes(session):
+    # Оставшиеся изменения ORM нужно сбросить сейчас, иначе их записи
+    # соберутся уже после того, как журнал будет записан
+    session.flush()
+    pending = session.info.pop("changes", None)
+    if not pending:
+        return
+    now = datetime.now().replace(microsecond=0)
+    rows = [
+        {"entity": entity, "entity_id": entity_id, "op": op, "changed_at": now}
+        for (entity, entity_id), op in pending.items()
+    ]
+    batch_size = settings.CHANGE_LOG_BATCH_SIZE
+    for start in range(0, len(rows), batch_size):
+        session.execute(insert(Change).values(rows[start:start + batch_size]))
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _discard_changes(session):
+    session.info.pop("changes", None)
+
+
+def read_changes(
+    db: Session,
+    since: int,
+    limit: int,
+    entities: Optional[Sequence[str]] = None,
+    settle: float = 0.0,
+) -> Tuple[List[Change], int, bool]:
+    """Изменения после курсора since: (записи, следующий курсор, есть ли еще).
+
+    id выдаются при вставке, а видны после коммита, поэтому более поздний id
+    может появиться раньше более раннего. Свежий разрыв в номерах означает
+    незакоммиченную транзакцию: чтение останавливается перед ним, пока
+    разрыву не исполнится settle секунд. Старые разрывы — откаты и сжатие.
+    Фильтр по сущностям применяется после этого, чтобы курсор шел по всем id.
+    """
+    rows = db.execute(
+        select(Change).where(Change.id > since).order_by(Change.id).limit(limit)
+    ).scalars().all()
+    fresh = datetime.now() - timedelta(seconds=settle)
+    cursor = since
+    visible = []
+    for row in rows:
+        if row.id != cursor + 1 and row.changed_at > fresh:
+            return visible, cursor, True
+        cursor = row.id
+        if not entities or row.entity in entities:
+            visible.append(row)
+    return visible, cursor, len(rows) == limit
+
+
+def compact_changes(db: Session, older_than: datetime, chunk_size: int, pause: float = 0.0) -> int:
+    """Удаляет старые записи, у которых есть более новая запись о той же строке.
+
+    Для каждой строки остается последняя запись, поэтому клиент, читающий
+    ленту с нуля, по-прежнему узнает обо всех живых и удаленных строках.
+    """
+    newer = aliased(Change)
+    removed = 0
+    while True:
+        ids = db.execute(
+            select(Change.id)
+            .join(newer, (newer.entity == Change.entity) & (newer.entity_id == Change.entity_id) & (newer.id > Change.id))
+            .where(Change.changed_at < older_than)
+            .distinct()
+            .limit(chunk_size)
+        ).scalars().all()
+        if not ids:
+            return removed
+        db.execute(delete(Change).where(Change.id.in_(ids)))
+        db.commit()
+        removed += len(ids)
+        if pause:
+            time.sleep(pause)
+
+
+@task("changes.compact")
+def run_compaction(payload: dict):
+    retention = payload.get("retention", settings.CHANGE_LOG_RETENTION)
+    db = SessionLocal()
+    try:
+        removed = compact_changes(
+            db, datetime.now() - timedelta(seconds=retention), settings.PURGE_CHUNK_SIZE, settings.PURGE_PAUSE
+        )
+    finally:
+        db.close()
+    if removed:
+        logger.info(f"Сжатие журнала изменений: удалено записей {removed}")
+    return {"removed": removed}
+
+
+pool.every(lambda: settings.CHANGE_LOG_COMPACT_INTERVAL, "changes.compact")
@@ -0,0 +1,236 @@
+import logging
+import threading
+from types import SimpleNamespace
+from typing import Iterable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import repositories
+from app.core import lifecycle
+from app.core.broker import broker
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.database import RoutingSession, SessionLocal
+from app.models.department import Department as DepartmentModel
+from app.models.employer import Employer as EmployerModel
+from app.models.job import Job as JobModel
+
+logger = logging.getLogger(__name__)
+
+INVALIDATE_TOPIC = "entities.invalidate"
+
+MODELS = {"departments": DepartmentModel, "employers": EmployerModel, "jobs": JobModel}
+KINDS = {model: kind for kind, model in MODELS.items()}
+# Счетчики меняются атомарными UPDATE на каждое принятие заявки; в снимке
+# они бы сразу устаревали, а проверки владения в них не нуждаются
+VOLATILE = {"jobs": {"accepted_count", "version"}}
+FIELDS = {
+    kind: tuple(column.key for column in model.__table__.columns if column.key not in VOLATILE.get(kind, ()))
+    for kind, model in MODELS.items()
+}
+
+
+class Snapshot(SimpleNamespace):
+    """Значения колонок строки на момент загрузки; не привязан к сессии.
+
+    Годится для проверок владения и ответов через response_model, но не
+    для изменения: для записи строку нужно загрузить в сессию.
+    """
+
+
+def _load(db: Session, kind: str, entity_id: int):
+    if kind == "jobs":
+        return repositories.job_by_id(db, entity_id)
+    model = MODELS[kind]
+    return db.query(model).filter(model.id == entity_id).first()
+
+
+def snapshot(kind: str, obj) -> Snapshot:
+    return Snapshot(**{field: getattr(obj, field) for field in FIELDS[kind]})
+
+
+class EntityCache:
+    """Кэш снимков отделов, работодателей и вакансий с версиями сброса.
+
+    Каждый сброс увеличивает общий счетчик версий и помечает им ключ.
+    Загрузка запоминает счетчик до чтения из БД и не кладет результат в
+    кэш, если ключ сбросили после этого: иначе запрос, прочитавший строку
+    до чужого коммита, вернул бы в кэш старые данные.
+
+    При enabled=False снимки строятся из каждого чтения БД и не
+    сохраняются.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, enabled: bool = True):
+        self.enabled = enabled
+        self.entries = TTLCache(maxsize, ttl)
+        self._stamps = TTLCache(maxsize, ttl)
+        self._version = 0
+        self._cleared = 0
+        self._lock = threading.Lock()
+
+    def _store(self, key, value, version: int):
+        if self.enabled and version >= self._cleared and self._stamps.get(key, 0) <= version:
+            self.entries.set(key, value)
+
+    def get(self, db: Session, kind: str, entity_id: Optional[int]) -> Optional[Snapshot]:
+        if entity_id is None:
+            return None
+        key = (kind, entity_id)
+        cached = self.entries.get(key)
+        if cached is not None:
+            return cached
+        version = self._version
+        obj = _load(db, kind, entity_id)
+        if obj is None:
+            return None
+        value = snapshot(kind, obj)
+        self._store(key, value, version)
+        return value
+
+    def employer_for_user(self, db: Session, user_id: int) -> Optional[Snapshot]:
+        employer_id = self.entries.get(("employers.user", user_id))
+        if employer_id is not None:
+            employer = self.get(db, "employers", employer_id)
+            if employer is not None and employer.user_id == user_id:
+                return employer
+        version = self._version
+        obj = repositories.employer_by_user_id(db, user_id)
+        if obj is None:
+            return None
+        value = snapshot("employers", obj)
+        self._store(("employers", obj.id), value, version)
+        self._store(("employers.user", user_id), obj.id, version)
+        return value
+
+    def warm(self, db: Session, jobs: int) -> int:
+        """Загружает снимки последних открытых вакансий, их работодателей и
+        отделов; возвращает число снимков."""
+        version = self._version
+        rows = db.query(JobModel).filter(JobModel.status == "open").order_by(JobModel.id.desc()).limit(jobs).all()
+        employer_ids = {job.employer_id for job in rows if job.employer_id is not None}
+        employers = db.query(EmployerModel).filter(EmployerModel.id.in_(employer_ids)).all() if employer_ids else []
+        department_ids = {employer.department_id for employer in employers if employer.department_id is not None}
+        departments = (
+            db.query(DepartmentModel).filter(DepartmentModel.id.in_(department_ids)).all() if department_ids else []
+        )
+        for kind, objs in (("jobs", rows), ("employers", employers), ("departments", departments)):
+            for obj in objs:
+                self._store((kind, obj.id), snapshot(kind, obj), version)
+        for employer in employers:
+            self._store(("employers.user", employer.user_id), employer.id, version)
+        return len(rows) + len(employers) + len(departments)
+
+    def invalidate_local(self, kind: str, entity_id: int):
+        key = (kind, entity_id)
+        with self._lock:
+            self._version += 1
+            self._stamps.set(key, self._version)
+        self.entries.delete(key)
+
+    def clear(self):
+        with self._lock:
+            self._version += 1
+            # Загрузки, начатые до очистки, свой результат уже не сохранят
+            self._cleared = self._version
+        self.entries.clear()
+
+
+_cache: Optional[EntityCache] = None
+_cache_lock = threading.Lock()
+
+
+def entity_cache() -> EntityCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = EntityCache(
+                    settings.ENTITY_CACHE_SIZE, settings.ENTITY_CACHE_TTL, settings.ENTITY_CACHE_ENABLED,
+                )
+    return _cache
+
+
+@lifecycle.warmup
+def warm_entity_cache():
+    """Первые запросы к открытым вакансиям не ходят в БД за проверками владения."""
+    if not settings.ENTITY_CACHE_ENABLED or not settings.ENTITY_CACHE_WARM_JOBS:
+        return
+    db = SessionLocal()
+    db.info["read_only"] = True
+    try:
+        loaded = entity_cache().warm(db, settings.ENTITY_CACHE_WARM_JOBS)
+    finally:
+        db.close()
+    logger.info(f"В кэш сущностей загружено снимков: {loaded}")
+
+
+def get_department(db: Session, department_id: Optional[int]) -> Optional[Snapshot]:
+    return entity_cache().get(db, "departments", department_id)
+
+
+def get_employer(db: Session, employer_id: Optional[int]) -> Optional[Snapshot]:
+    return entity_cache().get(db, "employers", employer_id)
+
+
+def get_job(db: Session, job_id: Optional[int]) -> Optional[Snapshot]:
+    return entity_cache().get(db, "jobs", job_id)
+
+
+def employer_for_user(db: Session, user_id: int) -> Optional[Snapshot]:
+    return entity_cache().employer_for_user(db, user_id)
+
+
+def invalidate(kind: str, *entity_ids: int):
+    """Сбрасывает записи здесь и, через брокер, в остальных процессах."""
+    for entity_id in entity_ids:
+        entity_cache().invalidate_local(kind, entity_id)
+    if not entity_ids:
+        return
+    try:
+        broker.publish(INVALIDATE_TOPIC, {"kind": kind, "ids": list(entity_ids)})
+    except Exception as e:
+        logger.error(f"Не удалось разослать сброс кэша {kind} {list(entity_ids)}: {e}")
+
+
+def invalidate_on_commit(session: Session, kind: str, ids: Iterable[int]):
+    """Запоминает изменение, сделанное в обход ORM, для сброса после коммита.
+
+    Изменения объектов ORM собираются сами при flush. Сброс до коммита
+    не годится: параллельный запрос успел бы снова загрузить старую строку.
+    """
+    session.info.setdefault("entity_invalidations", set()).update((kind, entity_id) for entity_id in ids)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _collect_orm_changes(session, flush_context):
+    for obj in list(session.dirty) + list(session.deleted):
+        kind = KINDS.get(type(obj))
+        if kind and (obj in session.deleted or session.is_modified(obj, include_collections=False)):
+            invalidate_on_commit(session, kind, [obj.id])
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _flush_invalidations(session):
+    pending = session.info.pop("entity_invalidations", None)
+    if not pending:
+        return
+    by_kind = {}
+    for kind, entity_id in pending:
+        by_kind.setdefault(kind, []).append(entity_id)
+    for kind, entity_ids in by_kind.items():
+        invalidate(kind, *sorted(entity_ids))
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _discard_invalidations(session):
+    session.info.pop("entity_invalidations", None)
+
+
+def _on_invalidate(message: dict):
+    for entity_id in message["ids"]:
+        entity_cache().invalidate_local(message["kind"], entity_id)
+
+
+broker.subscribe(INVALIDATE_TOPIC, _on_invalidate)
@@ -0,0 +1,169 @@
+import csv
+import io
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, Iterator, List, Optional, Sequence
+
+from sqlalchemy import select
+
+from app.database import SessionLocal
+from app.models.application import Application as ApplicationModel
+from app.models.job import Job as JobModel
+from app.core.compression import stream_compressor
+from app.core.serialization import dumps
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "jsonl": "application/x-ndjson",
+}
+
+
+def _day_range(column, date_from: Optional[date], date_to: Optional[date]):
+    filters = []
+    if date_from:
+        filters.append(column >= datetime.combine(date_from, time.min))
+    if date_to:
+        filters.append(column < datetime.combine(date_to + timedelta(days=1), time.min))
+    return filters
+
+
+def applications_export_query(
+    employer_id: Optional[int] = None,
+    job_id: Optional[int] = None,
+    status: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+):
+    """Заявки с названием вакансии; date_from и date_to включительно, по дате подачи."""
+    stmt = (
+        select(
+            ApplicationModel.id,
+            ApplicationModel.job_id,
+            JobModel.title.label("job_title"),
+            JobModel.employer_id,
+            ApplicationModel.user_id,
+            ApplicationModel.status,
+            ApplicationModel.cover_letter,
+            ApplicationModel.resume_url,
+            ApplicationModel.submitted_at,
+            ApplicationModel.updated_at,
+        )
+        .join(JobModel, JobModel.id == ApplicationModel.job_id)
+        .where(*_day_range(ApplicationModel.submitted_at, date_from, date_to))
+        .order_by(ApplicationModel.id)
+    )
+    if employer_id is not None:
+        stmt = stmt.where(JobModel.employer_id == employer_id)
+    if job_id is not None:
+        stmt = stmt.where(ApplicationModel.job_id == job_id)
+    if status:
+        stmt = stmt.where(ApplicationModel.status == status)
+    return stmt
+
+
+def jobs_export_query(
+    employer_id: Optional[int] = None,
+    job_id: Optional[int] = None,
+    status: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+):
+    """Вакансии; date_from и date_to включительно, по дате начала работы."""
+    stmt = select(
+        JobModel.id,
+        JobModel.employer_id,
+        JobModel.title,
+        JobModel.description,
+        JobModel.location,
+        JobModel.employment_type,
+        JobModel.remote,
+        JobModel.start_date,
+        JobModel.end_date,
+        JobModel.spots,
+        JobModel.accepted_count,
+        JobModel.status,
+    ).order_by(JobModel.id)
+    if date_from:
+        stmt = stmt.where(JobModel.start_date >= date_from)
+    if date_to:
+        stmt = stmt.where(JobModel.start_date <= date_to)
+    if employer_id is not None:
+        stmt = stmt.where(JobModel.employer_id == employer_id)
+    if job_id is not None:
+        stmt = stmt.where(JobModel.id == job_id)
+    if status:
+        stmt = stmt.where(JobModel.status == status)
+    return stmt
+
+
+def encode_csv(keys: List[str], partitions: Iterable[Sequence]) -> Iterator[bytes]:
+    # BOM нужен, чтобы Excel открыл кириллицу без выбора кодировки
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(keys)
+    yield ("\ufeff" + buffer.getvalue()).encode("utf-8")
+    for rows in partitions:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(rows)
+        yield buffer.getvalue().encode("utf-8")
+
+
+def encode_jsonl(keys: List[str], partitions: Iterable[Sequence]) -> Iterator[bytes]:
+    for rows in partitions:
+        yield b"".join(dumps(dict(zip(keys, row))) + b"\n" for row in rows)
+
+
+ENCODERS = {"csv": encode_csv, "jsonl": encode_jsonl}
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int) -> Iterator[bytes]:
+    stream = stream_compressor("gzip", level)
+    for chunk in chunks:
+        compressed = stream.compress(chunk)
+        if compressed:
+            yield compressed
+    yield stream.finish()
+
+
+def keyset_partitions(db, stmt, chunk_size: int, bind_arguments: dict) -> Iterator[Sequence]:
+    # Первая колонка запроса — уникальный id, по которому он упорядочен
+    key = stmt.selected_columns[0]
+    last_id = None
+    while True:
+        page = stmt if last_id is None else stmt.where(key > last_id)
+        rows = db.execute(page.limit(chunk_size), bind_arguments=bind_arguments).all()
+        if rows:
+            yield rows
+        if len(rows) < chunk_size:
+            return
+        last_id = rows[-1][0]
+
+
+def stream_export(stmt, fmt: str, chunk_size: int, gzip_level: Optional[int] = None) -> Iterator[bytes]:
+    """Выгружает результат запроса частями по chunk_size строк.
+
+    Строки читаются курсором на стороне сервера (yield_per) без ORM-объектов,
+    поэтому память не зависит от размера выгрузки. Драйверы без таких
+    курсоров (mysqlconnector) вытянули бы в память весь результат, поэтому
+    для них каждая часть — отдельный запрос с условием id > последнего
+    отданного. Следующая часть читается только после того, как предыдущая
+    отдана клиенту. Генератор открывает собственную сессию: сессия
+    зависимости закрывается раньше, чем StreamingResponse дочитает тело.
+    """
+    db = SessionLocal()
+    db.info["read_only"] = True
+    try:
+        # Все части читаются из одной базы, даже если реплик несколько
+        bind_arguments = {"bind": db.get_bind()}
+        keys = list(stmt.selected_columns.keys())
+        if bind_arguments["bind"].dialect.supports_server_side_cursors:
+            result = db.execute(stmt.execution_options(yield_per=chunk_size), bind_arguments=bind_arguments)
+            partitions = result.partitions()
+        else:
+            partitions = keyset_partitions(db, stmt, chunk_size, bind_arguments)
+        chunks = ENCODERS[fmt](keys, partitions)
+        if gzip_level is not None:
+            chunks = gzip_chunks(chunks, gzip_level)
+        yield from chunks
+    finally:
+        db.close()
@@ -0,0 +1,69 @@
+import logging
+from typing import Iterable, Set
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.broker import broker
+from app.core.cache import TTLCache, get_cache
+from app.core.config import settings
+from app.models.favorite import Favorite as FavoriteModel
+
+logger = logging.getLogger(__name__)
+
+INVALIDATE_TOPIC = "favorites.invalidate"
+
+# Для студента с избранным больше FAVORITES_CACHE_MAX_SET в кэше лежит этот
+# признак: его набор не кэшируется, проверка идет запросом по странице
+_TOO_LARGE = False
+
+
+def _sets() -> TTLCache:
+    return get_cache("favorites", settings.FAVORITES_CACHE_SIZE, settings.FAVORITES_CACHE_TTL)
+
+
+def _load(db: Session, user_id: int):
+    limit = settings.FAVORITES_CACHE_MAX_SET
+    job_ids = db.execute(
+        select(FavoriteModel.job_id).where(FavoriteModel.user_id == user_id).limit(limit + 1)
+    ).scalars().all()
+    return frozenset(job_ids) if len(job_ids) <= limit else _TOO_LARGE
+
+
+def _page_favorites(db: Session, user_id: int, job_ids: Set[int]) -> Set[int]:
+    return set(db.execute(
+        select(FavoriteModel.job_id).where(FavoriteModel.user_id == user_id, FavoriteModel.job_id.in_(job_ids))
+    ).scalars())
+
+
+def favorite_job_ids(db: Session, user_id: int, job_ids: Iterable[int]) -> Set[int]:
+    """Какие из job_ids в избранном у студента.
+
+    Набор недавно активного студента берется из кэша; без кэша делается один
+    запрос на всю страницу, а не по запросу на каждую вакансию.
+    """
+    job_ids = set(job_ids)
+    if not job_ids:
+        return set()
+    if not settings.FAVORITES_CACHE_ENABLED:
+        return _page_favorites(db, user_id, job_ids)
+    sets = _sets()
+    known = sets.get(user_id)
+    if known is None:
+        known = _load(db, user_id)
+        sets.set(user_id, known)
+    if known is not _TOO_LARGE:
+        return set(known & job_ids)
+    return _page_favorites(db, user_id, job_ids)
+
+
+def invalidate(user_id: int):
+    """Сбрасывает набор студента здесь и, через брокер, в остальных процессах."""
+    _sets().delete(user_id)
+    try:
+        broker.publish(INVALIDATE_TOPIC, {"user_id": user_id})
+    except Exception as e:
+        logger.error(f"Не удалось разослать сброс избранного пользователя {user_id}: {e}")
+
+
+broker.subscribe(INVALIDATE_TOPIC, lambda message: _sets().delete(message["user_id"]))
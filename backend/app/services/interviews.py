@@ -0,0 +1,169 @@
+import bisect
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.interview import Interview as InterviewModel
+
+Interval = Tuple[datetime, datetime]
+
+
+def interview_end(interview: InterviewModel) -> datetime:
+    return interview.scheduled_at + timedelta(minutes=interview.duration_minutes)
+
+
+def busy_intervals(
+    db: Session,
+    column,
+    owner_ids: Iterable[int],
+    start: datetime,
+    end: datetime,
+    exclude_id: Optional[int] = None,
+) -> List[InterviewModel]:
+    """Собеседования владельцев, пересекающие [start, end).
+
+    Конец собеседования не хранится, поэтому индекс (владелец, scheduled_at)
+    просматривается только в окне [start - INTERVIEW_MAX_DURATION, end): раньше
+    начаться пересекающее собеседование не может. Точная проверка конца
+    делается уже по этим немногим строкам.
+    """
+    owner_ids = list(owner_ids)
+    if not owner_ids:
+        return []
+    lookback = start - timedelta(minutes=settings.INTERVIEW_MAX_DURATION)
+    stmt = select(InterviewModel).where(
+        column.in_(owner_ids),
+        InterviewModel.scheduled_at > lookback,
+        InterviewModel.scheduled_at < end,
+    )
+    if exclude_id is not None:
+        stmt = stmt.where(InterviewModel.id != exclude_id)
+    rows = db.execute(stmt).scalars().all()
+    return [row for row in rows if interview_end(row) > start]
+
+
+def find_conflicts(
+    db: Session,
+    employer_id: int,
+    user_id: int,
+    start: datetime,
+    duration_minutes: int,
+    exclude_id: Optional[int] = None,
+) -> List[InterviewModel]:
+    """Собеседования работодателя или студента, с которыми пересекается новое."""
+    end = start + timedelta(minutes=duration_minutes)
+    conflicts = busy_intervals(db, InterviewModel.employer_id, [employer_id], start, end, exclude_id)
+    seen = {row.id for row in conflicts}
+    conflicts.extend(
+        row for row in busy_intervals(db, InterviewModel.user_id, [user_id], start, end, exclude_id)
+        if row.id not in seen
+    )
+    return conflicts
+
+
+class Timeline:
+    """Отсортированные непересекающиеся занятые интервалы одного владельца."""
+
+    def __init__(self, intervals: Iterable[Interval] = ()):
+        self.starts: List[datetime] = []
+        self.ends: List[datetime] = []
+        for start, end in sorted(intervals):
+            self.add(start, end)
+
+    def add(self, start: datetime, end: datetime):
+        # Пересекающиеся и смежные интервалы сливаются в один
+        i = bisect.bisect_left(self.ends, start)
+        j = bisect.bisect_right(self.starts, end)
+        if i < j:
+            start = min(start, self.starts[i])
+            end = max(end, self.ends[j - 1])
+        self.starts[i:j] = [start]
+        self.ends[i:j] = [end]
+
+    def free_from(self, start: datetime, duration: timedelta) -> datetime:
+        """Самое раннее начало не раньше start, при котором интервал свободен."""
+        i = bisect.bisect_right(self.ends, start)
+        while i < len(self.starts) and self.starts[i] < start + duration:
+            start = max(start, self.ends[i])
+            i += 1
+        return start
+
+
+def _slots(
+    window_start: datetime,
+    window_end: datetime,
+    duration: timedelta,
+    day_start,
+    day_end,
+    weekdays_only: bool,
+):
+    """Сетка слотов длиной duration внутри рабочего времени окна."""
+    day = window_start.date()
+    while True:
+        opens = datetime.combine(day, day_start)
+        closes = datetime.combine(day, day_end)
+        if opens >= window_end:
+            return
+        if not (weekdays_only and day.weekday() >= 5):
+            slot = opens
+            while slot + duration <= closes and slot + duration <= window_end:
+                if slot >= window_start:
+                    yield slot
+                slot += duration
+        day += timedelta(days=1)
+
+
+def auto_schedule(
+    db: Session,
+    employer_id: int,
+    applications: Sequence,
+    window_start: datetime,
+    window_end: datetime,
+    duration_minutes: int,
+    day_start,
+    day_end,
+    weekdays_only: bool = True,
+) -> Tuple[Dict[int, datetime], List[int]]:
+    """Раскладывает заявки по свободным слотам окна, жадно в порядке заявок.
+
+    Занятость работодателя и всех студентов читается двумя запросами по
+    индексам, дальше подбор идет в памяти. Возвращает {id заявки: начало}
+    и id заявок, которым слот не нашелся.
+    """
+    duration = timedelta(minutes=duration_minutes)
+    employer_busy = Timeline(
+        (row.scheduled_at, interview_end(row))
+        for row in busy_intervals(db, InterviewModel.employer_id, [employer_id], window_start, window_end)
+    )
+    student_busy: Dict[int, Timeline] = {}
+    for row in busy_intervals(
+        db, InterviewModel.user_id, {application.user_id for application in applications}, window_start, window_end
+    ):
+        student_busy.setdefault(row.user_id, Timeline()).add(row.scheduled_at, interview_end(row))
+
+    slots = list(_slots(window_start, window_end, duration, day_start, day_end, weekdays_only))
+    placed: Dict[int, datetime] = {}
+    unplaced: List[int] = []
+    first_free = 0
+    for application in applications:
+        student = student_busy.setdefault(application.user_id, Timeline())
+        chosen = None
+        for index in range(first_free, len(slots)):
+            slot = slots[index]
+            if employer_busy.free_from(slot, duration) != slot:
+                if index == first_free:
+                    first_free += 1
+                continue
+            if student.free_from(slot, duration) == slot:
+                chosen = slot
+                break
+        if chosen is None:
+            unplaced.append(application.id)
+            continue
+        placed[application.id] = chosen
+        employer_busy.add(chosen, chosen + duration)
+        student.add(chosen, chosen + duration)
+    return placed, unplaced
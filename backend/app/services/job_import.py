@@ -0,0 +1,182 @@
+import csv
+import io
+import json
+import logging
+from typing import List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.tasks import current_task_key, enqueue, queue, task
+from app.database import SessionLocal
+from app.models.employer import Employer as EmployerModel
+from app.models.job import Job as JobModel
+from app.services import changes
+from app.schemas.job_schema import JobCreate
+
+logger = logging.getLogger(__name__)
+
+JOB_COLUMNS = list(JobCreate.model_fields)
+
+
+class ImportFormatError(ValueError):
+    pass
+
+
+def parse_rows(data: bytes, kind: str) -> List[dict]:
+    """Разбирает файл импорта: JSON-массив объектов или CSV с заголовком."""
+    try:
+        text = data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise ImportFormatError("Файл должен быть в кодировке UTF-8")
+    if kind == "json":
+        try:
+            rows = json.loads(text)
+        except ValueError as e:
+            raise ImportFormatError(f"Некорректный JSON: {e}")
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            raise ImportFormatError("Ожидается JSON-массив объектов")
+        return rows
+    reader = csv.DictReader(io.StringIO(text))
+    unknown = [name for name in reader.fieldnames or [] if name not in JOB_COLUMNS]
+    if unknown:
+        raise ImportFormatError(f"Неизвестные колонки CSV: {', '.join(unknown)}")
+    # В CSV нет null: пустая ячейка означает отсутствие значения
+    return [{key: (value if value != "" else None) for key, value in row.items()} for row in reader]
+
+
+def validate_rows(rows: List[dict], employer_id: int) -> Tuple[List[JobCreate], List[dict]]:
+    """Проверяет все строки сразу; возвращает годные вакансии и ошибки по номерам строк."""
+    valid, errors = [], []
+    for number, row in enumerate(rows, start=1):
+        data = {key: row.get(key) for key in JOB_COLUMNS}
+        if data["employer_id"] is None:
+            data["employer_id"] = employer_id
+        try:
+            job = JobCreate.model_validate(data)
+        except ValidationError as e:
+            errors.append({
+                "row": number,
+                "errors": [
+                    {
+                        "field": ".".join(str(loc) for loc in error["loc"]),
+                        "message": error["msg"],
+                        "type": error["type"],
+                    }
+                    for error in e.errors()
+                ],
+            })
+            continue
+        if job.employer_id != employer_id:
+            errors.append({
+                "row": number,
+                "errors": [{
+                    "field": "employer_id",
+                    "message": "Можно импортировать вакансии только своей компании",
+                    "type": "forbidden",
+                }],
+            })
+            continue
+        valid.append(job)
+    return valid, errors
+
+
+def job_values(job: JobCreate) -> dict:
+    return {
+        **job.model_dump(),
+        "remote": bool(job.remote),
+        "status": "open",
+        "accepted_count": 0,
+        # ORM начинает счетчик версий с 1, INSERT в обход ORM делает так же
+        "version": 1,
+    }
+
+
+def _read_back_ids(db: Session, first_id: int, batch: List[dict]) -> List[int]:
+    # Без RETURNING известен только id первой строки (lastrowid в MySQL).
+    # Считать остальные нельзя: при auto_increment_increment > 1 (Galera,
+    # групповая репликация) id идут не подряд, поэтому они читаются обратно
+    employer_ids = {row["employer_id"] for row in batch}
+    ids = db.execute(
+        select(JobModel.id)
+        .where(JobModel.employer_id.in_(employer_ids), JobModel.id >= first_id)
+        .order_by(JobModel.id)
+        .limit(len(batch))
+    ).scalars().all()
+    if len(ids) != len(batch):
+        raise RuntimeError(f"После вставки найдено {len(ids)} вакансий из {len(batch)}")
+    return ids
+
+
+def insert_jobs(db: Session, rows: List[dict], batch_size: int, progress=None) -> List[int]:
+    """Вставляет строки многострочными INSERT по batch_size в одной транзакции.
+
+    Фиксацию делает вызывающий код: импорт либо проходит целиком, либо нет.
+    id новых строк берутся из RETURNING, а где его нет (MySQL) — читаются
+    обратно по работодателю; строка работодателя на это время
+    блокируется, чтобы параллельный импорт той же компании не вставил свои
+    вакансии между нашими.
+    """
+    returning = db.get_bind().dialect.insert_returning
+    if not returning and rows:
+        employer_ids = sorted({row["employer_id"] for row in rows})
+        db.execute(select(EmployerModel.id).where(EmployerModel.id.in_(employer_ids)).with_for_update())
+    ids = []
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        if returning:
+            ids.extend(sorted(db.execute(insert(JobModel).values(batch).returning(JobModel.id)).scalars().all()))
+        else:
+            result = db.execute(insert(JobModel).values(batch))
+            ids.extend(_read_back_ids(db, result.lastrowid, batch))
+        if progress is not None:
+            progress(len(ids))
+    changes.record(db, "jobs", ids, "create")
+    return ids
+
+
+def after_import(ids: List[int]):
+    for job_id in ids:
+        enqueue("notifications.job_created", {"job_id": job_id}, key=f"job-created:{job_id}")
+
+
+def import_status(import_id: str) -> Optional[dict]:
+    record = queue.get(f"jobs-import:{import_id}")
+    if record is None:
+        return None
+    progress = record["result"] or {}
+    return {
+        "import_id": import_id,
+        "employer_id": record["payload"]["employer_id"],
+        "status": record["status"],
+        "total": len(record["payload"]["rows"]),
+        "inserted": progress.get("inserted", 0),
+        "ids": progress.get("ids"),
+        "attempts": record["attempts"],
+        "last_error": record["last_error"],
+    }
+
+
+@task("jobs.import")
+def run_import(payload: dict):
+    key = current_task_key()
+    rows = [job_values(JobCreate.model_validate(row)) for row in payload["rows"]]
+
+    def progress(inserted: int):
+        queue.set_result(key, {"inserted": inserted})
+
+    db = SessionLocal()
+    try:
+        ids = insert_jobs(db, rows, settings.JOB_IMPORT_BATCH_SIZE, progress)
+        db.commit()
+    except Exception:
+        db.rollback()
+        queue.set_result(key, {"inserted": 0})
+        raise
+    finally:
+        db.close()
+    after_import(ids)
+    logger.info(f"Импорт {key}: добавлено вакансий {len(ids)}")
+    return {"inserted": len(ids), "ids": ids}
@@ -0,0 +1,79 @@
+import logging
+from datetime import date
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.tasks import pool, task
+from app.database import SessionLocal
+from app.models.job import Job as JobModel
+from app.services import changes, entity_cache
+
+logger = logging.getLogger(__name__)
+
+
+def _close_batch(db: Session, job_ids) -> int:
+    result = db.execute(
+        update(JobModel)
+        .where(JobModel.id.in_(job_ids), JobModel.status == "open")
+        .values(status="closed", version=JobModel.version + 1)
+    )
+    changes.record(db, "jobs", job_ids)
+    entity_cache.invalidate_on_commit(db, "jobs", job_ids)
+    db.commit()
+    return result.rowcount
+
+
+def close_expired_jobs(db: Session, batch_size: int, today: date) -> int:
+    closed = 0
+    last_id = 0
+    while True:
+        job_ids = db.execute(
+            select(JobModel.id)
+            .where(JobModel.status == "open", JobModel.end_date < today, JobModel.id > last_id)
+            .order_by(JobModel.id)
+            .limit(batch_size)
+        ).scalars().all()
+        if not job_ids:
+            return closed
+        last_id = job_ids[-1]
+        closed += _close_batch(db, job_ids)
+
+
+def close_filled_jobs(db: Session, batch_size: int) -> int:
+    closed = 0
+    last_id = 0
+    while True:
+        job_ids = db.execute(
+            select(JobModel.id)
+            .where(
+                JobModel.status == "open",
+                JobModel.spots.isnot(None),
+                JobModel.accepted_count >= JobModel.spots,
+                JobModel.id > last_id,
+            )
+            .order_by(JobModel.id)
+            .limit(batch_size)
+        ).scalars().all()
+        if not job_ids:
+            return closed
+        last_id = job_ids[-1]
+        closed += _close_batch(db, job_ids)
+
+
+@task("jobs.sweep")
+def sweep_jobs(payload: dict):
+    batch_size = payload.get("batch_size", settings.JOB_SWEEP_BATCH_SIZE)
+    db = SessionLocal()
+    try:
+        expired = close_expired_jobs(db, batch_size, date.today())
+        filled = close_filled_jobs(db, batch_size)
+    finally:
+        db.close()
+    if expired or filled:
+        logger.info(f"Закрыто вакансий: {expired} с истекшим сроком, {filled} с заполненными местами")
+    return {"expired": expired, "filled": filled}
+
+
+pool.every(lambda: settings.JOB_SWEEP_INTERVAL, "jobs.sweep")
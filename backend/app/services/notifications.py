@@ -0,0 +1,72 @@
+import logging
+
+from app import repositories
+from app.core.tasks import task
+from app.database import SessionLocal
+from app.models.employer import Employer as EmployerModel
+from app.models.interview import Interview as InterviewModel
+
+logger = logging.getLogger(__name__)
+
+
+@task("notifications.job_created")
+def notify_job_created(payload: dict):
+    db = SessionLocal()
+    try:
+        job = repositories.job_by_id(db, payload["job_id"])
+        if not job:
+            return {"skipped": "job not found"}
+        logger.info(f"Уведомление: опубликована вакансия '{job.title}' (ID: {job.id})")
+        return {"job_id": job.id}
+    finally:
+        db.close()
+
+
+@task("notifications.application_status_changed")
+def notify_application_status_changed(payload: dict):
+    db = SessionLocal()
+    try:
+        student = repositories.user_by_id(db, payload["user_id"])
+        job = repositories.job_by_id(db, payload["job_id"])
+        if not student or not job:
+            return {"skipped": "student or job not found"}
+        logger.info(
+            f"Уведомление для {student.email}: статус заявки {payload['application_id']} "
+            f"на вакансию '{job.title}' изменен на '{payload['status']}'"
+        )
+        return {"recipient": student.email}
+    finally:
+        db.close()
+
+
+@task("notifications.review_created")
+def notify_review_created(payload: dict):
+    db = SessionLocal()
+    try:
+        employer = db.query(EmployerModel).filter(EmployerModel.id == payload["employer_id"]).first()
+        if not employer:
+            return {"skipped": "employer not found"}
+        logger.info(
+            f"Уведомление для {employer.contact_email}: новый отзыв "
+            f"(оценка {payload['rating']}) на вакансию {payload['job_id']}"
+        )
+        return {"recipient": employer.contact_email}
+    finally:
+        db.close()
+
+
+@task("notifications.interview_scheduled")
+def notify_interview_scheduled(payload: dict):
+    db = SessionLocal()
+    try:
+        interview = db.query(InterviewModel).filter(InterviewModel.id == payload["interview_id"]).first()
+        student = repositories.user_by_id(db, payload["user_id"])
+        if not interview or not student:
+            return {"skipped": "interview or student not found"}
+        logger.info(
+            f"Уведомление для {student.email}: собеседование по заявке {interview.application_id} "
+            f"назначено на {interview.scheduled_at:%Y-%m-%d %H:%M}"
+        )
+        return {"recipient": student.email}
+    finally:
+        db.close()
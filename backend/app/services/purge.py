@@ -0,0 +1,308 @@
+import logging
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional
+
+from sqlalchemy import column, delete, inspect, select, table, update
+from sqlalchemy.orm import Session
+
+from app.services import attachments as attachment_files, changes, entity_cache
+from app.core.config import settings
+from app.core.tasks import current_task_key, enqueue, pool, queue, task
+from app.database import SessionLocal
+from app.models.application import Application as ApplicationModel
+from app.models.employer import Employer as EmployerModel
+from app.models.job import Job as JobModel
+
+logger = logging.getLogger(__name__)
+
+RESUME_URL_PREFIX = "/applications/resume/"
+
+# Очистка работает с таблицами напрямую, в обход ORM: так она видит
+# помеченные строки и таблицы, у которых пока нет моделей
+departments = table("departments", column("id"), column("deleted_at"))
+employers = table("employers", column("id"), column("department_id"), column("deleted_at"))
+jobs = table("jobs", column("id"), column("employer_id"), column("deleted_at"))
+applications = table(
+    "applications", column("id"), column("job_id"), column("user_id"), column("resume_url"), column("resume_hash"),
+    column("deleted_at"),
+)
+reviews = table("reviews", column("id"), column("job_id"), column("employer_id"))
+employer_reviews = table(
+    "employer_reviews", column("id"), column("application_id"), column("job_id"), column("employer_id")
+)
+favorites = table("favorites", column("id"), column("job_id"))
+interviews = table("interviews", column("id"), column("application_id"))
+attachments = table("attachments", column("id"), column("job_id"), column("file_url"))
+attachment_uploads = table("attachment_uploads", column("id"), column("job_id"))
+resume_terms = table("resume_terms", column("id"), column("application_id"), column("employer_id"))
+resume_texts = table("resume_texts", column("file_hash"))
+
+ENTITIES = {
+    "departments": departments,
+    "employers": employers,
+    "jobs": jobs,
+    "applications": applications,
+}
+
+
+def soft_delete(db: Session, obj):
+    """Помечает строку удаленной и ставит фоновую очистку; коммит делает вызывающий код."""
+    now = datetime.now().replace(microsecond=0)
+    obj.deleted_at = now
+    if isinstance(obj, ApplicationModel) and obj.status == "accepted":
+        # Удаленная принятая заявка освобождает место на вакансии
+        db.execute(
+            update(JobModel)
+            .where(JobModel.id == obj.job_id, JobModel.accepted_count > 0)
+            .values(accepted_count=JobModel.accepted_count - 1, version=JobModel.version + 1)
+        )
+        changes.record(db, "jobs", [obj.job_id])
+    if isinstance(obj, EmployerModel):
+        # Вакансии удаленного работодателя скрываются сразу, их немного
+        job_ids = db.execute(select(JobModel.id).where(JobModel.employer_id == obj.id)).scalars().all()
+        db.execute(
+            update(JobModel)
+            .where(JobModel.id.in_(job_ids), JobModel.deleted_at.is_(None))
+            .values(deleted_at=now, version=JobModel.version + 1)
+        )
+        changes.record(db, "jobs", job_ids, "delete")
+        entity_cache.invalidate_on_commit(db, "jobs", job_ids)
+
+
+def release_deleted_application(db: Session, job_id: int, user_id: int) -> Optional[int]:
+    """Сразу удаляет мягко удаленную заявку, которая занимает уникальный
+    слот (job_id, user_id), чтобы студент мог подать заявку заново.
+
+    Коммит делает вызывающий код вместе со вставкой новой заявки. Файл
+    резюме и его извлеченный текст не трогаются: новая заявка часто
+    ссылается на тот же файл, а ставший ненужным файл уберет
+    purge_orphan_resumes. Запланированная очистка удаленной заявки затем
+    просто не найдет строку.
+    """
+    application_id = db.execute(
+        select(applications.c.id).where(
+            applications.c.job_id == job_id,
+            applications.c.user_id == user_id,
+            applications.c.deleted_at.isnot(None),
+        )
+    ).scalar()
+    if application_id is None:
+        return None
+    existing = set(inspect(db.get_bind()).get_table_names())
+    for tbl in (resume_terms, interviews, employer_reviews):
+        if tbl.name in existing:
+            db.execute(delete(tbl).where(tbl.c.application_id == application_id))
+    db.execute(delete(applications).where(applications.c.id == application_id))
+    return application_id
+
+
+def schedule_purge(entity: str, entity_id: int) -> Optional[str]:
+    return enqueue("purge.run", {"entity": entity, "id": entity_id}, key=f"purge:{entity}:{entity_id}")
+
+
+class Purger:
+    """Удаляет зависимые строки порциями по chunk_size, каждая в своей транзакции.
+
+    Между порциями делается пауза, чтобы не держать блокировки подряд и
+    давать дорогу обычным запросам. После каждой порции вызывается progress.
+    """
+
+    def __init__(self, db: Session, chunk_size: int, pause: float, progress: Optional[Callable[[Dict], None]] = None):
+        self.db = db
+        self.chunk_size = chunk_size
+        self.pause = pause
+        self.progress = progress
+        self.deleted: Dict[str, int] = {}
+        self.files_removed = 0
+        self._tables = set(inspect(db.get_bind()).get_table_names())
+
+    def _report(self, name: str, count: int):
+        self.deleted[name] = self.deleted.get(name, 0) + count
+        if self.progress is not None:
+            self.progress({"deleted": self.deleted, "files_removed": self.files_removed})
+
+    def delete_where(self, tbl, *where) -> int:
+        if tbl.name not in self._tables:
+            return 0
+        total = 0
+        while True:
+            ids = self.db.execute(select(tbl.c.id).where(*where).limit(self.chunk_size)).scalars().all()
+            if not ids:
+                return total
+            resumes, hashes, files = [], [], []
+            if tbl is applications:
+                rows = self.db.execute(
+                    select(tbl.c.resume_url, tbl.c.resume_hash).where(tbl.c.id.in_(ids), tbl.c.resume_url.isnot(None))
+                ).all()
+                resumes = [url for url, _ in rows]
+                hashes = [digest for _, digest in rows if digest]
+            elif tbl is attachments:
+                urls = self.db.execute(select(tbl.c.file_url).where(tbl.c.id.in_(ids))).scalars().all()
+                files = [attachment_files.stored_path(url) for url in urls]
+            elif tbl is attachment_uploads:
+                files = [attachment_files.partial_path(upload_id) for upload_id in ids]
+            self.db.execute(delete(tbl).where(tbl.c.id.in_(ids)))
+            self.db.commit()
+            total += len(ids)
+            self._report(tbl.name, len(ids))
+            self.remove_resumes(resumes)
+            self.remove_resume_texts(hashes)
+            attachment_files.remove_files(files)
+            if self.pause:
+                time.sleep(self.pause)
+
+    def update_where(self, tbl, values: dict, *where) -> int:
+        total = 0
+        while True:
+            ids = self.db.execute(select(tbl.c.id).where(*where).limit(self.chunk_size)).scalars().all()
+            if not ids:
+                return total
+            self.db.execute(update(tbl).where(tbl.c.id.in_(ids)).values(**values))
+            self.db.commit()
+            total += len(ids)
+            if self.pause:
+                time.sleep(self.pause)
+
+    def remove_resumes(self, urls: Iterable[str]):
+        """Удаляет файлы резюме, на которые больше не ссылается ни одна заявка."""
+        for url in set(urls):
+            if not url.startswith(RESUME_URL_PREFIX):
+                continue
+            still_used = self.db.execute(
+                select(applications.c.id).where(applications.c.resume_url == url).limit(1)
+            ).first()
+            if still_used:
+                continue
+            path = settings.UPLOAD_DIR / Path(url[len(RESUME_URL_PREFIX):]).name
+            try:
+                path.unlink()
+                self.files_removed += 1
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Не удалось удалить файл резюме {path}: {e}")
+
+    def remove_resume_texts(self, hashes: Iterable[str]):
+        """Удаляет извлеченный текст резюме, которого больше нет ни в одной заявке."""
+        if "resume_texts" not in self._tables:
+            return
+        unused = [
+            digest for digest in set(hashes)
+            if not self.db.execute(
+                select(applications.c.id).where(applications.c.resume_hash == digest).limit(1)
+            ).first()
+        ]
+        if unused:
+            self.db.execute(delete(resume_texts).where(resume_texts.c.file_hash.in_(unused)))
+            self.db.commit()
+            self._report("resume_texts", len(unused))
+
+    def purge_application(self, application_id: int):
+        self.delete_where(resume_terms, resume_terms.c.application_id == application_id)
+        self.delete_where(interviews, interviews.c.application_id == application_id)
+        self.delete_where(employer_reviews, employer_reviews.c.application_id == application_id)
+        self.delete_where(applications, applications.c.id == application_id)
+
+    def purge_job(self, job_id: int):
+        job_applications = select(applications.c.id).where(applications.c.job_id == job_id)
+        self.delete_where(interviews, interviews.c.application_id.in_(job_applications))
+        self.delete_where(resume_terms, resume_terms.c.application_id.in_(job_applications))
+        self.delete_where(employer_reviews, employer_reviews.c.job_id == job_id)
+        self.delete_where(reviews, reviews.c.job_id == job_id)
+        self.delete_where(favorites, favorites.c.job_id == job_id)
+        self.delete_where(attachments, attachments.c.job_id == job_id)
+        self.delete_where(attachment_uploads, attachment_uploads.c.job_id == job_id)
+        self.delete_where(applications, applications.c.job_id == job_id)
+        self.delete_where(jobs, jobs.c.id == job_id)
+
+    def purge_employer(self, employer_id: int):
+        job_ids = self.db.execute(select(jobs.c.id).where(jobs.c.employer_id == employer_id)).scalars().all()
+        for job_id in job_ids:
+            self.purge_job(job_id)
+        self.delete_where(reviews, reviews.c.employer_id == employer_id)
+        self.delete_where(employer_reviews, employer_reviews.c.employer_id == employer_id)
+        self.delete_where(employers, employers.c.id == employer_id)
+
+    def purge_department(self, department_id: int):
+        self.update_where(employers, {"department_id": None}, employers.c.department_id == department_id)
+        self.delete_where(departments, departments.c.id == department_id)
+
+
+PURGES = {
+    "departments": Purger.purge_department,
+    "employers": Purger.purge_employer,
+    "jobs": Purger.purge_job,
+    "applications": Purger.purge_application,
+}
+
+
+@task("purge.run")
+def run_purge(payload: dict):
+    entity, entity_id = payload["entity"], payload["id"]
+    tbl = ENTITIES[entity]
+    key = current_task_key()
+    db = SessionLocal()
+    try:
+        row = db.execute(select(tbl.c.deleted_at).where(tbl.c.id == entity_id)).first()
+        if row is None or row.deleted_at is None:
+            return {"skipped": "not soft-deleted"}
+        purger = Purger(
+            db,
+            settings.PURGE_CHUNK_SIZE,
+            settings.PURGE_PAUSE,
+            progress=lambda state: queue.set_result(key, state) if key else None,
+        )
+        PURGES[entity](purger, entity_id)
+    finally:
+        db.close()
+    logger.info(
+        f"Очистка {entity} {entity_id} завершена: удалено строк {purger.deleted}, файлов резюме {purger.files_removed}"
+    )
+    return {"deleted": purger.deleted, "files_removed": purger.files_removed}
+
+
+def purge_orphan_resumes(db: Session, grace_period: float) -> int:
+    """Удаляет файлы резюме, на которые не ссылается ни одна заявка.
+
+    Файлы моложе grace_period не трогаются: резюме загружается раньше,
+    чем создается заявка со ссылкой на него.
+    """
+    if not settings.UPLOAD_DIR.exists():
+        return 0
+    referenced = set()
+    result = db.execute(
+        select(applications.c.resume_url)
+        .where(applications.c.resume_url.like(f"{RESUME_URL_PREFIX}%"))
+        .execution_options(yield_per=settings.PURGE_CHUNK_SIZE)
+    )
+    for url in result.scalars():
+        referenced.add(url[len(RESUME_URL_PREFIX):])
+    cutoff = time.time() - grace_period
+    removed = 0
+    for path in settings.UPLOAD_DIR.iterdir():
+        if not path.is_file() or path.name in referenced:
+            continue
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except OSError as e:
+            logger.warning(f"Не удалось удалить файл резюме {path}: {e}")
+    return removed
+
+
+@task("uploads.purge_orphans")
+def run_orphan_purge(payload: dict):
+    db = SessionLocal()
+    try:
+        removed = purge_orphan_resumes(db, payload.get("grace_period", settings.ORPHAN_GRACE_PERIOD))
+    finally:
+        db.close()
+    if removed:
+        logger.info(f"Удалено файлов резюме без заявок: {removed}")
+    return {"removed": removed}
+
+
+pool.every(lambda: settings.ORPHAN_SWEEP_INTERVAL, "uploads.purge_orphans")
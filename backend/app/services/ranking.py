@@ -0,0 +1,112 @@
+import hashlib
+import math
+from collections import Counter
+from typing import Dict, List, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache, get_cache
+from app.core.config import settings
+from app.models.application import Application as ApplicationModel
+from app.models.job import Job as JobModel
+from app.models.resume import ResumeText
+from app.services.resume_index import tokenize
+
+# Слова названия вакансии весят больше слов описания
+TITLE_WEIGHT = 2
+
+
+def _vectors() -> TTLCache:
+    return get_cache("application_ranking", settings.RANKING_CACHE_SIZE, settings.RANKING_CACHE_TTL)
+
+
+def job_fingerprint(job: JobModel) -> str:
+    """Отпечаток текста вакансии: после правки названия или описания все
+    закэшированные для нее векторы заявок перестают совпадать по ключу."""
+    text = f"{job.title or ''}\n{job.description or ''}"
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def job_query(job: JobModel) -> Tuple[Tuple[str, ...], Tuple[int, ...]]:
+    """Термины вакансии и их веса (частота в тексте, название с весом TITLE_WEIGHT)."""
+    weights = Counter(tokenize(job.description))
+    for term in tokenize(job.title):
+        weights[term] += TITLE_WEIGHT
+    top = sorted(weights.most_common(settings.RANKING_MAX_QUERY_TERMS))
+    return tuple(term for term, _ in top), tuple(weight for _, weight in top)
+
+
+def document_vector(terms: Sequence[str], *texts) -> Tuple[int, Tuple[int, ...]]:
+    """Длина документа в терминах и частоты терминов вакансии в нем."""
+    tokens = [token for text in texts for token in tokenize(text)]
+    counts = Counter(tokens)
+    return len(tokens), tuple(counts.get(term, 0) for term in terms)
+
+
+def _load_vectors(db: Session, ids: List[int], terms: Sequence[str]) -> Dict[int, Tuple[int, Tuple[int, ...]]]:
+    rows = db.execute(
+        select(ApplicationModel.id, ApplicationModel.cover_letter, ResumeText.text)
+        .outerjoin(ResumeText, ResumeText.file_hash == ApplicationModel.resume_hash)
+        .where(ApplicationModel.id.in_(ids))
+    ).all()
+    return {application_id: document_vector(terms, cover_letter, text) for application_id, cover_letter, text in rows}
+
+
+def bm25(
+    vectors: Sequence[Tuple[int, Tuple[int, ...]]],
+    weights: Sequence[int],
+    k1: float,
+    b: float,
+) -> List[float]:
+    """BM25 всех документов за один проход по матрице частот документ × термин."""
+    n = len(vectors)
+    if not n or not weights:
+        return [0.0] * n
+    average = sum(length for length, _ in vectors) / n or 1.0
+    document_frequency = [sum(1 for _, tf in vectors if tf[j]) for j in range(len(weights))]
+    idf = [
+        weight * math.log(1 + (n - df + 0.5) / (df + 0.5))
+        for weight, df in zip(weights, document_frequency)
+    ]
+    columns = [j for j, df in enumerate(document_frequency) if df]
+    scores = []
+    for length, tf in vectors:
+        norm = k1 * (1 - b + b * length / average)
+        scores.append(sum((idf[j] * tf[j] * (k1 + 1) / (tf[j] + norm) for j in columns if tf[j]), 0.0))
+    return scores
+
+
+def rank_applications(db: Session, job: JobModel) -> Dict[int, float]:
+    """Оценки соответствия всех заявок вакансии ее названию и описанию.
+
+    Векторы заявок (сопроводительное письмо и текст резюме) кэшируются по
+    заявке, файлу резюме и отпечатку вакансии; idf и средняя длина
+    пересчитываются на каждый запрос, так что новая заявка не портит оценки
+    остальных.
+    """
+    terms, weights = job_query(job)
+    fingerprint = job_fingerprint(job)
+    rows = db.execute(
+        select(ApplicationModel.id, ApplicationModel.resume_hash).where(ApplicationModel.job_id == job.id)
+    ).all()
+    cache = _vectors()
+    vectors: Dict[int, Tuple[int, Tuple[int, ...]]] = {}
+    missing: Dict[int, tuple] = {}
+    for application_id, resume_hash in rows:
+        key = (application_id, resume_hash, fingerprint)
+        vector = cache.get(key)
+        if vector is None:
+            missing[application_id] = key
+        else:
+            vectors[application_id] = vector
+    ids = list(missing)
+    for start in range(0, len(ids), settings.RANKING_LOAD_BATCH_SIZE):
+        loaded = _load_vectors(db, ids[start:start + settings.RANKING_LOAD_BATCH_SIZE], terms)
+        for application_id, vector in loaded.items():
+            cache.set(missing[application_id], vector)
+        vectors.update(loaded)
+
+    application_ids = list(vectors)
+    scores = bm25([vectors[i] for i in application_ids], weights, settings.RANKING_BM25_K1, settings.RANKING_BM25_B)
+    return {application_id: round(score, 4) for application_id, score in zip(application_ids, scores)}
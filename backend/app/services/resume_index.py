@@ -0,0 +1,288 @@
+import logging
+import math
+import multiprocessing
+import re
+import time
+from collections import Counter
+from datetime import datetime
+from functools import partial
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.tasks import enqueue, pool, task
+from app.database import SessionLocal
+from app.models.application import Application as ApplicationModel
+from app.models.job import Job as JobModel
+from app.models.resume import ResumeText, ResumeTerm
+from app.services.text_extraction import extract_text, file_hash
+
+logger = logging.getLogger(__name__)
+
+RESUME_URL_PREFIX = "/applications/resume/"
+NO_FILE = ""
+
+_TOKEN = re.compile(r"[^\W_][\w+#.-]*[\w+#]|[^\W_]", re.UNICODE)
+STOPWORDS = frozenset("""
+    and are for from has have in is of on or the to with was were will you your at by an as be it this that
+    и в во на не что с со к ко по за из от до для о об а но или же ли бы как так то это этот мы вы он она они
+    его ее их мой моя мои наш ваш был была были быть есть у при без над под про через также
+""".split())
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Слова в нижнем регистре без стоп-слов; c++, c#, node.js остаются целыми."""
+    if not text:
+        return []
+    return [
+        token[:64] for token in _TOKEN.findall(text.lower())
+        if len(token) > 1 and token not in STOPWORDS and not token.isdigit()
+    ]
+
+
+def resume_path(resume_url: str):
+    if not resume_url or not resume_url.startswith(RESUME_URL_PREFIX):
+        return None
+    return settings.UPLOAD_DIR / resume_url[len(RESUME_URL_PREFIX):].rsplit("/", 1)[-1]
+
+
+def pending_applications(db: Session, limit: int, application_ids: Optional[Sequence[int]] = None):
+    stmt = (
+        select(ApplicationModel.id, ApplicationModel.resume_url, JobModel.employer_id)
+        .join(JobModel, JobModel.id == ApplicationModel.job_id)
+        .where(ApplicationModel.resume_url.isnot(None), ApplicationModel.resume_hash.is_(None))
+        .order_by(ApplicationModel.id)
+        .limit(limit)
+    )
+    if application_ids is not None:
+        stmt = stmt.where(ApplicationModel.id.in_(application_ids))
+    return db.execute(stmt).all()
+
+
+class ExtractionPool:
+    """Процессы для разбора резюме с пределом времени на файл.
+
+    Зависший разбор (например, патологический PDF) не прервать внутри
+    процесса, поэтому по таймауту пул убивается целиком и поднимается
+    заново: файл записывается как неудачный, недоразобранные остальные
+    отправляются в новый пул.
+    """
+
+    def __init__(self, processes: int, timeout: float):
+        self.processes = processes
+        self.timeout = timeout
+        self._workers = None
+
+    def _pool(self):
+        if self._workers is None:
+            # spawn: дочерние процессы не наследуют потоки и соединения с БД
+            self._workers = multiprocessing.get_context("spawn").Pool(self.processes)
+        return self._workers
+
+    def extract(self, func, paths: Sequence[str]) -> List[Tuple[Optional[str], Optional[str]]]:
+        """Результаты func (как у extract_text) в порядке paths."""
+        results = [None] * len(paths)
+        pending = list(range(len(paths)))
+        while pending:
+            workers = self._pool()
+            submitted = [(index, workers.apply_async(func, (paths[index],))) for index in pending]
+            pending = []
+            # Пока ждем файл, все предыдущие уже разобраны, так что он
+            # занимает процесс с начала ожидания или раньше
+            for position, (index, result) in enumerate(submitted):
+                try:
+                    results[index] = result.get(self.timeout)
+                except multiprocessing.TimeoutError:
+                    logger.warning(f"Разбор {paths[index]} дольше {self.timeout:g} с, пул процессов перезапускается")
+                    results[index] = (None, f"Разбор не уложился в {self.timeout:g} с")
+                    for other, rest in submitted[position + 1:]:
+                        if rest.ready():
+                            results[other] = rest.get()
+                        else:
+                            pending.append(other)
+                    self.terminate()
+                    break
+        return results
+
+    def terminate(self):
+        if self._workers is not None:
+            self._workers.terminate()
+            self._workers.join()
+            self._workers = None
+
+    def close(self):
+        if self._workers is not None:
+            self._workers.close()
+            self._workers.join()
+            self._workers = None
+
+
+def extract_missing(db: Session, paths_by_hash: Dict[str, str], extraction_pool: ExtractionPool) -> int:
+    """Извлекает текст файлов, которых еще нет в resume_texts; возвращает их число."""
+    known = set(db.execute(
+        select(ResumeText.file_hash).where(ResumeText.file_hash.in_(list(paths_by_hash)))
+    ).scalars())
+    missing = [(digest, path) for digest, path in paths_by_hash.items() if digest not in known]
+    if not missing:
+        return 0
+    extract = partial(
+        extract_text,
+        max_chars=settings.RESUME_TEXT_MAX_CHARS,
+        max_pages=settings.RESUME_MAX_PAGES,
+        timeout=settings.RESUME_EXTRACT_TIMEOUT,
+        max_xml_bytes=settings.RESUME_MAX_XML_BYTES,
+    )
+    results = extraction_pool.extract(extract, [path for _, path in missing])
+    now = datetime.now()
+    rows = []
+    for (digest, path), (text, error) in zip(missing, results):
+        rows.append({
+            "file_hash": digest,
+            "status": "ok" if error is None else "failed",
+            "text": text,
+            "error": error,
+            "size": len(text) if text else 0,
+            "extracted_at": now,
+        })
+    try:
+        db.execute(insert(ResumeText).values(rows))
+        db.commit()
+    except IntegrityError:
+        # Тот же файл параллельно извлек другой процесс: его результат не хуже
+        db.rollback()
+        for row in rows:
+            try:
+                db.execute(insert(ResumeText).values(row))
+                db.commit()
+            except IntegrityError:
+                db.rollback()
+    return len(rows)
+
+
+def index_application(db: Session, application_id: int, employer_id: int, text: Optional[str]):
+    """Пересобирает строки индекса заявки; повторный вызов дает тот же результат."""
+    db.execute(delete(ResumeTerm).where(ResumeTerm.application_id == application_id))
+    counts = Counter(tokenize(text)).most_common(settings.RESUME_INDEX_MAX_TERMS)
+    if counts:
+        db.execute(insert(ResumeTerm).values([
+            {"employer_id": employer_id, "application_id": application_id, "term": term, "tf": tf}
+            for term, tf in counts
+        ]))
+
+
+def process_batch(db: Session, extraction_pool: ExtractionPool, batch) -> Dict[str, int]:
+    hashes: Dict[int, str] = {}
+    paths_by_hash: Dict[str, str] = {}
+    for application_id, resume_url, _ in batch:
+        path = resume_path(resume_url)
+        if path is None or not path.is_file():
+            hashes[application_id] = NO_FILE
+            continue
+        digest = file_hash(path)
+        hashes[application_id] = digest
+        paths_by_hash.setdefault(digest, str(path))
+
+    extracted = extract_missing(db, paths_by_hash, extraction_pool)
+    texts = dict(db.execute(
+        select(ResumeText.file_hash, ResumeText.text).where(ResumeText.file_hash.in_(list(paths_by_hash)))
+    ).all())
+    for application_id, _, employer_id in batch:
+        digest = hashes[application_id]
+        index_application(db, application_id, employer_id, texts.get(digest))
+        db.execute(
+            update(ApplicationModel).where(ApplicationModel.id == application_id).values(resume_hash=digest)
+        )
+    db.commit()
+    return {"applications": len(batch), "files": extracted}
+
+
+def index_pending(db: Session, application_ids: Optional[Sequence[int]] = None, processes: Optional[int] = None) -> dict:
+    """Индексирует все заявки с резюме, которые еще не проиндексированы.
+
+    Текст извлекается в пуле процессов не больше RESUME_EXTRACT_PROCESSES,
+    не дольше RESUME_FILE_TIMEOUT на файл; файл с уже известным хешем
+    повторно не разбирается. Процессы поднимаются при первом файле.
+    """
+    started = time.perf_counter()
+    totals = {"applications": 0, "files": 0}
+    extraction_pool = ExtractionPool(processes or settings.RESUME_EXTRACT_PROCESSES, settings.RESUME_FILE_TIMEOUT)
+    try:
+        while True:
+            batch = pending_applications(db, settings.RESUME_EXTRACT_BATCH_SIZE, application_ids)
+            if not batch:
+                break
+            for key, value in process_batch(db, extraction_pool, batch).items():
+                totals[key] += value
+    finally:
+        extraction_pool.close()
+    elapsed = time.perf_counter() - started
+    totals["seconds"] = round(elapsed, 3)
+    totals["files_per_sec"] = round(totals["files"] / elapsed, 2) if totals["files"] and elapsed else 0.0
+    return totals
+
+
+def schedule_index():
+    """Ставит индексацию через RESUME_EXTRACT_DELAY; новые резюме за это время
+    попадут в тот же запуск, и пул процессов поднимется один раз."""
+    delay = settings.RESUME_EXTRACT_DELAY
+    bucket = int(time.time() // delay) if delay else time.time_ns()
+    enqueue("resumes.index", {}, key=f"resumes-index:{bucket}", delay=delay)
+
+
+@task("resumes.index")
+def run_index(payload: dict):
+    db = SessionLocal()
+    try:
+        result = index_pending(db, payload.get("application_ids"))
+    finally:
+        db.close()
+    if result["applications"]:
+        logger.info(
+            f"Индекс резюме: заявок {result['applications']}, извлечено файлов {result['files']} "
+            f"за {result['seconds']:.1f} с ({result['files_per_sec']} файлов/с)"
+        )
+    return result
+
+
+def search_applicants(db: Session, employer_id: int, job_id: int, query: str, limit: int) -> List[dict]:
+    """Заявки вакансии, отсортированные по tf-idf совпадению резюме с запросом.
+
+    idf считается по всем проиндексированным заявкам работодателя.
+    """
+    terms = sorted(set(tokenize(query)))
+    if not terms:
+        return []
+    total = db.execute(
+        select(func.count(func.distinct(ResumeTerm.application_id))).where(ResumeTerm.employer_id == employer_id)
+    ).scalar() or 0
+    document_frequency = dict(db.execute(
+        select(ResumeTerm.term, func.count())
+        .where(ResumeTerm.employer_id == employer_id, ResumeTerm.term.in_(terms))
+        .group_by(ResumeTerm.term)
+    ).all())
+    rows = db.execute(
+        select(ResumeTerm.application_id, ResumeTerm.term, ResumeTerm.tf)
+        .join(ApplicationModel, ApplicationModel.id == ResumeTerm.application_id)
+        .where(
+            ResumeTerm.employer_id == employer_id,
+            ResumeTerm.term.in_(terms),
+            ApplicationModel.job_id == job_id,
+        )
+    ).all()
+    scores: Dict[int, float] = {}
+    matched: Dict[int, List[str]] = {}
+    for application_id, term, tf in rows:
+        idf = math.log(1 + total / document_frequency[term])
+        scores[application_id] = scores.get(application_id, 0.0) + (1 + math.log(tf)) * idf
+        matched.setdefault(application_id, []).append(term)
+    ranked = sorted(scores, key=lambda application_id: (-scores[application_id], application_id))[:limit]
+    return [
+        {"application_id": application_id, "score": round(scores[application_id], 4), "matched_terms": sorted(matched[application_id])}
+        for application_id in ranked
+    ]
+
+
+pool.every(lambda: settings.RESUME_EXTRACT_INTERVAL, "resumes.index")
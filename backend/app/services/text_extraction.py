@@ -0,0 +1,84 @@
+"""Извлечение текста из файлов резюме (PDF, DOC, DOCX).
+
+Функции выполняются в дочерних процессах пула, поэтому модуль не
+импортирует ничего из приложения: ни настроек, ни БД.
+"""
+import hashlib
+import re
+import shutil
+import subprocess
+import zipfile
+from html import unescape
+from pathlib import Path
+from typing import Optional, Tuple
+
+try:
+    import pypdf
+except ImportError:
+    pypdf = None
+
+_XML_PARAGRAPH = re.compile(r"</w:p>|<w:br/>|<w:tab/>")
+_XML_TAG = re.compile(r"<[^>]+>")
+_SPACES = re.compile(r"[ \t\r\f\v]+")
+
+
+def file_hash(path: Path, block_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def extract_pdf(path: Path, max_pages: int) -> str:
+    if pypdf is None:
+        raise RuntimeError("pypdf не установлен")
+    reader = pypdf.PdfReader(str(path))
+    return "\n".join(page.extract_text() or "" for page in reader.pages[:max_pages])
+
+
+def extract_docx(path: Path, max_xml_bytes: int) -> str:
+    # DOCX — zip с XML; для текста хватает word/document.xml без python-docx.
+    # Читается не больше max_xml_bytes: размер в заголовке zip может врать,
+    # а zip-бомба иначе распаковалась бы в память целиком
+    with zipfile.ZipFile(path) as archive:
+        with archive.open("word/document.xml") as member:
+            data = member.read(max_xml_bytes + 1)
+    if len(data) > max_xml_bytes:
+        raise ValueError(f"word/document.xml больше {max_xml_bytes} байт")
+    xml = data.decode("utf-8", errors="replace")
+    return unescape(_XML_TAG.sub("", _XML_PARAGRAPH.sub("\n", xml)))
+
+
+def extract_doc(path: Path, timeout: float) -> str:
+    for tool in ("antiword", "catdoc"):
+        binary = shutil.which(tool)
+        if binary:
+            result = subprocess.run([binary, str(path)], capture_output=True, timeout=timeout, check=True)
+            return result.stdout.decode("utf-8", errors="replace")
+    raise RuntimeError("Для .doc нужен antiword или catdoc")
+
+
+def extract_text(
+    path: str,
+    max_chars: int = 200_000,
+    max_pages: int = 50,
+    timeout: float = 30.0,
+    max_xml_bytes: int = 20 * 1024 * 1024,
+) -> Tuple[Optional[str], Optional[str]]:
+    """Возвращает (текст, None) или (None, описание ошибки)."""
+    path = Path(path)
+    suffix = path.suffix.lower()
+    try:
+        if suffix == ".pdf":
+            text = extract_pdf(path, max_pages)
+        elif suffix == ".docx":
+            text = extract_docx(path, max_xml_bytes)
+        elif suffix == ".doc":
+            text = extract_doc(path, timeout)
+        else:
+            return None, f"Неподдерживаемый формат {suffix}"
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"[:500]
+    text = "\n".join(_SPACES.sub(" ", line).strip() for line in text.splitlines())
+    return re.sub(r"\n{3,}", "\n\n", text).strip()[:max_chars], None
@@ -0,0 +1,151 @@
+"""Нагрузочная проверка приема заявок и принятия кандидатов на популярную вакансию.
+
+N студентов одновременно подают заявки, затем работодатель одновременно
+пытается принять их всех. Проверяется, что принятых ровно spots, и
+выводится пропускная способность обеих фаз.
+
+Запуск из каталога backend:
+    python benchmarks/bench_application_intake.py --clients 1000 --spots 50
+    python benchmarks/bench_application_intake.py --database-url mysql+mysqlconnector://...
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi import HTTPException
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.core import tasks
+from app.database import Base
+import app.models
+from app.models.application import Application as ApplicationModel
+from app.models.employer import Employer as EmployerModel
+from app.models.job import Job as JobModel
+from app.models.user import User
+from app.routers.applications import create_application, update_application_status
+from app.schemas.application_schema import ApplicationCreate
+
+
+def seed(Session, clients, spots):
+    db = Session()
+    employer_user = User(name="Employer", email="employer@bench.local", password_hash="-", role="employer")
+    db.add(employer_user)
+    db.flush()
+    employer = EmployerModel(user_id=employer_user.id, name="Employer", contact_email="employer@bench.local")
+    db.add(employer)
+    db.flush()
+    job = JobModel(employer_id=employer.id, title="Popular internship", description="-", spots=spots, status="open")
+    db.add(job)
+    students = [
+        User(name=f"Student {i}", email=f"student{i}@bench.local", password_hash="-", role="student")
+        for i in range(clients)
+    ]
+    db.add_all(students)
+    db.commit()
+    result = (
+        SimpleNamespace(id=employer_user.id, role="employer"),
+        job.id,
+        [SimpleNamespace(id=s.id, role="student") for s in students],
+    )
+    db.close()
+    return result
+
+
+def run_phase(clients, func, items):
+    ok = conflicts = errors = 0
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        for outcome in executor.map(func, items):
+            if outcome == "ok":
+                ok += 1
+            elif outcome == "conflict":
+                conflicts += 1
+            else:
+                errors += 1
+    elapsed = time.perf_counter() - started
+    return ok, conflicts, errors, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database-url")
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--spots", type=int, default=50)
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="bench-intake-"))
+    tasks.queue.path = workdir / "tasks.sqlite3"
+    url = args.database_url or f"sqlite:///{workdir / 'bench.db'}"
+    connect_args = {"check_same_thread": False, "timeout": 60} if url.startswith("sqlite") else {}
+    engine = create_engine(url, pool_size=min(args.clients, 64), max_overflow=0, pool_timeout=120, connect_args=connect_args)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+    employer, job_id, students = seed(Session, args.clients, args.spots)
+
+    def apply(student):
+        db = Session()
+        try:
+            create_application(ApplicationCreate(job_id=job_id), current_user=student, db=db)
+            return "ok"
+        except HTTPException:
+            return "conflict"
+        except Exception:
+            return "error"
+        finally:
+            db.close()
+
+    def accept(app_id):
+        db = Session()
+        try:
+            update_application_status(app_id, new_status="accepted", current_user=employer, db=db)
+            return "ok"
+        except HTTPException as e:
+            return "conflict" if e.status_code == 409 else "error"
+        except Exception:
+            return "error"
+        finally:
+            db.close()
+
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w")
+    try:
+        applied = run_phase(args.clients, apply, students)
+        db = Session()
+        app_ids = db.execute(select(ApplicationModel.id).where(ApplicationModel.job_id == job_id)).scalars().all()
+        db.close()
+        accepted = run_phase(args.clients, accept, app_ids)
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+    db = Session()
+    accepted_rows = db.execute(
+        select(func.count()).where(ApplicationModel.job_id == job_id, ApplicationModel.status == "accepted")
+    ).scalar()
+    counter = db.execute(select(JobModel.accepted_count).where(JobModel.id == job_id)).scalar()
+    db.close()
+
+    print(f"База: {engine.url.render_as_string(hide_password=True)}, клиентов: {args.clients}, мест: {args.spots}")
+    for name, (ok, conflicts, errors, elapsed) in (("Подача заявок", applied), ("Принятие", accepted)):
+        total = ok + conflicts + errors
+        print(
+            f"{name}: успешно {ok}, отказов {conflicts}, ошибок {errors}, "
+            f"{elapsed:.2f} с, {total / elapsed:.0f} запросов/с"
+        )
+    correct = accepted_rows == counter == min(args.spots, args.clients)
+    print(f"Принято заявок: {accepted_rows}, счетчик вакансии: {counter} -> {'OK' if correct else 'НАРУШЕНИЕ'}")
+    sys.exit(0 if correct else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""Накладные расходы журнала изменений на запись.
+
+Одни и те же операции записи (создание и изменение вакансии, смена статуса
+заявки, импорт пачки вакансий) выполняются с журналом и без него, и для
+каждой выводится время на операцию и прирост в процентах.
+
+Запуск из каталога backend:
+    python benchmarks/bench_change_log.py --ops 500 --import-rows 5000
+    python benchmarks/bench_change_log.py --database-url mysql+mysqlconnector://...
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine, event, func, select
+
+from app import database
+from app.core import tasks
+from app.database import Base, RoutingSession, SessionLocal
+import app.models
+from app.models.application import Application as ApplicationModel
+from app.models.change import Change
+from app.models.employer import Employer as EmployerModel
+from app.models.user import User
+from app.routers.applications import update_application_status
+from app.routers.jobs import create_job, update_job
+from app.schemas.job_schema import JobCreate
+from app.services import changes, job_import
+
+LISTENERS = [
+    ("after_flush", changes._collect_orm_changes),
+    ("before_commit", changes._write_changes),
+    ("after_rollback", changes._discard_changes),
+]
+
+
+def set_change_log(enabled: bool):
+    for name, listener in LISTENERS:
+        if enabled and not event.contains(RoutingSession, name, listener):
+            event.listen(RoutingSession, name, listener)
+        elif not enabled and event.contains(RoutingSession, name, listener):
+            event.remove(RoutingSession, name, listener)
+
+
+def seed(ops):
+    db = SessionLocal()
+    employer_user = User(name="Employer", email="employer@bench.local", password_hash="-", role="employer")
+    db.add(employer_user)
+    db.flush()
+    employer = EmployerModel(user_id=employer_user.id, name="Employer", contact_email="employer@bench.local")
+    db.add(employer)
+    db.flush()
+    students = [
+        User(name=f"Student {i}", email=f"student{i}@bench.local", password_hash="-", role="student")
+        for i in range(ops)
+    ]
+    db.add_all(students)
+    db.commit()
+    result = SimpleNamespace(id=employer_user.id, role="employer"), employer.id, [s.id for s in students]
+    db.close()
+    return result
+
+
+def job_payload(employer_id, i):
+    return JobCreate(
+        employer_id=employer_id, title=f"Job {i}", description="-", location=None,
+        employment_type=None, start_date=None, end_date=None, spots=None,
+    )
+
+
+def timed(func, items):
+    started = time.perf_counter()
+    for item in items:
+        db = SessionLocal()
+        try:
+            func(db, item)
+        finally:
+            db.close()
+    return time.perf_counter() - started
+
+
+def run_round(employer_user, employer_id, students, ops, import_rows, tag):
+    created = []
+
+    def create(db, i):
+        created.append(create_job(job_payload(employer_id, f"{tag}-{i}"), db=db, current_user=employer_user).id)
+
+    def update(db, i):
+        update_job(created[i], job_payload(employer_id, f"{tag}-{i}-updated"), db=db)
+
+    application_ids = []
+
+    def change_status(db, i):
+        update_application_status(application_ids[i], new_status="reviewed", current_user=employer_user, db=db)
+
+    results = {}
+    results["Создание вакансии"] = timed(create, range(ops)) / ops
+    results["Изменение вакансии"] = timed(update, range(ops)) / ops
+
+    db = SessionLocal()
+    applications = [ApplicationModel(job_id=created[0], user_id=student_id) for student_id in students]
+    db.add_all(applications)
+    db.commit()
+    application_ids.extend(a.id for a in applications)
+    db.close()
+    results["Смена статуса заявки"] = timed(change_status, range(ops)) / ops
+
+    rows = [job_import.job_values(job_payload(employer_id, f"{tag}-import-{i}")) for i in range(import_rows)]
+
+    def bulk(db, _):
+        job_import.insert_jobs(db, rows, 500)
+        db.commit()
+
+    results[f"Импорт {import_rows} вакансий"] = timed(bulk, [None])
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database-url")
+    parser.add_argument("--ops", type=int, default=500)
+    parser.add_argument("--import-rows", type=int, default=5000)
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="bench-changes-"))
+    tasks.queue.path = workdir / "tasks.sqlite3"
+    url = args.database_url or f"sqlite:///{workdir / 'bench.db'}"
+    database.engine = create_engine(url)
+    Base.metadata.drop_all(database.engine)
+    Base.metadata.create_all(database.engine)
+
+    employer_user, employer_id, students = seed(args.ops)
+
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w")
+    try:
+        set_change_log(False)
+        without = run_round(employer_user, employer_id, students, args.ops, args.import_rows, "off")
+        db = SessionLocal()
+        db.query(ApplicationModel).delete()
+        db.commit()
+        db.close()
+        set_change_log(True)
+        with_log = run_round(employer_user, employer_id, students, args.ops, args.import_rows, "on")
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+    db = SessionLocal()
+    logged = db.execute(select(func.count()).select_from(Change)).scalar()
+    db.close()
+
+    print(f"База: {database.engine.url.render_as_string(hide_password=True)}, операций: {args.ops}")
+    for name in without:
+        off, on = without[name], with_log[name]
+        print(f"{name}: без журнала {off * 1000:.2f} мс, с журналом {on * 1000:.2f} мс, {(on / off - 1) * 100:+.1f}%")
+    print(f"Записей в журнале: {logged}")
+
+
+if __name__ == "__main__":
+    main()
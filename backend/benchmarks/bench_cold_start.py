@@ -0,0 +1,108 @@
+"""Время холодного старта: импорт app.main и запуск до первого ответа.
+
+Импорт замеряется в отдельных свежих процессах, медиана по --repeat
+запускам; по -X importtime выводятся самые дорогие модули. Заодно
+проверяется, что импорт не подключает драйвер БД и не создает файлов.
+Запуск до первого ответа — время от старта serve.py до 200 на GET /.
+
+Запуск из каталога backend:
+    python benchmarks/bench_cold_start.py --repeat 5
+    python benchmarks/bench_cold_start.py --no-serve
+"""
+import argparse
+import http.client
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parent.parent
+
+IMPORT = """
+import sys, time
+started = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - started
+from app import database
+print(elapsed, "engine" in vars(database), "mysql.connector" in sys.modules)
+"""
+
+WATCHED = [BACKEND / "app" / "debug.log", BACKEND / "uploads", BACKEND / "data"]
+
+
+def snapshot():
+    return {path: path.exists() and path.stat().st_mtime for path in WATCHED}
+
+
+def import_time(repeat: int):
+    before = snapshot()
+    runs = []
+    flags = None
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", IMPORT], cwd=BACKEND, capture_output=True, text=True, check=True
+        ).stdout.split()
+        runs.append(float(output[0]))
+        flags = output[1:]
+    touched = [str(path.relative_to(BACKEND)) for path, state in snapshot().items() if state != before[path]]
+    return statistics.median(runs), flags, touched
+
+
+def slowest_modules(count: int):
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND, capture_output=True, text=True, check=True,
+    ).stderr
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name.startswith(" " * 3) or name.strip().startswith("app."):
+            modules.append((int(cumulative), name.strip()))
+    return sorted(modules, reverse=True)[:count]
+
+
+def time_to_first_response(port: int, timeout: float = 60.0) -> float:
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "serve.py", "--workers", "1", "--port", str(port)],
+        cwd=BACKEND, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+                conn.request("GET", "/")
+                if conn.getresponse().status == 200:
+                    return time.perf_counter() - started
+            except OSError:
+                time.sleep(0.02)
+        raise RuntimeError(f"Сервер не ответил за {timeout:.0f} с")
+    finally:
+        server.terminate()
+        server.wait(30)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--serve", action=argparse.BooleanOptionalAction, default=True)
+    args = parser.parse_args()
+
+    median, (engine_created, driver_loaded), touched = import_time(args.repeat)
+    print(f"Импорт app.main: {median * 1000:.0f} мс (медиана по {args.repeat})")
+    print(f"  движок БД создан: {engine_created}, драйвер загружен: {driver_loaded}")
+    print(f"  изменены файлы: {', '.join(touched) if touched else 'нет'}")
+    print("Самые дорогие модули (с учетом вложенных):")
+    for cumulative, name in slowest_modules(args.top):
+        print(f"  {cumulative / 1000:>8.1f} мс  {name}")
+    if args.serve:
+        print(f"serve.py до первого ответа: {time_to_first_response(args.port) * 1000:.0f} мс")
+
+
+if __name__ == "__main__":
+    main()
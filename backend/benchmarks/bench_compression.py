@@ -0,0 +1,78 @@
+"""Соотношение CPU и трафика для gzip, brotli и zstd на разных уровнях.
+
+Тело ответа — список вакансий с полными описаниями, как в GET /jobs/.
+Для каждого кодека и уровня выводится время сжатия, скорость, степень
+сжатия и оценка времени передачи на заданной пропускной способности.
+
+Запуск из каталога backend:
+    python benchmarks/bench_compression.py --jobs 2000 --mbit 20
+"""
+import argparse
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core.compression import available_encodings, compress
+from app.core.serialization import dumps
+
+LEVELS = {
+    "gzip": [1, 4, 6, 9],
+    "br": [1, 4, 6, 9, 11],
+    "zstd": [1, 3, 6, 12, 19],
+}
+
+
+def payload(jobs: int) -> bytes:
+    today = date.today()
+    return dumps([
+        {
+            "id": i,
+            "employer_id": i % 40,
+            "title": f"Ассистент кафедры {i % 97}",
+            "description": (
+                f"Помощь в проведении лабораторных работ по курсу {i % 13}. "
+                "Требуется аккуратность, знание Python и базовой статистики. "
+            ) * 4,
+            "location": "Главный корпус",
+            "employment_type": "part-time",
+            "remote": i % 3 == 0,
+            "start_date": today,
+            "end_date": today + timedelta(days=30 + i % 60),
+            "spots": 1 + i % 5,
+            "status": "open",
+        }
+        for i in range(jobs)
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", type=int, default=2000)
+    parser.add_argument("--mbit", type=float, default=20.0, help="Пропускная способность канала клиента")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    body = payload(args.jobs)
+    bytes_per_second = args.mbit * 1_000_000 / 8
+    print(f"Тело: {len(body) / 1024:.0f} KB, канал {args.mbit:g} Мбит/с, без сжатия передача {len(body) / bytes_per_second * 1000:.1f} мс")
+    print(f"{'кодек':<6}{'уровень':>8}{'сжатие, мс':>12}{'МБ/с':>9}{'размер, KB':>12}{'коэфф.':>9}{'итого, мс':>11}")
+    for encoding in available_encodings():
+        for level in LEVELS[encoding]:
+            best = None
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                compressed = compress(encoding, body, level)
+                elapsed = time.perf_counter() - started
+                best = elapsed if best is None else min(best, elapsed)
+            transfer = len(compressed) / bytes_per_second
+            print(
+                f"{encoding:<6}{level:>8}{best * 1000:>12.2f}{len(body) / best / 1_000_000:>9.0f}"
+                f"{len(compressed) / 1024:>12.0f}{len(body) / len(compressed):>9.1f}{(best + transfer) * 1000:>11.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""Проверка пересечений собеседований и автоподбор слотов на большом календаре.
+
+У работодателя заводится --interviews собеседований с разными студентами.
+Затем сравнивается проверка пересечений по индексу (окно по scheduled_at) с
+полным просмотром календаря работодателя, и измеряется время автоподбора
+слотов для --applicants новых заявок.
+
+Запуск из каталога backend:
+    python benchmarks/bench_interviews.py --interviews 5000 --checks 2000 --applicants 300
+    python benchmarks/bench_interviews.py --database-url mysql+mysqlconnector://...
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, time as day_time, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine, insert, select
+
+from app import database
+from app.core import tasks
+from app.database import Base, SessionLocal
+import app.models
+from app.models.application import Application as ApplicationModel
+from app.models.employer import Employer as EmployerModel
+from app.models.interview import Interview as InterviewModel
+from app.models.job import Job as JobModel
+from app.models.user import User
+from app.services import interviews
+
+START = datetime(2026, 1, 5, 9, 0)
+
+
+def seed(interview_count, applicants, duration):
+    db = SessionLocal()
+    employer_user = User(name="Employer", email="employer@bench.local", password_hash="-", role="employer")
+    db.add(employer_user)
+    db.flush()
+    employer = EmployerModel(user_id=employer_user.id, name="Employer", contact_email="employer@bench.local")
+    db.add(employer)
+    db.flush()
+    job = JobModel(employer_id=employer.id, title="Job", description="-", status="open")
+    db.add(job)
+    db.commit()
+
+    students = interview_count + applicants
+    db.execute(insert(User).values([
+        {"name": f"Student {i}", "email": f"student{i}@bench.local", "password_hash": "-", "role": "student"}
+        for i in range(students)
+    ]))
+    user_ids = db.execute(select(User.id).where(User.role == "student").order_by(User.id)).scalars().all()
+    db.execute(insert(ApplicationModel).values([
+        {"job_id": job.id, "user_id": user_id, "status": "submitted"} for user_id in user_ids
+    ]))
+    applications = db.execute(select(ApplicationModel).order_by(ApplicationModel.id)).scalars().all()
+
+    # Календарь: по 8 собеседований в день, с зазорами
+    rows = []
+    for i, application in enumerate(applications[:interview_count]):
+        day, slot = divmod(i, 8)
+        rows.append({
+            "application_id": application.id,
+            "employer_id": employer.id,
+            "user_id": application.user_id,
+            "scheduled_at": START + timedelta(days=day, minutes=slot * duration * 2),
+            "duration_minutes": duration,
+        })
+    for start in range(0, len(rows), 1000):
+        db.execute(insert(InterviewModel).values(rows[start:start + 1000]))
+    db.commit()
+    result = employer.id, [(a.id, a.user_id) for a in applications[interview_count:]], interview_count // 8 + 1
+    db.close()
+    return result
+
+
+def naive_conflicts(db, employer_id, user_id, start, duration):
+    end = start + timedelta(minutes=duration)
+    rows = db.execute(
+        select(InterviewModel).where(
+            (InterviewModel.employer_id == employer_id) | (InterviewModel.user_id == user_id)
+        )
+    ).scalars().all()
+    return [row for row in rows if row.scheduled_at < end and interviews.interview_end(row) > start]
+
+
+def run_checks(func, employer_id, probes, duration):
+    db = SessionLocal()
+    found = 0
+    started = time.perf_counter()
+    for user_id, start in probes:
+        found += bool(func(db, employer_id, user_id, start, duration))
+        db.expunge_all()
+    elapsed = time.perf_counter() - started
+    db.close()
+    return found, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database-url")
+    parser.add_argument("--interviews", type=int, default=5000)
+    parser.add_argument("--checks", type=int, default=2000)
+    parser.add_argument("--applicants", type=int, default=300)
+    parser.add_argument("--duration", type=int, default=30)
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="bench-interviews-"))
+    tasks.queue.path = workdir / "tasks.sqlite3"
+    url = args.database_url or f"sqlite:///{workdir / 'bench.db'}"
+    database.engine = create_engine(url)
+    Base.metadata.drop_all(database.engine)
+    Base.metadata.create_all(database.engine)
+
+    employer_id, applicants, days = seed(args.interviews, args.applicants, args.duration)
+    rng = random.Random(1)
+    probes = [
+        (rng.choice(applicants)[1], START + timedelta(days=rng.randrange(days), minutes=rng.randrange(0, 480, 15)))
+        for _ in range(args.checks)
+    ]
+
+    indexed = run_checks(interviews.find_conflicts, employer_id, probes, args.duration)
+    naive = run_checks(naive_conflicts, employer_id, probes, args.duration)
+
+    db = SessionLocal()
+    pending = db.execute(
+        select(ApplicationModel).where(ApplicationModel.id.in_([a for a, _ in applicants]))
+    ).scalars().all()
+    started = time.perf_counter()
+    placed, unplaced = interviews.auto_schedule(
+        db, employer_id, pending, START, START + timedelta(days=days + 60),
+        args.duration, day_time(9, 0), day_time(18, 0), weekdays_only=True,
+    )
+    scheduling = time.perf_counter() - started
+    db.close()
+
+    print(f"База: {database.engine.url.render_as_string(hide_password=True)}, собеседований у работодателя: {args.interviews}")
+    for name, (found, elapsed) in (("По индексу", indexed), ("Полный просмотр", naive)):
+        print(
+            f"{name}: {args.checks} проверок за {elapsed:.2f} с, "
+            f"{args.checks / elapsed:.0f} проверок/с, с пересечениями {found}"
+        )
+    if indexed[0] != naive[0]:
+        print("НАРУШЕНИЕ: результаты проверок различаются")
+        sys.exit(1)
+    print(
+        f"Автоподбор: {len(placed)} назначено, {len(unplaced)} без слота "
+        f"за {scheduling * 1000:.0f} мс ({len(pending)} заявок)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Цена одной выборки по ключу: db.query(...).filter(...) против app.repositories.
+
+Для каждой из четырех самых частых выборок (пользователь по id,
+работодатель по user_id, вакансия и заявка по id) выводится время вызова в
+микросекундах и экономия. Замер идет на SQLite в памяти, чтобы на
+результат почти не влиял обмен с сервером БД: разница — это время CPU на
+построение выражения и загрузку объекта.
+
+Запуск из каталога backend:
+    python benchmarks/bench_lookups.py --calls 20000
+    python benchmarks/bench_lookups.py --database-url mysql+mysqldb://...
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app import database, repositories
+from app.core import tasks
+from app.database import Base, SessionLocal, build_engine
+import app.models
+from app.models.application import Application as ApplicationModel
+from app.models.employer import Employer as EmployerModel
+from app.models.job import Job as JobModel
+from app.models.user import User
+
+
+def seed():
+    db = SessionLocal()
+    employer_user = User(name="Employer", email="employer@bench.local", password_hash="-", role="employer")
+    student = User(name="Student", email="student@bench.local", password_hash="-", role="student")
+    db.add_all([employer_user, student])
+    db.flush()
+    employer = EmployerModel(user_id=employer_user.id, name="Employer", contact_email="employer@bench.local")
+    db.add(employer)
+    db.flush()
+    job = JobModel(employer_id=employer.id, title="Job", description="-", status="open")
+    db.add(job)
+    db.flush()
+    application = ApplicationModel(job_id=job.id, user_id=student.id, status="submitted")
+    db.add(application)
+    db.commit()
+    ids = employer_user.id, job.id, application.id
+    db.close()
+    return ids
+
+
+def measure(db, func, calls: int) -> float:
+    func()
+    db.expunge_all()
+    started = time.process_time()
+    for _ in range(calls):
+        func()
+        # Как в новом запросе: объекта нет в identity map
+        db.expunge_all()
+    return (time.process_time() - started) / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database-url")
+    parser.add_argument("--calls", type=int, default=20000)
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="bench-lookups-"))
+    tasks.queue.path = workdir / "tasks.sqlite3"
+    database.engine = build_engine(args.database_url or "sqlite://")
+    Base.metadata.drop_all(database.engine)
+    Base.metadata.create_all(database.engine)
+    user_id, job_id, application_id = seed()
+
+    db = SessionLocal()
+    cases = [
+        (
+            "пользователь по id",
+            lambda: db.query(User).filter(User.id == user_id).first(),
+            lambda: repositories.user_by_id(db, user_id),
+        ),
+        (
+            "работодатель по user_id",
+            lambda: db.query(EmployerModel).filter(EmployerModel.user_id == user_id).first(),
+            lambda: repositories.employer_by_user_id(db, user_id),
+        ),
+        (
+            "вакансия по id",
+            lambda: db.query(JobModel).filter(JobModel.id == job_id).first(),
+            lambda: repositories.job_by_id(db, job_id),
+        ),
+        (
+            "заявка по id",
+            lambda: db.query(ApplicationModel).filter(ApplicationModel.id == application_id).first(),
+            lambda: repositories.application_by_id(db, application_id),
+        ),
+    ]
+    print(f"База: {database.engine.url.render_as_string(hide_password=True)}, вызовов: {args.calls}")
+    for name, query, repository in cases:
+        if query() is None or repository() is None:
+            print(f"НАРУШЕНИЕ: {name} не найден")
+            sys.exit(1)
+        before = measure(db, query, args.calls)
+        after = measure(db, repository, args.calls)
+        print(
+            f"{name}: db.query {before:.1f} мкс, repositories {after:.1f} мкс, "
+            f"экономия {before - after:.1f} мкс ({(before - after) / before * 100:.0f}%)"
+        )
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Проверка маршрутизации чтения между основной БД и репликами.
+
+Основная БД и реплика — два файла SQLite с одинаковой схемой, третья
+«реплика» указывает на несуществующий каталог и изображает упавший сервер.
+Скрипт показывает, куда уходят анонимные чтения, что автор записи читает
+из основной БД в течение окна DB_STICKY_SECONDS, и что при недоступности
+всех реплик чтение возвращается в основную БД. В конце выводится
+стоимость выбора соединения в get_bind.
+
+Запуск из каталога backend:
+    python benchmarks/bench_replica_routing.py --sticky 0.5
+"""
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine, event
+
+import app.database as database
+import app.models
+from app.models.job import Job as JobModel
+
+
+def seed(url):
+    engine = create_engine(url)
+    database.Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(JobModel.__table__.insert(), [
+            {"employer_id": 1, "title": f"Вакансия {i}", "description": "", "location": "",
+             "employment_type": "part-time", "start_date": date.today(), "spots": 1, "status": "open"}
+            for i in range(100)
+        ])
+    engine.dispose()
+
+
+def track(engine, name, counter):
+    event.listen(engine, "before_cursor_execute", lambda *args: counter.update([name]))
+
+
+def reads(key, count, counter, read_only=True):
+    counter.clear()
+    for _ in range(count):
+        db = database.SessionLocal()
+        db.info["sticky_key"] = key
+        db.info["read_only"] = read_only
+        db.query(JobModel).filter(JobModel.id == 1).first()
+        db.close()
+    return dict(counter)
+
+
+def write(key):
+    db = database.SessionLocal()
+    db.info["sticky_key"] = key
+    job = db.get(JobModel, 1)
+    job.title = "Обновленная вакансия"
+    db.commit()
+    db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--reads", type=int, default=200)
+    parser.add_argument("--sticky", type=float, default=0.5, help="Окно read-your-writes, секунды")
+    args = parser.parse_args()
+
+    tmp = Path(tempfile.mkdtemp())
+    primary_url = f"sqlite:///{tmp / 'primary.db'}"
+    replica_url = f"sqlite:///{tmp / 'replica.db'}"
+    broken_url = f"sqlite:///{tmp / 'missing' / 'replica.db'}"
+    seed(primary_url)
+    shutil.copy(tmp / "primary.db", tmp / "replica.db")
+
+    counter = Counter()
+    database.engine = create_engine(primary_url)
+    database.replicas = database.ReplicaSet([replica_url, broken_url], max_lag=5.0, check_interval=60.0)
+    database.sticky_writes = database.StickyWrites(tmp / "sticky.sqlite3", args.sticky)
+    track(database.engine, "primary", counter)
+    track(database.replicas.replicas[0].engine, "replica", counter)
+    track(database.replicas.replicas[1].engine, "broken", counter)
+
+    database.replicas.check()
+    print("Состояние реплик:", [r.healthy for r in database.replicas.replicas])
+    print("Анонимное чтение:          ", reads("guest", args.reads, counter))
+    print("Обработчик с записью:      ", reads("guest", args.reads, counter, read_only=False))
+
+    write("author")
+    print("Автор сразу после записи:  ", reads("author", args.reads, counter))
+    print("Другой клиент в это время: ", reads("guest", args.reads, counter))
+    time.sleep(args.sticky)
+    print("Автор после окна:          ", reads("author", args.reads, counter))
+
+    database.replicas.replicas[0].healthy = False
+    print("Все реплики недоступны:    ", reads("guest", args.reads, counter))
+    database.replicas.check()
+    print("После повторной проверки:  ", reads("guest", args.reads, counter))
+
+    session = database.SessionLocal()
+    session.info["read_only"] = True
+    session.info["sticky_key"] = "guest"
+    started = time.perf_counter()
+    for _ in range(100_000):
+        session.get_bind()
+    elapsed = time.perf_counter() - started
+    session.close()
+    print(f"get_bind: {elapsed / 100_000 * 1e6:.2f} мкс на вызов")
+
+
+if __name__ == "__main__":
+    main()
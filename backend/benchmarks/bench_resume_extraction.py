@@ -0,0 +1,148 @@
+"""Скорость фонового извлечения текста резюме при разном числе процессов.
+
+Генерируется --files резюме (PDF и DOCX пополам) на --applications заявок:
+часть заявок ссылается на один и тот же файл, как при повторной подаче
+резюме. Индексация запускается с 1..--processes процессами на свежей базе,
+затем повторно — второй проход не должен разбирать ни одного файла.
+
+Запуск из каталога backend:
+    python benchmarks/bench_resume_extraction.py --files 200 --applications 400 --processes 4
+"""
+import argparse
+import random
+import sys
+import tempfile
+import zipfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine, insert, select
+
+from app import database
+from app.core import tasks
+from app.core.config import settings
+from app.database import Base, SessionLocal
+import app.models
+from app.models.application import Application as ApplicationModel
+from app.models.employer import Employer as EmployerModel
+from app.models.job import Job as JobModel
+from app.models.user import User
+from app.services import resume_index
+
+WORDS = (
+    "python java sql docker linux react django fastapi git kubernetes analytics excel "
+    "marketing design testing english teamwork leadership research statistics c++ node.js"
+).split()
+
+
+def make_docx(path: Path, text: str):
+    paragraphs = "".join(f"<w:p><w:r><w:t>{line}</w:t></w:r></w:p>" for line in text.splitlines())
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", '<?xml version="1.0"?><Types/>')
+        archive.writestr(
+            "word/document.xml",
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+            f"<w:body>{paragraphs}</w:body></w:document>",
+        )
+
+
+def make_pdf(path: Path, text: str):
+    lines = " T* ".join(f"({line}) Tj" for line in text.splitlines())
+    stream = f"BT /F1 11 Tf 14 TL 50 780 Td {lines} ET".encode("latin-1")
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Contents 4 0 R "
+        b"/Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    path.write_bytes(bytes(out))
+
+
+def make_resume(rng: random.Random) -> str:
+    return "\n".join(" ".join(rng.choice(WORDS) for _ in range(12)) for _ in range(40))
+
+
+def seed(upload_dir: Path, files: int, applications: int):
+    rng = random.Random(1)
+    urls = []
+    for i in range(files):
+        name = f"resume{i}.{'pdf' if i % 2 else 'docx'}"
+        (make_pdf if i % 2 else make_docx)(upload_dir / name, make_resume(rng))
+        urls.append(f"{resume_index.RESUME_URL_PREFIX}{name}")
+
+    db = SessionLocal()
+    employer_user = User(name="Employer", email="employer@bench.local", password_hash="-", role="employer")
+    db.add(employer_user)
+    db.flush()
+    employer = EmployerModel(user_id=employer_user.id, name="Employer", contact_email="employer@bench.local")
+    db.add(employer)
+    db.flush()
+    job = JobModel(employer_id=employer.id, title="Job", description="-", status="open")
+    db.add(job)
+    db.commit()
+    db.execute(insert(User).values([
+        {"name": f"Student {i}", "email": f"student{i}@bench.local", "password_hash": "-", "role": "student"}
+        for i in range(applications)
+    ]))
+    user_ids = db.execute(select(User.id).where(User.role == "student").order_by(User.id)).scalars().all()
+    db.execute(insert(ApplicationModel).values([
+        {"job_id": job.id, "user_id": user_id, "status": "submitted", "resume_url": urls[i % files]}
+        for i, user_id in enumerate(user_ids)
+    ]))
+    db.commit()
+    db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--applications", type=int, default=400)
+    parser.add_argument("--processes", type=int, default=4)
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="bench-resumes-"))
+    tasks.queue.path = workdir / "tasks.sqlite3"
+    settings.UPLOAD_DIR = workdir / "uploads"
+    settings.UPLOAD_DIR.mkdir()
+
+    for processes in range(1, args.processes + 1):
+        database.engine = create_engine(f"sqlite:///{workdir / f'bench{processes}.db'}")
+        Base.metadata.drop_all(database.engine)
+        Base.metadata.create_all(database.engine)
+        seed(settings.UPLOAD_DIR, args.files, args.applications)
+
+        db = SessionLocal()
+        first = resume_index.index_pending(db, processes=processes)
+        second = resume_index.index_pending(
+            db, application_ids=db.execute(select(ApplicationModel.id)).scalars().all(), processes=processes
+        )
+        db.execute(ApplicationModel.__table__.update().values(resume_hash=None))
+        db.commit()
+        repeat = resume_index.index_pending(db, processes=processes)
+        db.close()
+        print(
+            f"Процессов {processes}: {first['applications']} заявок, {first['files']} файлов "
+            f"за {first['seconds']:.2f} с ({first['files_per_sec']} файлов/с); "
+            f"повторно: {second['applications']} заявок; "
+            f"переиндексация без разбора: {repeat['files']} файлов за {repeat['seconds']:.2f} с"
+        )
+        if first["files"] != args.files or repeat["files"]:
+            print("НАРУШЕНИЕ: файл разобран повторно или пропущен")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Сравнение обычной и быстрой сериализации списков вакансий и заявок.
+
+Обычный путь повторяет то, что делает FastAPI: ORM-объекты, валидация
+через response_model и кодирование stdlib json. Быстрый путь выбирает
+только колонки схемы и кодирует строки через FastJSONResponse.
+
+Запуск из каталога backend:
+    python benchmarks/bench_serialization.py --rows 10000
+"""
+import argparse
+import json
+import sys
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+import app.models
+from app.models.application import Application as ApplicationModel
+from app.models.job import Job as JobModel
+from app.schemas.application_schema import Application
+from app.schemas.job_schema import Job
+from app.core.serialization import FastJSONResponse, fast_list, orjson
+
+
+def seed(db, rows):
+    today = date.today()
+    db.add_all(
+        JobModel(
+            employer_id=1,
+            title=f"Ассистент лаборатории {i}",
+            description="Описание вакансии " * 20,
+            location="Главный корпус",
+            employment_type="part-time",
+            remote=i % 2 == 0,
+            start_date=today,
+            end_date=today + timedelta(days=30),
+            spots=3,
+            status="open",
+        )
+        for i in range(rows)
+    )
+    now = datetime.now().replace(microsecond=0)
+    db.add_all(
+        ApplicationModel(
+            job_id=i + 1,
+            user_id=i + 1,
+            status="submitted",
+            cover_letter="Сопроводительное письмо " * 10,
+            resume_url=f"/applications/resume/{i}.pdf",
+            submitted_at=now,
+            updated_at=now,
+        )
+        for i in range(rows)
+    )
+    db.commit()
+
+
+def regular(db, model, schema):
+    adapter = TypeAdapter(List[schema])
+    objects = db.query(model).all()
+    content = adapter.dump_python(adapter.validate_python(objects), mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def fast(db, model, schema):
+    return fast_list(db, model, schema).body
+
+
+def measure(Session, func, model, schema, rows, repeat):
+    best = None
+    body = b""
+    for _ in range(repeat):
+        db = Session()
+        started = time.perf_counter()
+        body = func(db, model, schema)
+        elapsed = time.perf_counter() - started
+        db.close()
+        best = elapsed if best is None else min(best, elapsed)
+    return rows / best, body
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    db = Session()
+    seed(db, args.rows)
+    db.close()
+
+    print(f"Строк: {args.rows}, кодировщик быстрого пути: {'orjson' if orjson else 'json'}")
+    for name, model, schema in (("jobs", JobModel, Job), ("applications", ApplicationModel, Application)):
+        slow_rate, slow_body = measure(Session, regular, model, schema, args.rows, args.repeat)
+        fast_rate, fast_body = measure(Session, fast, model, schema, args.rows, args.repeat)
+        same = json.loads(slow_body) == json.loads(fast_body)
+        print(
+            f"{name}: обычный путь {slow_rate:,.0f} строк/с, быстрый {fast_rate:,.0f} строк/с "
+            f"(x{fast_rate / slow_rate:.1f}), ответы совпадают: {same}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Масштабирование serve.py по числу рабочих процессов.
+
+Для каждого числа процессов сервер запускается заново, после чего
+несколько клиентских процессов в течение --duration секунд шлют запросы
+по keep-alive соединениям. Выводятся пропускная способность, задержки
+и эффективность относительно одного процесса. Клиенты работают на той же
+машине, поэтому при числе процессов, близком к числу ядер, они начинают
+отнимать процессор у сервера.
+
+Сервер берет настройки БД из .env, как и в обычном запуске.
+
+Запуск из каталога backend:
+    python benchmarks/bench_serve_scaling.py --workers 1,2,4,8 --path /jobs/
+    python benchmarks/bench_serve_scaling.py --workers 1,4 --no-preload
+"""
+import argparse
+import http.client
+import os
+import socket
+import subprocess
+import sys
+import time
+from multiprocessing import Pool
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parent.parent
+
+
+def wait_for_port(port: int, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Сервер не открыл порт {port} за {timeout:.0f} с")
+
+
+def client(args):
+    port, path, duration = args
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    latencies = []
+    errors = 0
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        started = time.perf_counter()
+        try:
+            conn.request("GET", path)
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                errors += 1
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            conn.close()
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+            continue
+        latencies.append(time.perf_counter() - started)
+    conn.close()
+    return latencies, errors
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def run(script, workers, preload, port, path, clients, duration):
+    command = [sys.executable, script, "--workers", str(workers), "--port", str(port)]
+    command.append("--preload" if preload else "--no-preload")
+    server = subprocess.Popen(command, cwd=BACKEND, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_for_port(port)
+        time.sleep(1)
+        with Pool(clients) as pool:
+            results = pool.map(client, [(port, path, duration)] * clients)
+    finally:
+        server.terminate()
+        server.wait(60)
+    latencies = [value for values, _ in results for value in values]
+    errors = sum(count for _, count in results)
+    return len(latencies) / duration, percentile(latencies, 0.5), percentile(latencies, 0.99), errors
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", default=f"1,2,{os.cpu_count() or 1}", help="Числа процессов через запятую")
+    parser.add_argument("--clients", type=int, default=16, help="Клиентских процессов")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--path", default="/jobs/")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--preload", action=argparse.BooleanOptionalAction, default=True)
+    parser.add_argument("--script", default="serve.py", help="Скрипт запуска сервера относительно backend")
+    args = parser.parse_args()
+
+    counts = sorted({int(value) for value in args.workers.split(",")})
+    print(f"Ядер: {os.cpu_count()}, клиентов: {args.clients}, путь: {args.path}, предзагрузка: {args.preload}")
+    print(f"{'процессов':>10}{'запр/с':>10}{'p50, мс':>10}{'p99, мс':>10}{'ошибок':>8}{'эффект.':>9}")
+    base = None
+    for workers in counts:
+        rate, p50, p99, errors = run(args.script, workers, args.preload, args.port, args.path, args.clients, args.duration)
+        base = base or rate / workers
+        print(f"{workers:>10}{rate:>10.0f}{p50 * 1000:>10.1f}{p99 * 1000:>10.1f}{errors:>8}{rate / workers / base:>9.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Цена трассировки: выключена, включена без выборки и с выборкой каждого запроса.
+
+Каждый режим запускается в отдельном процессе, потому что трассировка
+подключается при импорте приложения. Замеряется время CPU на запрос
+GET /jobs/my с токеном (middleware, зависимости, SQL, запись debug.log)
+через TestClient, на SQLite в файле. Трассы в режиме выборки пишутся в
+кольцевой буфер в памяти, чтобы не мерить диск.
+
+Запуск из каталога backend:
+    python benchmarks/bench_tracing.py --requests 500
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+MODES = {
+    "выключена": {"TRACING_ENABLED": "false"},
+    "без выборки": {"TRACING_ENABLED": "true", "TRACING_SAMPLE_RATE": "0"},
+    "каждый запрос": {"TRACING_ENABLED": "true", "TRACING_SAMPLE_RATE": "1", "TRACING_EXPORTER": "memory"},
+}
+
+
+def run_child(requests: int):
+    workdir = Path(tempfile.mkdtemp(prefix="bench-tracing-"))
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir / 'bench.db'}"
+    os.environ["DB_ECHO"] = "false"
+    os.environ["TASK_QUEUE_PATH"] = str(workdir / "tasks.sqlite3")
+    os.environ["CONCURRENCY_LIMIT_ENABLED"] = "false"
+
+    from fastapi.testclient import TestClient
+
+    from app import database
+    from app.database import Base
+    import app.main as main
+
+    Base.metadata.create_all(database.get_engine())
+    with TestClient(main.app) as client:
+        client.post("/auth/register", json={
+            "name": "Employer", "email": "employer@example.com", "password": "secret1", "role": "employer",
+        })
+        token = client.post("/auth/login", json={"email": "employer@example.com", "password": "secret1"}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        for _ in range(20):
+            client.get("/jobs/my", headers=headers)
+        started = time.process_time()
+        for _ in range(requests):
+            assert client.get("/jobs/my", headers=headers).status_code == 200
+        elapsed = time.process_time() - started
+    print(json.dumps({"us_per_request": elapsed / requests * 1e6}))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.requests)
+        return
+
+    backend = Path(__file__).resolve().parent.parent
+    results = {}
+    for name, env in MODES.items():
+        output = subprocess.run(
+            [sys.executable, __file__, "--child", "--requests", str(args.requests)],
+            cwd=backend, env={**os.environ, **env}, capture_output=True, text=True, check=True,
+        ).stdout
+        results[name] = json.loads(output.strip().splitlines()[-1])["us_per_request"]
+
+    base = results["выключена"]
+    print(f"Запросов GET /jobs/my: {args.requests}")
+    for name, value in results.items():
+        print(f"{name}: {value:.0f} мкс CPU на запрос ({(value - base) / base * 100:+.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,30 @@
-from sqlalchemy import create_engine, text
-from app.core.config import settings
+import argparse
+import sys
+
+from sqlalchemy import UniqueConstraint, create_engine, inspect, text
+
+def _db_name() -> str:
+    # Имя базы берется из итогового URL: DATABASE_URL важнее DB_NAME
+    from app.database import database_url
+
+    return database_url().database
+
 
 def run_migrations():
+    from app.database import database_url
+
+    if database_url().get_backend_name() == "sqlite":
+        # Локальной базе SQLite миграции MySQL не нужны: схема создается по моделям
+        create_schema()
+        return
+
     # Create engine without database name first
-    temp_engine = create_engine(
-        f"mysql+mysqlconnector://{settings.DB_USER}:{settings.DB_PASSWORD}@{settings.DB_HOST}:{settings.DB_PORT}"
-    )
+    temp_engine = create_engine(database_url(with_database=False))
     
     # Connect and create database if not exists
     with temp_engine.connect() as conn:
-        conn.execute(text(f"CREATE DATABASE IF NOT EXISTS {settings.DB_NAME}"))
-        conn.execute(text(f"USE {settings.DB_NAME}"))
+        conn.execute(text(f"CREATE DATABASE IF NOT EXISTS {_db_name()}"))
+        conn.execute(text(f"USE {_db_name()}"))
         
         # Check if user_id column exists in employers table
         result = conn.execute(
@@ -21,7 +35,7 @@ def run_migrations():
             AND TABLE_NAME = 'employers'
             AND COLUMN_NAME = 'user_id'
             """),
-            {"db_name": settings.DB_NAME}
+            {"db_name": _db_name()}
         ).scalar()
         
         if not result:
@@ -60,5 +74,324 @@ def run_migrations():
         else:
             print("Database schema is up to date.")
 
-if __name__ == "__main__":
+        add_job_concurrency_columns(conn)
+        remove_duplicate_favorites(conn)
+        remove_duplicate_applications(conn)
+        add_interview_columns(conn)
+        add_missing_indexes(conn)
+        add_soft_delete_columns(conn)
+        create_change_log(conn)
+        add_attachment_uploads(conn)
+        add_resume_index(conn)
+
+
+def _column_exists(conn, table, column):
+    return conn.execute(
+        text("""
+        SELECT COUNT(*)
+        FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = :db_name
+        AND TABLE_NAME = :table
+        AND COLUMN_NAME = :column
+        """),
+        {"db_name": _db_name(), "table": table, "column": column}
+    ).scalar()
+
+
+def _index_exists(conn, table, index):
+    return conn.execute(
+        text("""
+        SELECT COUNT(*)
+        FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = :db_name
+        AND TABLE_NAME = :table
+        AND INDEX_NAME = :index
+        """),
+        {"db_name": _db_name(), "table": table, "index": index}
+    ).scalar()
+
+
+def add_job_concurrency_columns(conn):
+    if not _column_exists(conn, "jobs", "accepted_count"):
+        print("Adding accepted_count and version columns to jobs table...")
+        conn.execute(text("""
+            ALTER TABLE jobs
+            ADD COLUMN accepted_count INT NOT NULL DEFAULT 0,
+            ADD COLUMN version INT NOT NULL DEFAULT 0
+        """))
+        conn.execute(text("""
+            UPDATE jobs j
+            SET accepted_count = (
+                SELECT COUNT(*) FROM applications a
+                WHERE a.job_id = j.id AND a.status = 'accepted'
+            )
+        """))
+        conn.commit()
+
+
+INDEXES = [
+    ("jobs", "idx_jobs_status_end_date", "INDEX idx_jobs_status_end_date (status, end_date)"),
+    ("applications", "idx_applications_job_status", "INDEX idx_applications_job_status (job_id, status)"),
+    ("applications", "uq_applications_job_user", "UNIQUE INDEX uq_applications_job_user (job_id, user_id)"),
+    ("favorites", "uq_favorites_user_job", "UNIQUE INDEX uq_favorites_user_job (user_id, job_id)"),
+    ("interviews", "idx_interviews_employer_time", "INDEX idx_interviews_employer_time (employer_id, scheduled_at)"),
+    ("interviews", "idx_interviews_user_time", "INDEX idx_interviews_user_time (user_id, scheduled_at)"),
+]
+
+
+def remove_duplicate_favorites(conn):
+    # Без этого уникальный индекс на (user_id, job_id) не создастся
+    if _index_exists(conn, "favorites", "uq_favorites_user_job"):
+        return
+    conn.execute(text("""
+        DELETE f1 FROM favorites f1
+        JOIN favorites f2 ON f1.user_id = f2.user_id AND f1.job_id = f2.job_id AND f1.id > f2.id
+    """))
+    conn.execute(text("DELETE FROM favorites WHERE user_id IS NULL OR job_id IS NULL"))
+    conn.execute(text("ALTER TABLE favorites MODIFY user_id INT NOT NULL, MODIFY job_id INT NOT NULL"))
+    conn.commit()
+
+
+APPLICATION_STATUS_RANK = "CASE status WHEN 'accepted' THEN 3 WHEN 'rejected' THEN 2 WHEN 'reviewed' THEN 1 ELSE 0 END"
+
+
+def remove_duplicate_applications(conn):
+    # Старое создание заявки читало, а потом писало, так что повторные
+    # заявки студента на вакансию могли появиться; без их удаления
+    # уникальный индекс на (job_id, user_id) не создастся
+    if _index_exists(conn, "applications", "uq_applications_job_user"):
+        return
+    # Остается не удаленная заявка с самым продвинутым статусом, при равенстве самая ранняя
+    live = "deleted_at IS NULL DESC, " if _column_exists(conn, "applications", "deleted_at") else ""
+    conn.execute(text(f"""
+        CREATE TEMPORARY TABLE application_survivors AS
+        SELECT job_id, user_id, id FROM (
+            SELECT job_id, user_id, id,
+                ROW_NUMBER() OVER (
+                    PARTITION BY job_id, user_id ORDER BY {live}{APPLICATION_STATUS_RANK} DESC, id
+                ) AS position,
+                COUNT(*) OVER (PARTITION BY job_id, user_id) AS copies
+            FROM applications
+            WHERE job_id IS NOT NULL AND user_id IS NOT NULL
+        ) ranked
+        WHERE position = 1 AND copies > 1
+    """))
+    duplicates = conn.execute(text("SELECT COUNT(*) FROM application_survivors")).scalar()
+    if duplicates:
+        print(f"Removing duplicate applications for {duplicates} job/student pairs...")
+        # Собеседования и отзывы дублей переходят к оставшейся заявке, а не удаляются каскадом
+        for table in ("interviews", "employer_reviews"):
+            conn.execute(text(f"""
+                UPDATE {table} t
+                JOIN applications a ON a.id = t.application_id
+                JOIN application_survivors s ON s.job_id = a.job_id AND s.user_id = a.user_id AND s.id <> a.id
+                SET t.application_id = s.id
+            """))
+        conn.execute(text("""
+            DELETE a FROM applications a
+            JOIN application_survivors s ON s.job_id = a.job_id AND s.user_id = a.user_id AND s.id <> a.id
+        """))
+        not_deleted = " AND a.deleted_at IS NULL" if live else ""
+        conn.execute(text(f"""
+            UPDATE jobs j
+            JOIN (SELECT DISTINCT job_id FROM application_survivors) s ON s.job_id = j.id
+            SET j.accepted_count = (
+                SELECT COUNT(*) FROM applications a
+                WHERE a.job_id = j.id AND a.status = 'accepted'{not_deleted}
+            )
+        """))
+    conn.execute(text("DROP TEMPORARY TABLE application_survivors"))
+    conn.commit()
+
+
+def add_interview_columns(conn):
+    if _column_exists(conn, "interviews", "employer_id"):
+        return
+    print("Adding employer_id, user_id and duration_minutes columns to interviews table...")
+    conn.execute(text("""
+        ALTER TABLE interviews
+        ADD COLUMN employer_id INT NULL AFTER application_id,
+        ADD COLUMN user_id INT NULL AFTER employer_id,
+        ADD COLUMN duration_minutes INT NOT NULL DEFAULT 30 AFTER scheduled_at
+    """))
+    conn.execute(text("""
+        UPDATE interviews i
+        JOIN applications a ON a.id = i.application_id
+        JOIN jobs j ON j.id = a.job_id
+        SET i.employer_id = j.employer_id, i.user_id = a.user_id
+    """))
+    conn.execute(text("DELETE FROM interviews WHERE employer_id IS NULL OR scheduled_at IS NULL"))
+    conn.execute(text("""
+        ALTER TABLE interviews
+        MODIFY application_id INT NOT NULL,
+        MODIFY employer_id INT NOT NULL,
+        MODIFY user_id INT NOT NULL,
+        MODIFY scheduled_at DATETIME NOT NULL,
+        ADD FOREIGN KEY (employer_id) REFERENCES employers(id) ON DELETE CASCADE,
+        ADD FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+    """))
+    conn.commit()
+
+
+def add_missing_indexes(conn):
+    for table, index, definition in INDEXES:
+        if not _index_exists(conn, table, index):
+            print(f"Adding index {index} to {table} table...")
+            conn.execute(text(f"ALTER TABLE {table} ADD {definition}"))
+
+
+
+SOFT_DELETE_TABLES = ["departments", "employers", "jobs", "applications"]
+
+
+def add_soft_delete_columns(conn):
+    for table in SOFT_DELETE_TABLES:
+        if not _column_exists(conn, table, "deleted_at"):
+            print(f"Adding deleted_at column to {table} table...")
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN deleted_at TIMESTAMP NULL DEFAULT NULL"))
+    conn.commit()
+
+
+def create_change_log(conn):
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS changes (
+            id BIGINT AUTO_INCREMENT PRIMARY KEY,
+            entity VARCHAR(30) NOT NULL,
+            entity_id INT NOT NULL,
+            op VARCHAR(10) NOT NULL,
+            changed_at TIMESTAMP NOT NULL,
+            INDEX idx_changes_entity (entity, entity_id, id)
+        ) ENGINE=InnoDB
+    """))
+    conn.commit()
+
+
+def add_attachment_uploads(conn):
+    if not _column_exists(conn, "attachments", "file_name"):
+        print("Adding file_name, size, content_type and created_at columns to attachments table...")
+        conn.execute(text("""
+            ALTER TABLE attachments
+            ADD COLUMN file_name VARCHAR(255) NULL,
+            ADD COLUMN size BIGINT NULL,
+            ADD COLUMN content_type VARCHAR(100) NULL,
+            ADD COLUMN created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        """))
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS attachment_uploads (
+            id VARCHAR(36) PRIMARY KEY,
+            job_id INT NOT NULL,
+            employer_id INT NOT NULL,
+            file_name VARCHAR(255) NOT NULL,
+            content_type VARCHAR(100),
+            description TEXT,
+            size BIGINT NOT NULL,
+            received BIGINT NOT NULL DEFAULT 0,
+            created_at DATETIME NOT NULL,
+            updated_at DATETIME NOT NULL,
+            INDEX idx_attachment_uploads_updated (updated_at),
+            FOREIGN KEY (job_id) REFERENCES jobs(id) ON DELETE CASCADE,
+            FOREIGN KEY (employer_id) REFERENCES employers(id) ON DELETE CASCADE
+        ) ENGINE=InnoDB
+    """))
+    conn.commit()
+
+
+def add_resume_index(conn):
+    if not _column_exists(conn, "applications", "resume_hash"):
+        print("Adding resume_hash column to applications table...")
+        conn.execute(text("ALTER TABLE applications ADD COLUMN resume_hash VARCHAR(64) NULL AFTER resume_url"))
+    if not _index_exists(conn, "applications", "idx_applications_resume_hash"):
+        conn.execute(text("ALTER TABLE applications ADD INDEX idx_applications_resume_hash (resume_hash)"))
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS resume_texts (
+            file_hash VARCHAR(64) PRIMARY KEY,
+            status VARCHAR(20) NOT NULL,
+            text MEDIUMTEXT,
+            error TEXT,
+            size BIGINT,
+            extracted_at DATETIME NOT NULL
+        ) ENGINE=InnoDB
+    """))
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS resume_terms (
+            id BIGINT AUTO_INCREMENT PRIMARY KEY,
+            employer_id INT NOT NULL,
+            application_id INT NOT NULL,
+            term VARCHAR(64) NOT NULL,
+            tf INT NOT NULL,
+            INDEX idx_resume_terms_employer_term (employer_id, term, application_id),
+            INDEX idx_resume_terms_application (application_id)
+        ) ENGINE=InnoDB
+    """))
+    conn.commit()
+
+
+def schema_differences(engine):
+    """Таблицы, колонки и индексы моделей, которых нет в базе данных."""
+    from app.database import Base
+    import app.models
+
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    missing = []
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            missing.append(f"таблица {table.name}")
+            continue
+        columns = {column["name"] for column in inspector.get_columns(table.name)}
+        missing.extend(
+            f"колонка {table.name}.{column.name}" for column in table.columns if column.name not in columns
+        )
+        indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+        indexes.update(constraint["name"] for constraint in inspector.get_unique_constraints(table.name))
+        expected = [
+            index.name for index in table.indexes
+            if not set(index.columns) <= set(table.primary_key.columns)
+        ]
+        expected.extend(
+            constraint.name for constraint in table.constraints
+            if isinstance(constraint, UniqueConstraint) and isinstance(constraint.name, str)
+        )
+        missing.extend(f"индекс {table.name}.{name}" for name in expected if name not in indexes)
+    return missing
+
+
+def check_schema():
+    from app.database import get_engine
+
+    missing = schema_differences(get_engine())
+    if not missing:
+        print("Database schema matches the models.")
+        return 0
+    print("Database schema differs from the models:")
+    for item in missing:
+        print(f"  нет: {item}")
+    return 1
+
+
+def create_schema():
+    from app.database import Base, get_engine
+    import app.models
+
+    Base.metadata.create_all(bind=get_engine())
+    print("Missing tables created.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Миграции и проверка схемы БД")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--check", action="store_true", help="Сравнить схему БД с моделями, ничего не меняя")
+    group.add_argument("--create", action="store_true", help="Создать недостающие таблицы по моделям")
+    args = parser.parse_args()
+
+    if args.check:
+        return check_schema()
+    if args.create:
+        create_schema()
+        return 0
     run_migrations()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
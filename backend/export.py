@@ -0,0 +1,62 @@
+"""Выгрузка заявок и вакансий в CSV или JSONL без ограничений по объему.
+
+Работает напрямую с БД, минуя API, и пишет в файл или в stdout. Файл
+с расширением .gz сжимается на лету.
+
+Запуск из каталога backend:
+    python export.py applications --employer-id 3 --status accepted -o applications.csv
+    python export.py jobs --format jsonl --from 2026-09-01 --to 2026-12-31 -o jobs.jsonl.gz
+"""
+import argparse
+import sys
+import time
+from datetime import date
+
+from app import database
+from app.core.config import settings
+from app.services.export import applications_export_query, jobs_export_query, stream_export
+
+QUERIES = {
+    "applications": applications_export_query,
+    "jobs": jobs_export_query,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Выгрузка заявок и вакансий")
+    parser.add_argument("entity", choices=sorted(QUERIES))
+    parser.add_argument("--format", choices=["csv", "jsonl"], default="csv")
+    parser.add_argument("--employer-id", type=int)
+    parser.add_argument("--job-id", type=int)
+    parser.add_argument("--status")
+    parser.add_argument("--from", dest="date_from", type=date.fromisoformat)
+    parser.add_argument("--to", dest="date_to", type=date.fromisoformat)
+    parser.add_argument("--gzip", action="store_true", help="Сжимать вывод (включается сам для файлов .gz)")
+    parser.add_argument("--chunk-size", type=int, default=settings.EXPORT_CHUNK_SIZE)
+    parser.add_argument("-o", "--output", help="Файл для записи, по умолчанию stdout")
+    args = parser.parse_args()
+
+    stmt = QUERIES[args.entity](args.employer_id, args.job_id, args.status, args.date_from, args.date_to)
+    compress = args.gzip or bool(args.output and args.output.endswith(".gz"))
+    chunks = stream_export(stmt, args.format, args.chunk_size, settings.COMPRESSION_GZIP_LEVEL if compress else None)
+
+    if not args.output:
+        # echo движка пишет SQL в stdout и испортил бы выгрузку
+        database.get_engine().echo = False
+
+    started = time.perf_counter()
+    written = 0
+    out = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        for chunk in chunks:
+            out.write(chunk)
+            written += len(chunk)
+    finally:
+        if args.output:
+            out.close()
+    elapsed = time.perf_counter() - started
+    print(f"Записано {written / 1024 / 1024:.1f} МБ за {elapsed:.1f} с", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""Запуск API в нескольких рабочих процессах.
+
+Мастер открывает слушающий сокет, при WEB_PRELOAD импортирует приложение
+один раз и порождает рабочие процессы через fork, так что импорт
+не повторяется в каждом из них. Упавший рабочий процесс
+перезапускается. SIGTERM или SIGINT мастеру передаются рабочим процессам,
+которые перестают принимать соединения и дожидаются текущих запросов
+в пределах WEB_GRACEFUL_TIMEOUT.
+
+Без fork (Windows) процессы запускает uvicorn, без предзагрузки.
+
+С BROKER_BACKEND=memory сообщения не выходят за пределы процесса: при
+нескольких рабочих процессах события SSE не доходят до клиентов других
+процессов, а сброс кэшей сущностей и избранного — до их кэшей. Поэтому
+эти кэши в этом случае отключаются; для работы с ними нужен
+BROKER_BACKEND=sqlite.
+
+Запуск из каталога backend:
+    python serve.py --workers 4
+    python serve.py --workers 4 --no-preload --port 8080
+"""
+import argparse
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+
+import uvicorn
+
+from app.core.config import settings
+
+logger = logging.getLogger("serve")
+
+APP = "app.main:app"
+
+
+class WorkerServer(uvicorn.Server):
+    def handle_exit(self, sig, frame):
+        from app.core import lifecycle
+        lifecycle.draining.set()
+        super().handle_exit(sig, frame)
+
+
+def create_socket(host: str, port: int, backlog: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def worker_config(app) -> uvicorn.Config:
+    return uvicorn.Config(
+        app,
+        lifespan="on",
+        backlog=settings.WEB_BACKLOG,
+        timeout_graceful_shutdown=settings.WEB_GRACEFUL_TIMEOUT,
+    )
+
+
+def run_worker(app, sock: socket.socket):
+    from app.core import lifecycle
+    for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGCHLD):
+        signal.signal(sig, signal.SIG_DFL)
+    lifecycle.after_fork()
+    WorkerServer(worker_config(app)).run(sockets=[sock])
+
+
+class Master:
+    def __init__(self, app, sock: socket.socket, workers: int):
+        self.app = app
+        self.sock = sock
+        self.workers = workers
+        self.children = {}
+        self.stopping = False
+
+    def spawn(self, index: int):
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                run_worker(self.app, self.sock)
+            except BaseException:
+                logger.exception(f"Рабочий процесс {index} завершился с ошибкой")
+                code = 1
+            finally:
+                os._exit(code)
+        self.children[pid] = (index, time.monotonic())
+        logger.info(f"Рабочий процесс {index} запущен, pid {pid}")
+
+    def stop(self, sig, frame):
+        if self.stopping:
+            return
+        self.stopping = True
+        logger.info(f"Получен сигнал {signal.Signals(sig).name}, завершаем рабочие процессы")
+        for pid in self.children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        for index in range(self.workers):
+            self.spawn(index)
+
+        deadline = None
+        while self.children:
+            if self.stopping and deadline is None:
+                deadline = time.monotonic() + settings.WEB_GRACEFUL_TIMEOUT + 5
+            if deadline is not None and time.monotonic() > deadline:
+                for pid in self.children:
+                    try:
+                        os.kill(pid, signal.SIGKILL)
+                    except ProcessLookupError:
+                        pass
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                time.sleep(0.2)
+                continue
+            index, started = self.children.pop(pid)
+            if self.stopping:
+                continue
+            logger.warning(f"Рабочий процесс {index} (pid {pid}) завершился: {os.waitstatus_to_exitcode(status)}")
+            if time.monotonic() - started < 1:
+                time.sleep(1)
+            self.spawn(index)
+        self.sock.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default=settings.WEB_HOST)
+    parser.add_argument("--port", type=int, default=settings.WEB_PORT)
+    parser.add_argument("--workers", type=int, default=settings.WEB_WORKERS,
+                        help="Число рабочих процессов, 0 — по числу ядер")
+    parser.add_argument("--preload", action=argparse.BooleanOptionalAction, default=settings.WEB_PRELOAD)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    workers = args.workers or os.cpu_count() or 1
+    if workers > 1 and settings.BROKER_BACKEND == "memory":
+        logger.warning(
+            "BROKER_BACKEND=memory: события SSE не доходят до клиентов других рабочих процессов, "
+            "кэши сущностей и избранного отключены"
+        )
+        # Рабочие процессы uvicorn без fork читают настройки заново из окружения
+        for name in ("ENTITY_CACHE_ENABLED", "FAVORITES_CACHE_ENABLED"):
+            os.environ[name] = "false"
+            setattr(settings, name, False)
+
+    if not hasattr(os, "fork"):
+        uvicorn.run(
+            APP,
+            host=args.host,
+            port=args.port,
+            workers=workers,
+            backlog=settings.WEB_BACKLOG,
+            timeout_graceful_shutdown=settings.WEB_GRACEFUL_TIMEOUT,
+        )
+        return
+
+    sock = create_socket(args.host, args.port, settings.WEB_BACKLOG)
+    app = APP
+    if args.preload:
+        from app.main import app
+    logger.info(f"Слушаем {args.host}:{args.port}, рабочих процессов: {workers}, предзагрузка: {args.preload}")
+    if workers == 1:
+        WorkerServer(worker_config(app)).run(sockets=[sock])
+        return
+    Master(app, sock, workers).run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,7 +5,8 @@ CREATE TABLE departments (
     id INT AUTO_INCREMENT PRIMARY KEY,
     name VARCHAR(255) NOT NULL,
     office VARCHAR(50),
-    phone VARCHAR(50)
+    phone VARCHAR(50),
+    deleted_at TIMESTAMP NULL DEFAULT NULL
 ) ENGINE=InnoDB;
 
 CREATE TABLE users (
@@ -24,6 +25,7 @@ CREATE TABLE employers (
     department_id INT,
     contact_email VARCHAR(120) UNIQUE NOT NULL,
     description TEXT,
+    deleted_at TIMESTAMP NULL DEFAULT NULL,
     FOREIGN KEY (department_id) REFERENCES departments(id) ON DELETE SET NULL,
     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
 ) ENGINE=InnoDB;
@@ -40,6 +42,9 @@ CREATE TABLE jobs (
     end_date DATE,
     spots INT,
     status VARCHAR(30) DEFAULT 'open',
+    accepted_count INT NOT NULL DEFAULT 0,
+    version INT NOT NULL DEFAULT 0,
+    deleted_at TIMESTAMP NULL DEFAULT NULL,
     FOREIGN KEY (employer_id) REFERENCES employers(id) ON DELETE CASCADE
 ) ENGINE=InnoDB;
 
@@ -50,8 +55,11 @@ CREATE TABLE applications (
     status VARCHAR(30) DEFAULT 'submitted',
     cover_letter TEXT,
     resume_url TEXT,
+    resume_hash VARCHAR(64) NULL,
     submitted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    deleted_at TIMESTAMP NULL DEFAULT NULL,
+    UNIQUE KEY uq_applications_job_user (job_id, user_id),
     FOREIGN KEY (job_id) REFERENCES jobs(id) ON DELETE CASCADE,
     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
 ) ENGINE=InnoDB;
@@ -86,21 +94,29 @@ CREATE TABLE employer_reviews (
 
 CREATE TABLE favorites (
     id INT AUTO_INCREMENT PRIMARY KEY,
-    user_id INT,
-    job_id INT,
+    user_id INT NOT NULL,
+    job_id INT NOT NULL,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE KEY uq_favorites_user_job (user_id, job_id),
     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
     FOREIGN KEY (job_id) REFERENCES jobs(id) ON DELETE CASCADE
 ) ENGINE=InnoDB;
 
 CREATE TABLE interviews (
     id INT AUTO_INCREMENT PRIMARY KEY,
-    application_id INT,
-    scheduled_at TIMESTAMP,
+    application_id INT NOT NULL,
+    employer_id INT NOT NULL,
+    user_id INT NOT NULL,
+    scheduled_at DATETIME NOT NULL,
+    duration_minutes INT NOT NULL DEFAULT 30,
     location TEXT,
     mode VARCHAR(30),
     notes TEXT,
-    FOREIGN KEY (application_id) REFERENCES applications(id) ON DELETE CASCADE
+    INDEX idx_interviews_employer_time (employer_id, scheduled_at),
+    INDEX idx_interviews_user_time (user_id, scheduled_at),
+    FOREIGN KEY (application_id) REFERENCES applications(id) ON DELETE CASCADE,
+    FOREIGN KEY (employer_id) REFERENCES employers(id) ON DELETE CASCADE,
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
 ) ENGINE=InnoDB;
 
 CREATE TABLE attachments (
@@ -108,8 +124,59 @@ CREATE TABLE attachments (
     job_id INT,
     file_url TEXT NOT NULL,
     description TEXT,
+    file_name VARCHAR(255),
+    size BIGINT,
+    content_type VARCHAR(100),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (job_id) REFERENCES jobs(id) ON DELETE CASCADE
 ) ENGINE=InnoDB;
 
+CREATE TABLE attachment_uploads (
+    id VARCHAR(36) PRIMARY KEY,
+    job_id INT NOT NULL,
+    employer_id INT NOT NULL,
+    file_name VARCHAR(255) NOT NULL,
+    content_type VARCHAR(100),
+    description TEXT,
+    size BIGINT NOT NULL,
+    received BIGINT NOT NULL DEFAULT 0,
+    created_at DATETIME NOT NULL,
+    updated_at DATETIME NOT NULL,
+    INDEX idx_attachment_uploads_updated (updated_at),
+    FOREIGN KEY (job_id) REFERENCES jobs(id) ON DELETE CASCADE,
+    FOREIGN KEY (employer_id) REFERENCES employers(id) ON DELETE CASCADE
+) ENGINE=InnoDB;
+
+CREATE TABLE changes (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    entity VARCHAR(30) NOT NULL,
+    entity_id INT NOT NULL,
+    op VARCHAR(10) NOT NULL,
+    changed_at TIMESTAMP NOT NULL,
+    INDEX idx_changes_entity (entity, entity_id, id)
+) ENGINE=InnoDB;
+
+CREATE TABLE resume_texts (
+    file_hash VARCHAR(64) PRIMARY KEY,
+    status VARCHAR(20) NOT NULL,
+    text MEDIUMTEXT,
+    error TEXT,
+    size BIGINT,
+    extracted_at DATETIME NOT NULL
+) ENGINE=InnoDB;
+
+CREATE TABLE resume_terms (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    employer_id INT NOT NULL,
+    application_id INT NOT NULL,
+    term VARCHAR(64) NOT NULL,
+    tf INT NOT NULL,
+    INDEX idx_resume_terms_employer_term (employer_id, term, application_id),
+    INDEX idx_resume_terms_application (application_id)
+) ENGINE=InnoDB;
+
 CREATE INDEX idx_jobs_employer ON jobs(employer_id);
 CREATE INDEX idx_applications_user ON applications(user_id);
+CREATE INDEX idx_jobs_status_end_date ON jobs(status, end_date);
+CREATE INDEX idx_applications_job_status ON applications(job_id, status);
+CREATE INDEX idx_applications_resume_hash ON applications(resume_hash);